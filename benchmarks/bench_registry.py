@@ -0,0 +1,199 @@
+"""
+Benchmarks for reading the registry and the queries on it.
+
+Usage::
+
+    pytest benchmarks/bench_registry.py [--bench-update]
+
+See ``conftest.py`` for how the results are compared to the baseline.
+"""
+import gc
+import time
+import tracemalloc
+
+import pytest
+
+from opengl_registry import RegistryReader
+from opengl_registry.backends import ElementTreeBackend, ExpatBackend
+from opengl_registry.filter import RegistryFilter
+from opengl_registry.registry import Registry
+from opengl_registry.writer import CtypesWriter
+
+SECTIONS = ('types', 'groups', 'enums', 'commands', 'features', 'extensions')
+BACKENDS = {'elementtree': ElementTreeBackend, 'expat': ExpatBackend}
+
+
+@pytest.fixture(scope='module')
+def registry(registry_path):
+    return RegistryReader.from_file(registry_path).read()
+
+
+def fresh_registry(registry):
+    """A registry sharing the objects of another without any built indexes"""
+    return Registry(
+        types=registry.types,
+        groups=list(registry.groups.values()),
+        enums=registry.enums,
+        commands=registry.commands,
+        features=registry.features,
+        extensions=registry.extensions,
+    )
+
+
+def test_from_file(bench, registry_path):
+    bench(lambda: RegistryReader.from_file(registry_path))
+
+
+@pytest.mark.parametrize('section', SECTIONS)
+def test_read_section(bench, registry_path, section):
+    bench(
+        lambda reader: getattr(reader, 'read_' + section)(),
+        setup=lambda: RegistryReader.from_file(registry_path),
+    )
+
+
+def test_read(bench, registry_path):
+    bench(lambda reader: reader.read(), setup=lambda: RegistryReader.from_file(registry_path))
+
+
+def test_read_stream(bench, registry_path):
+    bench(lambda: RegistryReader.from_file(registry_path, stream=True).read())
+
+
+@pytest.mark.parametrize('backend', sorted(BACKENDS))
+def test_read_backend(bench, registry_path, backend):
+    """Parse and build the registry from the file with each parser backend"""
+    bench(lambda: RegistryReader.from_file(registry_path, backend=BACKENDS[backend]()).read())
+
+
+@pytest.mark.parametrize('stream', [False, True])
+def test_read_filtered(bench, registry_path, stream):
+    gles = RegistryFilter('gles2', version='3.2')
+    bench(lambda: RegistryReader.from_file(registry_path, stream=stream).read(filter=gles))
+
+
+@pytest.mark.parametrize('scale', [1, 10])
+def test_read_synthetic(bench, synthetic_paths, scale):
+    path = synthetic_paths(scale)
+    bench(lambda: RegistryReader.from_file(path).read())
+
+
+class PausingReader(RegistryReader):
+    pause_gc = True
+
+
+def read_scaling(request, synthetic_paths, reader_cls, rounds=5):
+    """Per unit read time and peak memory at the smallest and the largest of ``--bench-scales``.
+
+    The rounds of all scales are interleaved so changing load on the
+    machine affects every scale alike. The best time of each is kept.
+    Every round starts after a full collection, so no round pays for
+    the garbage of the previous one.
+    """
+    scales = sorted(int(scale) for scale in request.config.getoption('--bench-scales').split(','))
+    paths = {scale: synthetic_paths(scale) for scale in scales}
+    best = dict.fromkeys(scales, float('inf'))
+    for _ in range(rounds):
+        for scale in scales:
+            gc.collect()
+            start = time.perf_counter()
+            reader_cls.from_file(paths[scale]).read()
+            best[scale] = min(best[scale], time.perf_counter() - start)
+
+    results = {}
+    for scale in scales:
+        tracemalloc.start()
+        try:
+            registry = reader_cls.from_file(paths[scale]).read()
+            _, peak = tracemalloc.get_traced_memory()
+        finally:
+            tracemalloc.stop()
+        del registry
+
+        results[scale] = best[scale] / scale, peak / scale
+        print('\nx{}: {:.4f}s, {:.2f} MB peak, per unit {:.4f}s, {:.2f} MB'.format(
+            scale, best[scale], peak / 1024 / 1024, best[scale] / scale, peak / scale / 1024 / 1024,
+        ))
+
+    return results[scales[0]], results[scales[-1]]
+
+
+def test_read_scaling(request, synthetic_paths):
+    """Time and peak memory per unit of scale must stay the same up to the largest scale.
+
+    Reads with ``pause_gc`` so collections triggered while parsing
+    don't add time growing with the number of objects already built.
+    """
+    smallest, largest = read_scaling(request, synthetic_paths, PausingReader)
+    time_tolerance = request.config.getoption('--bench-scaling-tolerance')
+    memory_tolerance = request.config.getoption('--bench-memory-tolerance')
+    assert largest[0] <= smallest[0] * time_tolerance, 'Read time grows faster than the registry'
+    assert largest[1] <= smallest[1] * memory_tolerance, 'Peak memory grows faster than the registry'
+
+
+def test_read_scaling_gc(request, synthetic_paths):
+    """Per unit read time with the garbage collector running, the default.
+
+    Every collection traverses all objects built so far, so the read
+    time per unit grows with the scale. This only catches growth well
+    beyond that with the looser ``--bench-gc-scaling-tolerance``.
+    """
+    smallest, largest = read_scaling(request, synthetic_paths, RegistryReader)
+    time_tolerance = request.config.getoption('--bench-gc-scaling-tolerance')
+    assert largest[0] <= smallest[0] * time_tolerance, 'Read time grows faster than the registry'
+
+
+def test_build_indexes(bench, registry):
+    def lookup(registry):
+        registry.get_command('glDrawArrays')
+        registry.get_enum('GL_TEXTURE_2D')
+        registry.get_enums_by_value(0x0DE1)
+        registry.get_type('GLenum')
+        registry.get_extension('GL_ARB_clip_control')
+        registry.get_command_extensions('glClipControl')
+        registry.canonical('glDrawArraysEXT')
+
+    bench(lookup, setup=lambda: fresh_registry(registry))
+
+
+def test_link(bench, registry):
+    bench(lambda registry: registry.link(), setup=lambda: fresh_registry(registry))
+
+
+def test_required_types(bench, registry):
+    profile = registry.get_profile('gl', 'compatibility', '4.6')
+    bench(
+        lambda registry: registry.get_required_types(commands=profile.commands),
+        setup=lambda: fresh_registry(registry),
+    )
+
+
+def test_lookups(bench, registry):
+    commands = [command.name for command in registry.commands.entries]
+    enums = [enum.name for enums in registry.enums for enum in enums.entires]
+
+    def lookup():
+        for name in commands:
+            registry.get_command(name)
+        for name in enums:
+            registry.get_enum(name)
+
+    bench(lookup)
+
+
+@pytest.mark.parametrize('api,profile,version', [
+    ('gl', 'core', '3.3'),
+    ('gl', 'compatibility', '4.6'),
+    ('gles2', None, '3.2'),
+])
+def test_profile(bench, registry, api, profile, version):
+    bench(
+        lambda registry: registry.get_profile(api, profile, version),
+        setup=lambda: fresh_registry(registry),
+    )
+
+
+@pytest.mark.parametrize('lazy', [True, False])
+def test_codegen(bench, registry, lazy):
+    profile = registry.get_profile('gl', 'compatibility', '4.6')
+    bench(lambda: CtypesWriter(registry, profile, lazy=lazy).render())
@@ -0,0 +1,87 @@
+"""
+Startup cost of generated ctypes bindings.
+
+Writes a lazy and a batched module for the same profile and reports
+the import time, the time spent in ``load()`` and the time to resolve
+every command. Each sample runs in a fresh interpreter. A stub
+``get_proc_address`` returns the address of a ctypes callback for every
+name, so no GL context is needed.
+
+Usage::
+
+    python benchmarks/bindings.py [path/to/gl.xml] [--api gl] [--profile compatibility] [--version 4.6]
+"""
+import argparse
+import json
+import os
+import statistics
+import subprocess
+import sys
+import tempfile
+
+from opengl_registry import RegistryReader
+from opengl_registry.writer import CtypesWriter
+
+DEFAULT_PATH = os.path.join(os.path.dirname(__file__), '..', 'tests', 'fixtures', 'gl.xml')
+
+# Runs in a fresh interpreter to include the cost of compiling and importing the module
+SAMPLE = '''
+import ctypes
+import json
+import sys
+import time
+
+start = time.perf_counter()
+import {module} as gl
+imported = time.perf_counter()
+
+callback = ctypes.CFUNCTYPE(None)(lambda: None)
+address = ctypes.cast(callback, ctypes.c_void_p).value
+gl.load(lambda name: address)
+loaded = time.perf_counter()
+
+# The lazy module resolves its commands on their first call
+for command in list(getattr(gl, "_commands", {{}}).values()):
+    command._resolve()
+resolved = time.perf_counter()
+
+json.dump([imported - start, loaded - imported, resolved - start], sys.stdout)
+'''
+
+
+def sample(directory, module, repeat):
+    """Median timings of fresh imports of a module"""
+    results = []
+    for _ in range(repeat):
+        output = subprocess.check_output(
+            [sys.executable, '-B', '-c', SAMPLE.format(module=module)],
+            cwd=directory,
+        )
+        results.append(json.loads(output))
+    return [statistics.median(values) for values in zip(*results)]
+
+
+def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument('path', nargs='?', default=DEFAULT_PATH)
+    parser.add_argument('--api', default='gl')
+    parser.add_argument('--profile', default='compatibility')
+    parser.add_argument('--version', default='4.6')
+    parser.add_argument('--repeat', type=int, default=11)
+    values = parser.parse_args()
+
+    registry = RegistryReader.from_file(values.path).read()
+    profile = registry.get_profile(values.api, values.profile, values.version)
+    print(profile)
+
+    with tempfile.TemporaryDirectory() as directory:
+        print('{:<10}{:>10}{:>10}{:>16}'.format('mode', 'import', 'load', 'all resolved'))
+        for name, lazy in (('lazy', True), ('batched', False)):
+            module = 'gl_{}'.format(name)
+            CtypesWriter(registry, profile, lazy=lazy).write(os.path.join(directory, module + '.py'))
+            imported, loaded, resolved = sample(directory, module, values.repeat)
+            print('{:<10}{:>8.1f}ms{:>8.1f}ms{:>14.1f}ms'.format(name, imported * 1000, loaded * 1000, resolved * 1000))
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,208 @@
+"""
+Fixtures for the benchmark suite in ``bench_registry.py``.
+
+Every benchmark records the best wall time of several rounds and the
+peak memory traced during one extra round with the cyclic garbage
+collector paused. Times are stored relative to a short calibration
+loop to even out differences between runs, but still vary between
+machines. Peak memory only depends on the python version. Record and
+compare it by running the whole suite: tables shared by the process,
+like the interned strings, grow as earlier benchmarks run, so a
+benchmark run alone can peak lower.
+
+The results are checked against ``baseline.json`` and a benchmark
+fails when it's slower or uses more memory than the baseline allows.
+The comparisons are skipped when the baseline was recorded with
+another python version.
+
+Usage::
+
+    # Compare to the stored baseline
+    pytest benchmarks/bench_registry.py
+
+    # Only fail on peak memory and scaling like CI does
+    pytest benchmarks/bench_registry.py --bench-time-tolerance 100
+
+    # Record a new baseline after an intended change
+    pytest benchmarks/bench_registry.py --bench-update
+"""
+import gc
+import json
+import os
+import sys
+import time
+import tracemalloc
+
+import pytest
+
+import synthetic
+
+BASELINE_PATH = os.path.join(os.path.dirname(__file__), 'baseline.json')
+REGISTRY_PATH = os.path.join(os.path.dirname(__file__), '..', 'tests', 'fixtures', 'gl.xml')
+PYTHON_VERSION = '{}.{}'.format(*sys.version_info)
+
+
+def pytest_addoption(parser):
+    group = parser.getgroup('bench', 'registry benchmarks')
+    group.addoption('--bench-update', action='store_true', help='Store the results as the new baseline')
+    group.addoption('--bench-rounds', type=int, default=5, help='Timed rounds per benchmark')
+    group.addoption(
+        '--bench-time-tolerance', type=float, default=1.5,
+        help='Fail when a benchmark is slower than the baseline times this factor',
+    )
+    group.addoption(
+        '--bench-memory-tolerance', type=float, default=1.1,
+        help='Fail when the peak memory is larger than the baseline times this factor',
+    )
+    group.addoption(
+        '--bench-scaling-tolerance', type=float, default=1.5,
+        help='Fail when the read time per unit of scale grows more than this factor in the scaling benchmark',
+    )
+    group.addoption(
+        '--bench-gc-scaling-tolerance', type=float, default=2.0,
+        help='Like --bench-scaling-tolerance for reads with the garbage collector running',
+    )
+    group.addoption(
+        '--bench-scales', default='1,10',
+        help='Comma separated synthetic registry scales read by the scaling benchmark. For example 1,10,100',
+    )
+
+
+def calibrate():
+    """Best time of a fixed workload used as the unit for all timings"""
+    best = float('inf')
+    for _ in range(5):
+        start = time.perf_counter()
+        data = {}
+        for i in range(200000):
+            data[str(i)] = i
+        best = min(best, time.perf_counter() - start)
+    return best
+
+
+class Bench:
+    """Measures a function and compares the result to the baseline. Created by the ``bench`` fixture"""
+
+    #: Keep running rounds of fast functions for at least this many seconds
+    MIN_TIME = 0.2
+    #: Upper limit for the number of rounds of fast functions
+    MAX_ROUNDS = 1000
+
+    def __init__(self, name, config, baseline):
+        self.name = name
+        self.config = config
+        self.baseline = baseline
+
+    def __call__(self, func, setup=None):
+        """Measure ``func`` and fail if it's slower or uses more memory than the baseline allows.
+
+        Args:
+            func: Called with the return value of ``setup`` if supplied
+            setup: Called before every round. Not measured.
+        Returns:
+            The return value of the last call
+        """
+        best = float('inf')
+        rounds = 0
+        min_rounds = self.config.getoption('--bench-rounds')
+        end = time.perf_counter() + self.MIN_TIME
+        while rounds < min_rounds or (time.perf_counter() < end and rounds < self.MAX_ROUNDS):
+            args = (setup(),) if setup else ()
+            start = time.perf_counter()
+            result = func(*args)
+            best = min(best, time.perf_counter() - start)
+            del result
+            rounds += 1
+
+        args = (setup(),) if setup else ()
+        # Cyclic collections would make the peak depend on the allocations of earlier
+        # benchmarks. Without them the peak is the same in every run and test order.
+        gc.collect()
+        enabled = gc.isenabled()
+        gc.disable()
+        tracemalloc.start()
+        try:
+            result = func(*args)
+            _, peak = tracemalloc.get_traced_memory()
+        finally:
+            tracemalloc.stop()
+            if enabled:
+                gc.enable()
+
+        print('\n{}: {:.4f}s, {:.2f} MB peak'.format(self.name, best, peak / 1024 / 1024))
+        self.check({'time': best / self.baseline['current_calibration'], 'peak_memory': peak})
+        return result
+
+    def check(self, measured):
+        if self.config.getoption('--bench-update'):
+            self.baseline['benchmarks'][self.name] = measured
+            return
+
+        if self.baseline['python'] != PYTHON_VERSION:
+            pytest.skip('The baseline was recorded with python {}'.format(self.baseline['python']))
+        expected = self.baseline['benchmarks'].get(self.name)
+        if expected is None:
+            pytest.skip('No baseline for {}. Record one with --bench-update'.format(self.name))
+
+        time_limit = expected['time'] * self.config.getoption('--bench-time-tolerance')
+        assert measured['time'] <= time_limit, '{} is {:.0%} slower than the baseline'.format(
+            self.name, measured['time'] / expected['time'] - 1,
+        )
+        memory_limit = expected['peak_memory'] * self.config.getoption('--bench-memory-tolerance')
+        assert measured['peak_memory'] <= memory_limit, '{} uses {:.0%} more memory than the baseline'.format(
+            self.name, measured['peak_memory'] / expected['peak_memory'] - 1,
+        )
+
+
+@pytest.fixture(scope='session')
+def baseline(request):
+    """The stored baseline. Rewritten at the end of the session with ``--bench-update``"""
+    try:
+        with open(BASELINE_PATH) as fd:
+            data = json.load(fd)
+    except (OSError, ValueError):
+        data = {'calibration': None, 'python': PYTHON_VERSION, 'benchmarks': {}}
+
+    data['current_calibration'] = calibrate()
+    yield data
+
+    if request.config.getoption('--bench-update'):
+        data['calibration'] = data.pop('current_calibration')
+        data['python'] = PYTHON_VERSION
+        with open(BASELINE_PATH, 'w') as fd:
+            json.dump(data, fd, indent=2, sort_keys=True)
+            fd.write('\n')
+
+
+@pytest.fixture
+def bench(request, baseline):
+    """Measure a function and compare the result to the baseline"""
+    return Bench(request.node.name, request.config, baseline)
+
+
+@pytest.fixture(scope='session')
+def registry_data():
+    with open(REGISTRY_PATH, 'rb') as fd:
+        return fd.read()
+
+
+@pytest.fixture(scope='session')
+def registry_path():
+    return REGISTRY_PATH
+
+
+@pytest.fixture(scope='session')
+def synthetic_paths(tmp_path_factory):
+    """Paths to synthetic registries by scale. See ``synthetic.py``"""
+    directory = tmp_path_factory.mktemp('registries')
+    paths = {}
+
+    def get(scale):
+        if scale not in paths:
+            path = str(directory / 'gl_x{}.xml'.format(scale))
+            with open(path, 'w', encoding='utf-8') as fd:
+                synthetic.write(fd, scale=scale)
+            paths[scale] = path
+        return paths[scale]
+
+    return get
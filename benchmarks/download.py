@@ -0,0 +1,64 @@
+"""
+Parsing a registry while it downloads compared to downloading it first.
+
+Serves the registry from a local http server throttled to a fixed
+bandwidth and reports the total time, the time until the first
+``Command`` is built and the peak memory traced during the read.
+
+Usage::
+
+    python benchmarks/download.py [path/to/gl.xml] [--bandwidth MB/s]
+"""
+import argparse
+import os
+import sys
+import time
+import tracemalloc
+
+from opengl_registry import RegistryReader
+
+# The server the download tests use
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), '..', 'tests'))
+from registry_server import REGISTRY_PATH, RegistryServer  # noqa: E402
+
+
+class TimedReader(RegistryReader):
+    """Records when the first command is built"""
+    first_command = None
+
+    def _build_command(self, elem):
+        if TimedReader.first_command is None:
+            TimedReader.first_command = time.perf_counter()
+        return super()._build_command(elem)
+
+
+def measure(url, stream):
+    """Time a read, then trace its memory in a second read since tracing slows it down"""
+    TimedReader.first_command = None
+    start = time.perf_counter()
+    TimedReader.from_url(url, stream=stream).read()
+    total = time.perf_counter() - start
+    first = TimedReader.first_command - start
+
+    tracemalloc.start()
+    TimedReader.from_url(url, stream=stream).read()
+    _, peak = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    return total, first, peak
+
+
+def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument('path', nargs='?', default=REGISTRY_PATH)
+    parser.add_argument('--bandwidth', type=float, default=10.0, help='Bandwidth in MB/s')
+    values = parser.parse_args()
+
+    with RegistryServer(values.path, bandwidth=values.bandwidth) as server:
+        print('{:<12}{:>10}{:>16}{:>14}'.format('mode', 'total', 'first command', 'peak memory'))
+        for name, stream in (('download', False), ('stream', True)):
+            total, first, peak = measure(server.url(), stream)
+            print('{:<12}{:>9.3f}s{:>15.3f}s{:>11.1f} MB'.format(name, total, first, peak / 1024 / 1024))
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,57 @@
+"""
+Downloading several registry files one by one compared to concurrently.
+
+Serves the registry from a local http server that waits a fixed
+latency before answering every request, like a remote server would,
+and reports the time to download and parse all files with
+``RegistryReader.from_url`` in a loop and with ``RegistryReader.fetch_all``.
+
+Usage::
+
+    python benchmarks/fetch_all.py [path/to/gl.xml] [--count 8] [--latency 0.3] [--connections 8]
+"""
+import argparse
+import asyncio
+import os
+import sys
+import time
+
+from opengl_registry import RegistryReader
+from opengl_registry.aio import AsyncDownloader
+
+# The server the download tests use
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), '..', 'tests'))
+from registry_server import REGISTRY_PATH, RegistryServer  # noqa: E402
+
+
+async def fetch_all(urls, connections):
+    async with AsyncDownloader(max_connections=connections) as downloader:
+        return await RegistryReader.fetch_all(urls, downloader=downloader)
+
+
+def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument('path', nargs='?', default=REGISTRY_PATH)
+    parser.add_argument('--count', type=int, default=8, help='Number of files to fetch')
+    parser.add_argument('--latency', type=float, default=0.3, help='Server latency in seconds')
+    parser.add_argument('--connections', type=int, default=8)
+    values = parser.parse_args()
+
+    with RegistryServer(values.path, delay=values.latency) as server:
+        urls = [server.url('gl{}.xml'.format(i)) for i in range(values.count)]
+        start = time.perf_counter()
+        for url in urls:
+            RegistryReader.from_url(url)
+        serial = time.perf_counter() - start
+
+        start = time.perf_counter()
+        asyncio.get_event_loop().run_until_complete(fetch_all(urls, values.connections))
+        concurrent = time.perf_counter() - start
+
+        print('{} files, {:.0f} ms latency'.format(values.count, values.latency * 1000))
+        print('{:<12}{:>8.3f}s'.format('serial', serial))
+        print('{:<12}{:>8.3f}s'.format('fetch_all', concurrent))
+
+
+if __name__ == '__main__':
+    main()
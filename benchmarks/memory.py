@@ -0,0 +1,167 @@
+"""
+Memory used by a loaded registry.
+
+Reports the bytes per instance for every registry data class
+(the object itself plus its ``__dict__`` if it has one, not the
+values it references), the total memory allocated by
+``RegistryReader.read()``, how many of the strings in the registry
+are shared copies and the resident memory of the process after
+reading the registry several times like a service keeping several
+revisions in memory.
+
+Usage::
+
+    python benchmarks/memory.py [path/to/gl.xml] [--copies N]
+"""
+import argparse
+import gc
+import os
+import subprocess
+import sys
+import tracemalloc
+from collections import defaultdict
+
+from opengl_registry import RegistryReader
+
+DEFAULT_PATH = os.path.join(os.path.dirname(__file__), '..', 'tests', 'fixtures', 'gl.xml')
+
+
+def registry_objects(registry):
+    """Yield every data object in the registry"""
+    yield from registry.types
+    yield from registry.groups.values()
+    for enums in registry.enums:
+        yield enums
+        yield from enums.entires
+    yield registry.commands
+    for command in registry.commands.entries:
+        yield command
+        yield from command.params
+    for feature in registry.features + registry.extensions:
+        yield feature
+        yield from feature.require
+        yield from feature.remove
+
+
+def attribute_names(obj):
+    """Names of all instance attributes, both slots and ``__dict__`` entries"""
+    names = [name for cls in type(obj).__mro__ for name in getattr(cls, '__slots__', ())]
+    if hasattr(obj, '__dict__'):
+        names.extend(vars(obj))
+    return names
+
+
+def clone(obj):
+    """Create a new instance the same way a constructor would, sharing all attribute values"""
+    cls = type(obj)
+    new = cls.__new__(cls)
+    for name in attribute_names(obj):
+        setattr(new, name, getattr(obj, name))
+    return new
+
+
+def instance_size(objects):
+    """Average bytes per instance, not counting the values it references"""
+    tracemalloc.start()
+    before, _ = tracemalloc.get_traced_memory()
+    # Repeat small samples so allocator noise averages out
+    objects = objects * (1000 // len(objects) + 1)
+    clones = [clone(obj) for obj in objects]
+    after, _ = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    return (after - before - sys.getsizeof(clones)) // len(clones)
+
+
+def string_values(obj):
+    """Yield the strings referenced by an object including strings in its lists and sets"""
+    for name in attribute_names(obj):
+        value = getattr(obj, name, None)
+        if isinstance(value, str):
+            yield value
+        elif isinstance(value, (list, set, tuple)):
+            yield from (item for item in value if isinstance(item, str))
+
+
+def string_sharing(registry):
+    """Count the string references, the string objects and the distinct values in the registry"""
+    references = 0
+    objects = {}
+    values = set()
+    for obj in registry_objects(registry):
+        for value in string_values(obj):
+            references += 1
+            objects[id(value)] = value
+            values.add(value)
+    return references, objects, values
+
+
+def resident_memory():
+    """Resident set size of this process in bytes. Only available on Linux."""
+    try:
+        with open('/proc/self/statm') as fd:
+            return int(fd.read().split()[1]) * os.sysconf('SC_PAGE_SIZE')
+    except (OSError, ValueError):
+        return None
+
+
+def measure_resident(path, copies):
+    """Resident memory growth of keeping several registries in memory. Run in a fresh process."""
+    gc.collect()
+    before = resident_memory()
+    registries = [RegistryReader.from_file(path).read() for _ in range(copies)]
+    gc.collect()
+    after = resident_memory()
+    print(after - before if before is not None else -1)
+    return registries
+
+
+def main(path, copies):
+    reader = RegistryReader.from_file(path)
+
+    tracemalloc.start()
+    registry = reader.read()
+    allocated, _ = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+
+    objects = defaultdict(list)
+    for obj in registry_objects(registry):
+        objects[type(obj).__name__].append(obj)
+
+    print('{:<16}{:>10}{:>16}{:>14}'.format('class', 'count', 'bytes/entity', 'total'))
+    total = 0
+    for name in sorted(objects, key=lambda n: len(objects[n]), reverse=True):
+        size = instance_size(objects[name])
+        total += size * len(objects[name])
+        print('{:<16}{:>10}{:>16}{:>14}'.format(name, len(objects[name]), size, size * len(objects[name])))
+    print()
+    print('Object overhead: {} bytes'.format(total))
+    print('Allocated by read(): {} bytes'.format(allocated))
+
+    references, strings, values = string_sharing(registry)
+    print()
+    print('String references: {}, string objects: {}, distinct values: {}'.format(
+        references, len(strings), len(values),
+    ))
+    print('String objects: {} bytes'.format(sum(sys.getsizeof(value) for value in strings.values())))
+
+    # A fresh process so memory of the measurements above isn't reused
+    output = subprocess.check_output(
+        [sys.executable, __file__, path, '--resident', str(copies)],
+        env=dict(os.environ, PYTHONPATH=os.pathsep.join(sys.path)),
+    )
+    resident = int(output)
+    if resident >= 0:
+        print('Resident memory of {} registries: {} bytes'.format(copies, resident))
+
+
+if __name__ == '__main__':
+    parser = argparse.ArgumentParser()
+    parser.add_argument('path', nargs='?', default=DEFAULT_PATH, help='Path to gl.xml')
+    parser.add_argument('--copies', type=int, default=4, help='Registries kept in memory for the resident memory')
+    parser.add_argument('--resident', type=int, help=argparse.SUPPRESS)
+    values = parser.parse_args()
+
+    if values.resident is not None:
+        measure_resident(values.path, values.resident)
+    else:
+        main(values.path, values.copies)
@@ -0,0 +1,51 @@
+"""
+Reading several registry files in one process compared to worker processes.
+
+Without paths the test fixture is copied to gl.xml, glx.xml, wgl.xml
+and egl.xml in a temporary directory. The parallel read can only be
+faster than the sequential read with more than one cpu core.
+
+Usage::
+
+    python benchmarks/read_many.py [path/to/gl.xml path/to/egl.xml ...] [--workers N]
+"""
+import argparse
+import os
+import shutil
+import tempfile
+import time
+
+from opengl_registry import RegistryReader
+
+DEFAULT_PATH = os.path.join(os.path.dirname(__file__), '..', 'tests', 'fixtures', 'gl.xml')
+
+
+def measure(paths, workers):
+    start = time.perf_counter()
+    RegistryReader.read_many(paths, workers=workers)
+    return time.perf_counter() - start
+
+
+def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument('paths', nargs='*')
+    parser.add_argument('--workers', type=int, default=None, help='Defaults to one per file')
+    values = parser.parse_args()
+
+    with tempfile.TemporaryDirectory() as directory:
+        paths = values.paths
+        if not paths:
+            for name in ('gl', 'glx', 'wgl', 'egl'):
+                paths.append(os.path.join(directory, name + '.xml'))
+                shutil.copyfile(DEFAULT_PATH, paths[-1])
+
+        workers = values.workers or len(paths)
+        single = max(measure([path], 1) for path in paths)
+        print('{} files, {} cpu cores'.format(len(paths), os.cpu_count()))
+        print('{:<24}{:>8.3f}s'.format('slowest single file', single))
+        print('{:<24}{:>8.3f}s'.format('sequential', measure(paths, 1)))
+        print('{:<24}{:>8.3f}s'.format('{} workers'.format(workers), measure(paths, workers)))
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,406 @@
+"""
+Generates synthetic registries of any size for scalability testing.
+
+The output is a valid registry shaped like ``gl.xml``. Scale 1 has
+about as many commands, enums, groups and extensions as the test fixture
+and the distributions of the fixture are reused at every scale:
+
+* Parameters per command, parameter types, pointers, ``len`` and ``group`` attributes
+* Extension commands aliasing core commands and enums aliasing other enums
+* Enum block sizes, group sizes and the number of commands and enums per extension
+* Features of several apis requiring the core entities and a
+  ``gl`` 3.2 feature removing old entities from the core profile
+
+The same scale and seed always produce the same bytes.
+
+Usage::
+
+    python benchmarks/synthetic.py --scale 10 --output gl_x10.xml
+"""
+import argparse
+import io
+import random
+from xml.sax.saxutils import quoteattr
+
+#: Base counts at scale 1
+GROUPS = 291
+EXTENSIONS = 828
+
+#: ``(api, number, new commands, new enums)``. Features of other
+#: apis than ``gl`` require existing ``gl`` entities.
+FEATURES = (
+    ('gl', '1.0', 306, 424), ('gl', '1.1', 30, 104), ('gl', '1.2', 4, 41), ('gl', '1.3', 46, 96),
+    ('gl', '1.4', 47, 50), ('gl', '1.5', 19, 50), ('gl', '2.0', 93, 84), ('gl', '2.1', 6, 23),
+    ('gl', '3.0', 84, 237), ('gl', '3.1', 15, 61), ('gl', '3.2', 19, 64), ('gl', '3.3', 58, 16),
+    ('gl', '4.0', 46, 79), ('gl', '4.1', 89, 35), ('gl', '4.2', 12, 112), ('gl', '4.3', 44, 262),
+    ('gl', '4.4', 9, 25), ('gl', '4.5', 122, 39), ('gl', '4.6', 4, 26),
+    ('gles1', '1.0', 144, 333), ('gles2', '2.0', 142, 301), ('gles2', '3.0', 104, 321),
+    ('gles2', '3.1', 68, 177), ('gles2', '3.2', 44, 213), ('glsc2', '2.0', 111, 274),
+)
+#: The feature removing entities of older features from the core profile
+REMOVING_FEATURE = ('gl', '3.2')
+#: Entities of ``gl`` features before this version are removed from the core profile
+REMOVED_BEFORE = (3, 1)
+
+#: ``(value, weight)`` pairs. Ranges ``(low, high)`` are sampled uniformly.
+PARAM_COUNTS = (
+    (0, 63), (1, 492), (2, 747), (3, 782), (4, 521), (5, 291), (6, 133), (7, 77), (8, 58),
+    (9, 37), (10, 25), (11, 21), (12, 9), (13, 5), (14, 2), (15, 5), (17, 2), (23, 1),
+)
+PARAM_TYPES = (
+    ('GLenum', 2507), ('GLuint', 2148), ('GLint', 1627), ('GLsizei', 1273), ('GLfloat', 970),
+    ('GLdouble', 454), ('void', 319), ('GLfixed', 257), ('GLshort', 206), ('GLboolean', 178),
+    ('GLuint64', 98), ('GLchar', 85), ('GLubyte', 84), ('GLintptr', 82), ('GLbyte', 82),
+    ('GLbitfield', 59), ('GLsizeiptr', 54), ('GLint64', 45),
+)
+EXTENSION_COMMANDS = (
+    (0, 440), (1, 127), (2, 81), (3, 28), (4, 29), ((5, 6), 30), ((7, 8), 24), ((9, 12), 24),
+    ((13, 16), 10), ((17, 24), 15), ((25, 48), 13), ((49, 64), 3), ((65, 128), 3), ((129, 256), 1),
+)
+EXTENSION_ENUMS = (
+    (0, 210), (1, 146), (2, 102), (3, 59), (4, 69), ((5, 6), 56), ((7, 8), 39), ((9, 12), 39),
+    ((13, 16), 32), ((17, 24), 27), ((25, 32), 16), ((33, 48), 16), ((49, 64), 6), ((65, 128), 9),
+    ((129, 256), 2),
+)
+EXTENSION_REQUIRES = ((0, 138), (1, 659), (2, 22), (3, 5), (4, 1), (5, 1))
+ENUM_BLOCK_SIZES = (
+    ((1, 2), 17), (3, 7), ((4, 5), 8), ((6, 8), 9), ((9, 16), 16), ((17, 32), 26), ((33, 64), 8),
+    ((65, 128), 15), ((129, 256), 7), ((257, 512), 4),
+)
+GROUP_SIZES = (
+    (1, 31), (2, 48), (3, 38), (4, 32), (5, 15), ((6, 7), 20), ((8, 9), 26), ((10, 29), 59), ((30, 120), 22),
+)
+SUPPORTED = (
+    ('gl', 350), ('gl|glcore', 158), ('gles2', 157), ('gl|glcore|gles2', 72),
+    ('gles1|gles2', 40), ('gles1', 18), ('gl|gles2', 13), ('gl|gles1', 6),
+)
+VENDORS = (
+    ('EXT', 185), ('ARB', 171), ('NV', 147), ('OES', 72), ('AMD', 39), ('SGIX', 38),
+    ('APPLE', 25), ('ATI', 16), ('SGIS', 15), ('QCOM', 14), ('KHR', 12), ('IMG', 11),
+)
+
+#: Probabilities
+COMMAND_ALIAS = 617 / 3271
+PROTO_PTYPE = 164 / 3271
+PARAM_POINTER = 1995 / 10819
+POINTER_CONST = 1334 / 1995
+POINTER_LEN = 1772 / 1995
+ENUM_PARAM_GROUP = 0.9
+PARAM_GROUP = 0.2
+ENUM_ALIAS = 82 / 5906
+#: Extension commands and enums that are core entities instead of new ones
+EXTENSION_CORE_COMMAND = 414 / 2592
+EXTENSION_CORE_ENUM = 0.45
+#: Fraction of the entities of old features removed from the core profile
+REMOVED = 0.5
+
+GL_TYPES = (
+    ('GLenum', 'typedef unsigned int'), ('GLboolean', 'typedef unsigned char'),
+    ('GLbitfield', 'typedef unsigned int'), ('GLvoid', 'typedef void'), ('GLbyte', 'typedef khronos_int8_t'),
+    ('GLubyte', 'typedef khronos_uint8_t'), ('GLshort', 'typedef khronos_int16_t'),
+    ('GLushort', 'typedef khronos_uint16_t'), ('GLint', 'typedef int'), ('GLuint', 'typedef unsigned int'),
+    ('GLclampx', 'typedef khronos_int32_t'), ('GLsizei', 'typedef int'), ('GLfloat', 'typedef khronos_float_t'),
+    ('GLclampf', 'typedef khronos_float_t'), ('GLdouble', 'typedef double'), ('GLclampd', 'typedef double'),
+    ('GLchar', 'typedef char'), ('GLfixed', 'typedef khronos_int32_t'), ('GLintptr', 'typedef khronos_intptr_t'),
+    ('GLsizeiptr', 'typedef khronos_ssize_t'), ('GLint64', 'typedef khronos_int64_t'),
+    ('GLuint64', 'typedef khronos_uint64_t'),
+)
+
+VERBS = ('Get', 'Set', 'Bind', 'Create', 'Delete', 'Gen', 'Draw', 'Copy', 'Clear', 'Map', 'Tex', 'Uniform')
+NOUNS = ('Buffer', 'Texture', 'Program', 'Shader', 'Query', 'Sampler', 'Framebuffer', 'Vertex', 'Path', 'Sync')
+PARAM_NAMES = ('target', 'index', 'count', 'value', 'params', 'pname', 'size', 'data', 'offset', 'buffer')
+
+
+class _Command:
+    __slots__ = ('name', 'proto_type', 'proto_ptype', 'params', 'alias')
+
+    def __init__(self, name, proto_type, proto_ptype, params, alias=None):
+        self.name = name
+        self.proto_type = proto_type
+        self.proto_ptype = proto_ptype
+        # (ptype, name, pointer, const, len, group)
+        self.params = params
+        self.alias = alias
+
+
+class _Generator:
+
+    def __init__(self, scale, seed):
+        self.scale = scale
+        self.random = random.Random(seed)
+        self.commands = []
+        self.enums = []
+        self.enum_aliases = {}
+        self.groups = ['Group{}'.format(i) for i in range(max(1, round(GROUPS * scale)))]
+        self.features = []
+        self.extensions = []
+
+    def choice(self, weighted):
+        """Sample a ``(value, weight)`` table. Ranges ``(low, high)`` are sampled uniformly."""
+        value = self.random.choices([v for v, _ in weighted], [w for _, w in weighted])[0]
+        if isinstance(value, tuple):
+            return self.random.randint(*value)
+        return value
+
+    def scaled(self, count):
+        """Scale a count keeping the fraction as a probability"""
+        count *= self.scale
+        return int(count) + (self.random.random() < count - int(count))
+
+    def new_command(self, suffix='', alias=None):
+        index = len(self.commands)
+        name = 'gl{}{}{}{}'.format(
+            VERBS[index % len(VERBS)], NOUNS[index // len(VERBS) % len(NOUNS)], index, suffix,
+        )
+        if alias is not None:
+            command = _Command(name, alias.proto_type, alias.proto_ptype, alias.params, alias=alias.name)
+        else:
+            command = _Command(name, *self.proto(), params=self.params())
+        self.commands.append(command)
+        return name
+
+    def proto(self):
+        if self.random.random() < PROTO_PTYPE:
+            return self.choice(PARAM_TYPES[1:]), True
+        return 'void', False
+
+    def params(self):
+        params = []
+        for i in range(self.choice(PARAM_COUNTS)):
+            ptype = self.choice(PARAM_TYPES)
+            pointer = ptype == 'void' or self.random.random() < PARAM_POINTER
+            const = pointer and self.random.random() < POINTER_CONST
+            length = 'count' if pointer and self.random.random() < POINTER_LEN else None
+            chance = ENUM_PARAM_GROUP if ptype in ('GLenum', 'GLbitfield') else PARAM_GROUP
+            group = self.random.choice(self.groups) if self.random.random() < chance else None
+            name = '{}{}'.format(PARAM_NAMES[i % len(PARAM_NAMES)], i // len(PARAM_NAMES) or '')
+            params.append((ptype, name, pointer, const, length, group))
+        return params
+
+    def new_enum(self, suffix=''):
+        name = 'GL_SYNTHETIC_ENUM_{}{}'.format(len(self.enums), suffix)
+        if self.enums and self.random.random() < ENUM_ALIAS:
+            self.enum_aliases[name] = self.random.choice(self.enums)
+        self.enums.append(name)
+        return name
+
+    def generate(self):
+        core_commands, core_enums = self.generate_features()
+        self.generate_extensions(core_commands, core_enums)
+
+    def generate_features(self):
+        core_commands, core_enums = [], []
+        gl_features = {}
+        for api, number, commands, enums in FEATURES:
+            if api == 'gl':
+                feature_commands = [self.new_command() for _ in range(self.scaled(commands))]
+                feature_enums = [self.new_enum() for _ in range(self.scaled(enums))]
+                core_commands.extend(feature_commands)
+                core_enums.extend(feature_enums)
+                gl_features[number] = feature_commands, feature_enums
+            else:
+                feature_commands = self.sample(core_commands, self.scaled(commands))
+                feature_enums = self.sample(core_enums, self.scaled(enums))
+
+            removed = []
+            if (api, number) == REMOVING_FEATURE:
+                for old_number, (old_commands, old_enums) in gl_features.items():
+                    if tuple(map(int, old_number.split('.'))) < REMOVED_BEFORE:
+                        removed.append((
+                            old_number,
+                            self.sample(old_commands, int(len(old_commands) * REMOVED)),
+                            self.sample(old_enums, int(len(old_enums) * REMOVED)),
+                        ))
+            self.features.append((api, number, self.split(feature_commands, feature_enums), removed))
+
+        return core_commands, core_enums
+
+    def generate_extensions(self, core_commands, core_enums):
+        for index in range(max(1, round(EXTENSIONS * self.scale))):
+            vendor = self.choice(VENDORS)
+            suffix = '' if vendor == 'ARB' else vendor
+            commands, enums = [], []
+            for _ in range(self.choice(EXTENSION_COMMANDS)):
+                if self.random.random() < EXTENSION_CORE_COMMAND:
+                    commands.append(self.random.choice(core_commands))
+                elif self.random.random() < COMMAND_ALIAS:
+                    alias = self.commands[self.random.randrange(len(core_commands))]
+                    commands.append(self.new_command(suffix, alias=alias))
+                else:
+                    commands.append(self.new_command(suffix))
+            for _ in range(self.choice(EXTENSION_ENUMS)):
+                if self.random.random() < EXTENSION_CORE_ENUM:
+                    enums.append(self.random.choice(core_enums))
+                else:
+                    enums.append(self.new_enum('_' + suffix if suffix else ''))
+
+            requires = self.choice(EXTENSION_REQUIRES)
+            blocks = self.split(commands, enums, blocks=requires) if requires else []
+            name = 'GL_{}_synthetic_{}'.format(vendor, index)
+            self.extensions.append((name, self.choice(SUPPORTED), blocks))
+
+    def sample(self, names, count):
+        return self.random.sample(names, min(count, len(names)))
+
+    def split(self, commands, enums, blocks=None):
+        """Split names into require blocks. The first block is the largest like in the real registry."""
+        if blocks is None:
+            blocks = 1 + (len(commands) + len(enums)) // 60
+        result = [([], []) for _ in range(blocks)]
+        for names, kind in ((commands, 0), (enums, 1)):
+            for i, name in enumerate(names):
+                block = 0 if i % 2 == 0 else self.random.randrange(blocks)
+                result[block][kind].append(name)
+        return result
+
+    def write(self, fd):
+        """Write the registry as xml to a text stream"""
+        write = fd.write
+        write('<?xml version="1.0" encoding="UTF-8"?>\n<registry>\n')
+        write('    <comment>Synthetic registry scale={} generated for benchmarks</comment>\n'.format(self.scale))
+
+        write('    <types>\n')
+        write('        <type name="khrplatform">#include &lt;KHR/khrplatform.h&gt;</type>\n')
+        for name, typedef in GL_TYPES:
+            requires = ' requires="khrplatform"' if 'khronos' in typedef else ''
+            write('        <type{}>{} <name>{}</name>;</type>\n'.format(requires, typedef, name))
+        write('    </types>\n\n')
+
+        write('    <groups>\n')
+        for group in self.groups:
+            write('        <group name="{}">\n'.format(group))
+            for enum in self.sample(self.enums, self.choice(GROUP_SIZES)):
+                write('            <enum name="{}"/>\n'.format(enum))
+            write('        </group>\n')
+        write('    </groups>\n\n')
+
+        self.write_enums(write)
+
+        write('    <commands namespace="GL">\n')
+        for command in self.commands:
+            self.write_command(write, command)
+        write('    </commands>\n\n')
+
+        for api, number, blocks, removed in self.features:
+            name = 'GL_VERSION_{}'.format(number.replace('.', '_'))
+            if api != 'gl':
+                name = 'GL_{}_VERSION_{}'.format(api.upper(), number.replace('.', '_'))
+            write('    <feature api="{}" name="{}" number="{}">\n'.format(api, name, number))
+            if number == '1.0':
+                write('        <require>\n            <type name="GLvoid"/>\n        </require>\n')
+            for commands, enums in blocks:
+                self.write_requirement(write, 'require', '', commands, enums)
+            for old_number, commands, enums in removed:
+                comment = ' profile="core" comment={}'.format(
+                    quoteattr('Compatibility-only GL {} features removed from GL {}'.format(old_number, number)),
+                )
+                self.write_requirement(write, 'remove', comment, commands, enums)
+            write('    </feature>\n')
+
+        write('\n    <extensions>\n')
+        for name, supported, blocks in self.extensions:
+            write('        <extension name="{}" supported="{}">\n'.format(name, supported))
+            for i, (commands, enums) in enumerate(blocks):
+                attributes = ' api="gles2"' if i and 'gles2' in supported else ''
+                self.write_requirement(write, 'require', attributes, commands, enums)
+            write('        </extension>\n')
+        write('    </extensions>\n</registry>\n')
+
+    def write_enums(self, write):
+        index = 0
+        value = 0x8000
+        while index < len(self.enums):
+            size = self.choice(ENUM_BLOCK_SIZES)
+            names = self.enums[index:index + size]
+            end = value + max(size, 16) - 1
+            write('    <enums namespace="GL" start="0x{:04X}" end="0x{:04X}" vendor="{}">\n'.format(
+                value, end, self.choice(VENDORS),
+            ))
+            for name in names:
+                alias = self.enum_aliases.get(name)
+                write('        <enum value="0x{:04X}" name="{}"{}/>\n'.format(
+                    value, name, ' alias="{}"'.format(alias) if alias else '',
+                ))
+                value += 1
+            if len(names) < size:
+                write('        <unused start="0x{:04X}" end="0x{:04X}"/>\n'.format(value, end))
+            write('    </enums>\n\n')
+            value = end + 1
+            index += size
+
+    def write_command(self, write, command):
+        write('        <command>\n')
+        if command.proto_ptype:
+            write('            <proto><ptype>{}</ptype> <name>{}</name></proto>\n'.format(
+                command.proto_type, command.name,
+            ))
+        else:
+            write('            <proto>{} <name>{}</name></proto>\n'.format(command.proto_type, command.name))
+        for ptype, name, pointer, const, length, group in command.params:
+            attributes = ''
+            if group:
+                attributes += ' group="{}"'.format(group)
+            if length:
+                attributes += ' len="{}"'.format(length)
+            if ptype == 'void':
+                write('            <param{}>{}void *<name>{}</name></param>\n'.format(
+                    attributes, 'const ' if const else '', name,
+                ))
+            else:
+                write('            <param{}>{}<ptype>{}</ptype> {}<name>{}</name></param>\n'.format(
+                    attributes, 'const ' if const else '', ptype, '*' if pointer else '', name,
+                ))
+        if command.alias:
+            write('            <alias name="{}"/>\n'.format(command.alias))
+        write('        </command>\n')
+
+    @staticmethod
+    def write_requirement(write, tag, attributes, commands, enums):
+        write('        <{}{}>\n'.format(tag, attributes))
+        for name in enums:
+            write('            <enum name="{}"/>\n'.format(name))
+        for name in commands:
+            write('            <command name="{}"/>\n'.format(name))
+        write('        </{}>\n'.format(tag))
+
+
+def write(fd, scale: float = 1.0, seed: int = 0):
+    """Write a synthetic registry to a text stream.
+
+    Args:
+        fd: The text stream
+        scale (float): Size relative to the test fixture
+        seed (int): Seed of the random numbers
+    """
+    generator = _Generator(scale, seed)
+    generator.generate()
+    generator.write(fd)
+
+
+def generate(scale: float = 1.0, seed: int = 0) -> bytes:
+    """Generate a synthetic registry.
+
+    Args:
+        scale (float): Size relative to the test fixture
+        seed (int): Seed of the random numbers
+    Returns:
+        bytes: The registry xml
+    """
+    fd = io.StringIO()
+    write(fd, scale=scale, seed=seed)
+    return fd.getvalue().encode()
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument('--scale', type=float, default=1.0, help='Size relative to the test fixture')
+    parser.add_argument('--seed', type=int, default=0, help='Seed of the random numbers')
+    parser.add_argument('--output', '-o', required=True, help='Path to the generated xml file')
+    values = parser.parse_args()
+
+    with open(values.output, 'w', encoding='utf-8') as fd:
+        write(fd, scale=values.scale, seed=values.seed)
+
+
+if __name__ == '__main__':
+    main()
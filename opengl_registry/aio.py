@@ -0,0 +1,116 @@
+import asyncio
+import logging
+from concurrent.futures import ThreadPoolExecutor
+from typing import List
+
+import requests
+from requests.adapters import HTTPAdapter
+
+logger = logging.getLogger(__name__)
+
+
+class AsyncDownloader:
+    """Downloads registry files concurrently from asyncio code.
+
+    Requests are sent with a shared ``requests.Session`` from a
+    dedicated thread pool so the event loop is never blocked. At most
+    ``max_connections`` downloads run at the same time and every
+    download reuses the pooled connections of the session.
+
+    Example::
+
+        async with AsyncDownloader(max_connections=4) as downloader:
+            gl, egl = await downloader.fetch_all([gl_url, egl_url])
+
+        # Parse the files as well
+        readers = await RegistryReader.fetch_all([
+            RegistryReader.revision_url(revision) for revision in revisions
+        ])
+    """
+
+    #: Default number of concurrent downloads
+    DEFAULT_MAX_CONNECTIONS = 8
+    #: Default number of seconds to wait for the server to accept the connection or send data
+    DEFAULT_TIMEOUT = 30.0
+
+    def __init__(
+        self,
+        *,
+        max_connections: int = DEFAULT_MAX_CONNECTIONS,
+        timeout: float = DEFAULT_TIMEOUT,
+        http_cache=None
+    ):
+        """Initialize the downloader.
+
+        Keyword Args:
+            max_connections (int): Maximum number of concurrent downloads and pooled connections per host
+            timeout (float): Seconds to wait for the server to accept the connection or send data.
+                ``requests.Timeout`` is raised when it expires.
+            http_cache (HttpCache): Avoid downloading files again if they didn't change on the server
+        """
+        self._max_connections = max_connections
+        self._timeout = timeout
+        self._http_cache = http_cache
+
+        self._session = requests.Session()
+        adapter = HTTPAdapter(pool_connections=max_connections, pool_maxsize=max_connections)
+        self._session.mount("http://", adapter)
+        self._session.mount("https://", adapter)
+        self._executor = ThreadPoolExecutor(max_workers=max_connections)
+
+    @property
+    def max_connections(self) -> int:
+        """int: Maximum number of concurrent downloads"""
+        return self._max_connections
+
+    @property
+    def timeout(self) -> float:
+        """float: Seconds to wait for the server to accept the connection or send data"""
+        return self._timeout
+
+    @property
+    def http_cache(self):
+        """HttpCache: The download cache or ``None``"""
+        return self._http_cache
+
+    async def fetch(self, url: str) -> bytes:
+        """Download a file.
+
+        Args:
+            url (str): The url to download
+        Returns:
+            bytes: The response body
+        """
+        loop = asyncio.get_event_loop()
+        return await loop.run_in_executor(self._executor, self._fetch, url)
+
+    async def fetch_all(self, urls: List[str]) -> List[bytes]:
+        """Download several files concurrently.
+
+        Args:
+            urls (List[str]): The urls to download
+        Returns:
+            List[bytes]: The response bodies in the order of the urls
+        """
+        return list(await asyncio.gather(*(self.fetch(url) for url in urls)))
+
+    def close(self):
+        """Close the pooled connections and stop the download threads"""
+        self._executor.shutdown(wait=False)
+        self._session.close()
+
+    def _fetch(self, url: str) -> bytes:
+        logger.info("Downloading '%s'", url)
+        if self._http_cache is not None:
+            return self._http_cache.fetch(url, session=self._session, timeout=self._timeout)
+
+        response = self._session.get(url, timeout=self._timeout)
+        if response.status_code != requests.codes.ok:
+            response.raise_for_status()
+        return response.content
+
+    async def __aenter__(self) -> "AsyncDownloader":
+        return self
+
+    async def __aexit__(self, *exc_info):
+        self.close()
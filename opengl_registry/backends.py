@@ -0,0 +1,353 @@
+import logging
+import sys
+from abc import ABC, abstractmethod
+from typing import Dict, Iterable, Optional, Set
+from xml.etree import ElementTree
+from xml.parsers import expat
+
+from opengl_registry.features import FeatureDetails
+
+logger = logging.getLogger(__name__)
+
+
+class ParserBackend(ABC):
+    """Parses a registry document streamed from a source into registry objects.
+
+    ``RegistryReader`` hands the bytes of the source to its backend when
+    reading. Backends create the objects with the ``*_cls`` classes of the
+    reader so custom classes keep working with every backend.
+    """
+
+    @abstractmethod
+    def parse(self, reader, chunks: Iterable[bytes], names: Set[str], sections: Dict[str, list]) -> Optional[str]:
+        """Parse a registry document.
+
+        Args:
+            reader (RegistryReader): The reader. Provides the classes to create.
+            chunks (Iterable[bytes]): The document in consecutive chunks
+            names (Set[str]): The sections to build. For example ``commands`` and ``enums``
+            sections (Dict[str, list]): Section name and the list to add its objects to
+        Returns:
+            str: The commands namespace
+        """
+
+
+class ElementTreeBackend(ParserBackend):
+    """Parses the source incrementally with ``xml.etree.ElementTree``.
+
+    Every top level element is handed to the element builders of the
+    reader as soon as it's complete and discarded afterwards.
+    This is the default backend.
+    """
+
+    def parse(self, reader, chunks: Iterable[bytes], names: Set[str], sections: Dict[str, list]) -> Optional[str]:
+        return reader.walk_events(self._events(chunks), names, sections)
+
+    @staticmethod
+    def _events(chunks: Iterable[bytes]):
+        parser = ElementTree.XMLPullParser(events=("start", "end"))
+        for chunk in chunks:
+            parser.feed(chunk)
+            yield from parser.read_events()
+        parser.close()
+        yield from parser.read_events()
+
+
+class ExpatBackend(ParserBackend):
+    """Drives ``xml.parsers.expat`` callbacks straight into the registry objects.
+
+    No element objects are created. Each object is built from the
+    attributes and text collected while its xml element is parsed.
+    Text is only collected inside the elements that need it.
+
+    The element builders of the reader are bypassed, so overriding them
+    has no effect and ``ReadStats`` only records the ``walk`` phase.
+    The ``*_cls`` classes are used like with the other backends.
+
+    Example::
+
+        reader = RegistryReader.from_file('gl.xml', backend=ExpatBackend())
+        registry = reader.read()
+    """
+
+    def parse(self, reader, chunks: Iterable[bytes], names: Set[str], sections: Dict[str, list]) -> Optional[str]:
+        parser = expat.ParserCreate()
+        parser.buffer_text = True
+        builder = _ExpatBuilder(reader, parser, names, sections)
+
+        for chunk in chunks:
+            parser.Parse(chunk, False)
+        parser.Parse(b"", True)
+        return builder.namespace
+
+
+def _intern(value: Optional[str]) -> Optional[str]:
+    """Get the single shared copy of an optional string repeated across the registry.
+
+    Names, types, groups, apis and profiles occur thousands of times.
+    The builders pass them through ``sys.intern`` so the interpreter's
+    string table stores every distinct value once, also across registries
+    read in the same process, and releases values no longer referenced.
+    """
+    return sys.intern(value) if value is not None else None
+
+
+class _ExpatBuilder:
+    """Builds registry objects from expat callbacks.
+
+    Elements are looked up by ``(parent tag, tag)`` like in
+    ``RegistryReader._dispatch`` until an element starting an object
+    of a requested section is found. The parser handlers are then
+    replaced with the handlers of that object until it ends, so the
+    nested elements are handled without further lookups.
+    """
+
+    def __init__(self, reader, parser, names: Set[str], sections: Dict[str, list]):
+        self.reader = reader
+        self.parser = parser
+        self.sections = sections
+        self.namespace = None
+        self.stack = ["#document"]
+        self.depth = 0
+
+        # Attributes of the current element, its text and the text of its <name> or <ptype> child
+        self.attrs = None
+        self.text = None
+        self.part = None
+        self.name = None
+        self.ptype = None
+
+        self.entries = None
+        self.command = None
+        self.parent = None
+        self.details = None
+
+        objects = {
+            ("types", "type"): ("types", self.start_type, self.type_start, self.type_end),
+            ("groups", "group"): ("groups", self.start_group, self.group_start, self.group_end),
+            ("registry", "enums"): ("enums", self.start_enums, self.enums_start, self.enums_end),
+            ("commands", "command"): ("commands", self.start_command, self.command_start, self.command_end),
+            ("registry", "feature"): ("features", self.start_feature, self.parent_start, self.parent_end),
+            ("extensions", "extension"): ("extensions", self.start_extension, self.parent_start, self.parent_end),
+        }
+        self.objects = {key: value[1:] for key, value in objects.items() if value[0] in names}
+
+        parser.StartElementHandler = self.start
+        parser.EndElementHandler = self.end
+
+    def start(self, tag: str, attrs: dict):
+        key = (self.stack[-1], tag)
+        self.stack.append(tag)
+        handlers = self.objects.get(key)
+        if handlers is not None:
+            handlers[0](attrs)
+            self.depth = 0
+            self.parser.StartElementHandler = handlers[1]
+            self.parser.EndElementHandler = handlers[2]
+        elif key == ("registry", "commands"):
+            self.namespace = attrs.get("namespace")
+
+    def end(self, tag: str):
+        self.stack.pop()
+
+    def leave(self):
+        """Return to the top level handlers at the end of an object"""
+        self.stack.pop()
+        self.parser.StartElementHandler = self.start
+        self.parser.EndElementHandler = self.end
+
+    def data(self, text: str):
+        self.text.append(text)
+        if self.part is not None:
+            self.part.append(text)
+
+    def capture(self, attrs: dict):
+        """Collect the text of a type, proto or param"""
+        self.attrs = attrs
+        self.name = self.ptype = None
+        self.text = []
+        self.parser.CharacterDataHandler = self.data
+
+    def release(self) -> str:
+        self.parser.CharacterDataHandler = None
+        text = "".join(self.text)
+        self.text = None
+        return text
+
+    def start_type(self, attrs: dict):
+        self.capture(attrs)
+
+    def type_start(self, tag: str, attrs: dict):
+        self.depth += 1
+        if self.depth == 1 and tag == "name":
+            self.part = []
+
+    def type_end(self, tag: str):
+        if self.depth == 0:
+            attrs = self.attrs
+            self.sections["types"].append(self.reader.type_cls(
+                name=_intern(self.name if self.name is not None else attrs.get("name")),
+                text=self.release(),
+                comment=attrs.get("comment"),
+                requires=_intern(attrs.get("requires")),
+            ))
+            self.leave()
+            return
+
+        self.depth -= 1
+        if self.depth == 0 and self.part is not None:
+            self.name = "".join(self.part)
+            self.part = None
+
+    def start_group(self, attrs: dict):
+        self.attrs = attrs
+        self.entries = set()
+
+    def group_start(self, tag: str, attrs: dict):
+        self.depth += 1
+        if self.depth == 1 and tag == "enum":
+            self.entries.add(sys.intern(attrs["name"]))
+
+    def group_end(self, tag: str):
+        if self.depth == 0:
+            self.sections["groups"].append(self.reader.group_cls(sys.intern(self.attrs["name"]), entries=self.entries))
+            self.entries = None
+            self.leave()
+        else:
+            self.depth -= 1
+
+    def start_enums(self, attrs: dict):
+        self.attrs = attrs
+        self.entries = []
+
+    def enums_start(self, tag: str, attrs: dict):
+        self.depth += 1
+        if self.depth == 1 and tag == "enum":
+            self.entries.append(self.reader.enum_cls(
+                name=sys.intern(attrs["name"]),
+                value=attrs.get("value"),
+                comment=attrs.get("comment"),
+                alias=_intern(attrs.get("alias")),
+                api=_intern(attrs.get("api")),
+            ))
+
+    def enums_end(self, tag: str):
+        if self.depth == 0:
+            attrs = self.attrs
+            self.sections["enums"].append(self.reader.enums_cls(
+                namespace=_intern(attrs.get("namespace")),
+                group_name=_intern(attrs.get("group")),
+                type=_intern(attrs.get("type")),
+                comment=attrs.get("comment"),
+                vendor=_intern(attrs.get("vendor")),
+                start=attrs.get("start"),
+                end=attrs.get("end"),
+                entries=self.entries,
+            ))
+            self.entries = None
+            self.leave()
+        else:
+            self.depth -= 1
+
+    def start_command(self, attrs: dict):
+        self.command = self.reader.command_cls()
+
+    def command_start(self, tag: str, attrs: dict):
+        self.depth += 1
+        if self.depth == 1:
+            if tag == "proto" or tag == "param":
+                self.capture(attrs)
+            elif tag == "glx":
+                self.command.glx = {
+                    "type": attrs.get("type"),
+                    "opcode": attrs.get("opcode"),
+                    "name": attrs.get("name"),
+                    "comment": attrs.get("comment"),
+                }
+            elif tag == "alias":
+                self.command.alias = sys.intern(attrs["name"])
+        elif self.depth == 2 and self.text is not None and (tag == "name" or tag == "ptype"):
+            self.part = []
+
+    def command_end(self, tag: str):
+        if self.depth == 0:
+            self.sections["commands"].append(self.command)
+            self.command = None
+            self.leave()
+            return
+
+        self.depth -= 1
+        if self.depth == 1 and self.part is not None:
+            if tag == "name":
+                self.name = "".join(self.part)
+            else:
+                self.ptype = "".join(self.part)
+            self.part = None
+        elif self.depth == 0 and self.text is not None:
+            if tag == "proto":
+                self.command.proto = self.release()
+                self.command.name = sys.intern(self.name)
+            else:
+                attrs = self.attrs
+                self.command.params.append(self.reader.command_param_cls(
+                    name=sys.intern(self.name),
+                    value=self.release(),
+                    ptype=_intern(self.ptype),
+                    group_name=_intern(attrs.get("group")),
+                    length=_intern(attrs.get("len")),
+                ))
+
+    def start_feature(self, attrs: dict):
+        self.parent = self.reader.feature_cls(
+            api=_intern(attrs.get("api")),
+            name=attrs.get("name"),
+            number=attrs.get("number"),
+        )
+
+    def start_extension(self, attrs: dict):
+        self.parent = self.reader.extension_cls(
+            name=attrs.get("name"),
+            supported=_intern(attrs.get("supported")),
+            comment=attrs.get("comment"),
+        )
+
+    def parent_start(self, tag: str, attrs: dict):
+        """Start of an element in a feature or extension"""
+        self.depth += 1
+        if self.depth == 1:
+            self.attrs = attrs
+            self.details = {"enum": [], "command": [], "type": []}
+        elif self.depth == 2 and tag in self.details:
+            self.details[tag].append(sys.intern(attrs["name"]))
+
+    def parent_end(self, tag: str):
+        if self.depth == 0:
+            self.sections["features" if tag == "feature" else "extensions"].append(self.parent)
+            self.parent = None
+            self.leave()
+            return
+
+        self.depth -= 1
+        if self.depth == 0:
+            self.end_details(tag)
+
+    def end_details(self, mode: str):
+        """Add a require or remove block to the feature or extension"""
+        attrs = self.attrs
+        names = self.details
+        self.details = None
+        details = self.reader.feature_details_cls(
+            mode,
+            profile=_intern(attrs.get("profile")),
+            api=_intern(attrs.get("api")),
+            comment=attrs.get("comment"),
+            enums=names["enum"],
+            commands=names["command"],
+            types=names["type"],
+        )
+        if mode == FeatureDetails.REQUIRE:
+            self.parent.require.append(details)
+        elif mode == FeatureDetails.REMOVE:
+            self.parent.remove.append(details)
+        else:
+            logger.warning("Unsupported mode: '%s'", mode)
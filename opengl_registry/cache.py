@@ -0,0 +1,243 @@
+import hashlib
+import inspect
+import logging
+import os
+import pickle
+import zlib
+from io import BytesIO
+from typing import Optional
+
+import requests
+
+import opengl_registry
+from opengl_registry.reader import RegistryReader
+from opengl_registry.registry import Registry
+
+logger = logging.getLogger(__name__)
+
+
+class RegistryCache:
+    """Persistent on-disk cache of parsed registries.
+
+    Entries are keyed by the SHA-256 of the registry xml, the package
+    version and a fingerprint of the reader classes. A cache hit
+    skips xml parsing entirely and simply unpickles the ``Registry``.
+
+    Example::
+
+        cache = RegistryCache()
+        registry = cache.load('gl.xml')
+    """
+
+    #: Environment variable overriding the default cache directory
+    ENV_DIRECTORY = "OPENGL_REGISTRY_CACHE_DIR"
+    #: Default upper limit for the total size of the cache in bytes
+    DEFAULT_MAX_SIZE = 64 * 1024 * 1024
+    #: File extension for cache entries
+    SUFFIX = ".registry"
+
+    def __init__(
+        self,
+        directory: str = None,
+        *,
+        max_size: int = DEFAULT_MAX_SIZE,
+        reader_cls=RegistryReader
+    ):
+        """Initialize the cache.
+
+        Keyword Args:
+            directory (str): Cache directory. Defaults to ``OPENGL_REGISTRY_CACHE_DIR``
+                or ``opengl-registry`` in the user cache directory.
+            max_size (int): The oldest entries are evicted when the cache grows beyond this size in bytes
+            reader_cls: The ``RegistryReader`` class used to parse the registry on a cache miss
+        """
+        self._directory = directory or self.default_directory()
+        self._max_size = max_size
+        self._reader_cls = reader_cls
+        self._fingerprint = self._reader_fingerprint(reader_cls)
+
+    @property
+    def directory(self) -> str:
+        """str: The cache directory"""
+        return self._directory
+
+    @property
+    def max_size(self) -> int:
+        """int: Maximum total size of the cache in bytes"""
+        return self._max_size
+
+    @classmethod
+    def default_directory(cls) -> str:
+        """str: The default cache directory"""
+        directory = os.environ.get(cls.ENV_DIRECTORY)
+        if directory:
+            return directory
+
+        base = os.environ.get("XDG_CACHE_HOME") or os.path.join(os.path.expanduser("~"), ".cache")
+        return os.path.join(base, "opengl-registry")
+
+    def key(self, data: bytes) -> str:
+        """Create the cache key for registry xml data.
+
+        Args:
+            data (bytes): The raw registry xml
+        Returns:
+            str: hex digest identifying the parsed registry
+        """
+        sha = hashlib.sha256(data)
+        sha.update(opengl_registry.__version__.encode())
+        sha.update(self._fingerprint)
+        return sha.hexdigest()
+
+    def load(self, path: str) -> Registry:
+        """Load a registry file through the cache.
+
+        Args:
+            path (str): Path to the gl.xml file
+        Returns:
+            Registry: The parsed registry
+        """
+        with open(path, "rb") as fd:
+            return self.load_bytes(fd.read())
+
+    def load_url(self, url: str = None, http_cache=None) -> Registry:
+        """Load a registry from an url through the cache.
+
+        The file is still downloaded, but parsing is skipped if
+        the content didn't change.
+
+        Args:
+            url (str): The url to the gl.xml file. ``RegistryReader.DEFAULT_URL`` is used if not supplied.
+            http_cache (HttpCache): Avoid downloading the file again if it didn't change on the server
+        Returns:
+            Registry: The parsed registry
+        """
+        url = url or self._reader_cls.DEFAULT_URL
+        if http_cache is not None:
+            return self.load_bytes(http_cache.fetch(url))
+
+        response = requests.get(url)
+        if response.status_code != requests.codes.ok:
+            response.raise_for_status()
+        return self.load_bytes(response.content)
+
+    def load_bytes(self, data: bytes) -> Registry:
+        """Load registry xml data through the cache.
+
+        Args:
+            data (bytes): The raw registry xml
+        Returns:
+            Registry: The parsed registry
+        """
+        key = self.key(data)
+        registry = self.get(key)
+        if registry is not None:
+            return registry
+
+        logger.info("Registry cache miss: %s", key)
+        registry = self._reader_cls(source=BytesIO(data)).read()
+        self.put(key, registry)
+        return registry
+
+    def get(self, key: str) -> Optional[Registry]:
+        """Get a cached registry.
+
+        Args:
+            key (str): The cache key
+        Returns:
+            Registry: The cached registry or ``None`` if not present
+        """
+        path = self._path(key)
+        try:
+            with open(path, "rb") as fd:
+                registry = pickle.loads(zlib.decompress(fd.read()))
+        except FileNotFoundError:
+            return None
+        except (OSError, zlib.error, pickle.UnpicklingError, EOFError, AttributeError, ImportError) as ex:
+            logger.warning("Discarding unreadable cache entry '%s': %s", path, ex)
+            self._remove(path)
+            return None
+
+        # Touch the entry so eviction removes the least recently used entries first
+        os.utime(path)
+        return registry
+
+    def put(self, key: str, registry: Registry):
+        """Store a registry in the cache.
+
+        Args:
+            key (str): The cache key
+            registry (Registry): The registry to store
+        """
+        os.makedirs(self._directory, exist_ok=True)
+        data = zlib.compress(pickle.dumps(registry, pickle.HIGHEST_PROTOCOL))
+
+        path = self._path(key)
+        tmp_path = "{}.{}.tmp".format(path, os.getpid())
+        with open(tmp_path, "wb") as fd:
+            fd.write(data)
+        os.replace(tmp_path, path)
+
+        self.evict()
+
+    def evict(self):
+        """Remove the least recently used entries until the cache fits in ``max_size``"""
+        entries = []
+        for entry in os.scandir(self._directory):
+            if entry.name.endswith(self.SUFFIX):
+                stat = entry.stat()
+                entries.append((stat.st_mtime, stat.st_size, entry.path))
+
+        total = sum(size for _, size, _ in entries)
+        for _, size, path in sorted(entries):
+            if total <= self._max_size:
+                break
+            logger.info("Evicting cache entry '%s'", path)
+            self._remove(path)
+            total -= size
+
+    def clear(self):
+        """Remove all entries from the cache"""
+        if not os.path.isdir(self._directory):
+            return
+
+        for entry in os.scandir(self._directory):
+            if entry.name.endswith(self.SUFFIX):
+                self._remove(entry.path)
+
+    def _path(self, key: str) -> str:
+        return os.path.join(self._directory, key + self.SUFFIX)
+
+    def _remove(self, path: str):
+        try:
+            os.remove(path)
+        except FileNotFoundError:
+            pass
+
+    @staticmethod
+    def _reader_fingerprint(reader_cls) -> bytes:
+        """Fingerprint of the reader and the classes it instantiates.
+
+        Changing any of the modules defining these classes
+        invalidates the entries created with the old code.
+        """
+        classes = [reader_cls]
+        classes.extend(getattr(reader_cls, name) for name in sorted(dir(reader_cls)) if name.endswith("_cls"))
+
+        sha = hashlib.sha256()
+        source_files = set()
+        for cls in classes:
+            sha.update("{}.{}".format(cls.__module__, cls.__qualname__).encode())
+            try:
+                source_files.add(inspect.getsourcefile(cls))
+            except TypeError:
+                pass
+
+        for path in sorted(filter(None, source_files)):
+            try:
+                with open(path, "rb") as fd:
+                    sha.update(fd.read())
+            except OSError:
+                pass
+
+        return sha.digest()
@@ -2,9 +2,13 @@ from typing import List
 
 import argparse
 import logging
+import os
 import sys
 
+from opengl_registry.cache import RegistryCache
+from opengl_registry.download import HttpCache
 from opengl_registry.reader import RegistryReader
+from opengl_registry.stats import ReadStats
 
 
 def execute_from_command_line():
@@ -15,16 +19,77 @@ def execute_from_command_line():
 
     configure_logging(getattr(logging, values.log_level))
 
-    reader = None
-    if values.file:
-        reader = RegistryReader.from_file(values.file)
+    if values.command == "diff":
+        diff(values)
+        return
+
+    stats = ReadStats() if values.profile else None
+    registry = None
+    if values.cache or values.cache_dir is not None:
+        cache = RegistryCache(values.cache_dir)
+        if values.file:
+            registry = load_cached(lambda: cache.load(values.file), stats)
+        else:
+            http_cache = HttpCache(os.path.join(cache.directory, "http"))
+            registry = load_cached(lambda: cache.load_url(values.url, http_cache=http_cache), stats)
+    elif values.file:
+        registry = RegistryReader.from_file(values.file, stats=stats).read()
     elif values.url:
-        reader = RegistryReader.from_url(values.url)
+        registry = RegistryReader.from_url(values.url, stats=stats).read()
     else:
-        reader = RegistryReader.from_url()
+        registry = RegistryReader.from_url(stats=stats).read()
 
-    registry = reader.read()
     print("Registry:", registry)
+    if stats is not None:
+        print(stats.format())
+
+
+def load_cached(load, stats: ReadStats = None):
+    """Load a registry from the cache and record the time as the ``cache`` phase.
+
+    Args:
+        load: Returns the registry
+        stats (ReadStats): Record the time here if not ``None``
+    Returns:
+        Registry: The registry
+    """
+    if stats is None:
+        return load()
+    with stats.measure("cache"):
+        return load()
+
+
+def diff(values):
+    """Print the differences between two registries.
+
+    Args:
+        values: Parsed command line arguments
+    """
+    cache = RegistryCache(values.cache_dir) if values.cache or values.cache_dir is not None else None
+    old = load_registry(values.old, cache)
+    new = load_registry(values.new, cache)
+    result = old.diff(new)
+    print(result.to_json() if values.json else result.to_text())
+
+
+def load_registry(location: str, cache: RegistryCache = None):
+    """Read a registry from a file path or an url.
+
+    Args:
+        location (str): Path or http(s) url to a gl.xml file
+        cache (RegistryCache): Use the registry caches if not ``None``
+    Returns:
+        Registry: The registry
+    """
+    is_url = location.startswith(("http://", "https://"))
+    if cache is not None:
+        if is_url:
+            return cache.load_url(location, http_cache=HttpCache(os.path.join(cache.directory, "http")))
+        return cache.load(location)
+
+    if is_url:
+        return RegistryReader.from_url(location).read()
+    return RegistryReader.from_file(location).read()
 
 
 def parse_args(args: List[str]):
@@ -50,6 +115,13 @@ def parse_args(args: List[str]):
         action="store_true",
         help="Read the registry from the default url",
     )
+    add_cache_arguments(parser)
+    parser.add_argument(
+        "--profile",
+        "-p",
+        action="store_true",
+        help="Print the time and counters of every phase of reading the registry",
+    )
     parser.add_argument(
         "--log-level",
         "-l",
@@ -58,7 +130,25 @@ def parse_args(args: List[str]):
         default="INFO",
     )
 
+    subparsers = parser.add_subparsers(dest="command")
+    diff_parser = subparsers.add_parser(
+        "diff",
+        help="Show what changed between two registry revisions",
+    )
+    diff_parser.add_argument("old", help="Path or url to the old gl.xml file")
+    diff_parser.add_argument("new", help="Path or url to the new gl.xml file")
+    diff_parser.add_argument(
+        "--json",
+        action="store_true",
+        help="Print the differences as json",
+    )
+    # Don't overwrite cache options given before the subcommand
+    add_cache_arguments(diff_parser, default=argparse.SUPPRESS)
+
     values = parser.parse_args(args)
+    if values.command == "diff":
+        return values
+
     if not values.url and not values.file and not values.default_url:
         print("A --file or an --url needs to be supplied")
         parser.print_help()
@@ -67,6 +157,28 @@ def parse_args(args: List[str]):
     return values
 
 
+def add_cache_arguments(parser, default=None):
+    """Add the cache options to a parser.
+
+    Args:
+        parser: The argument parser
+        default: Default value of the options
+    """
+    parser.add_argument(
+        "--cache",
+        "-c",
+        action="store_true",
+        default=False if default is None else default,
+        help="Use the parsed registry and download caches",
+    )
+    parser.add_argument(
+        "--cache-dir",
+        metavar="DIR",
+        default=default,
+        help="Use the caches in a custom directory. Implies --cache",
+    )
+
+
 def configure_logging(level):
     pkg_logger = logging.getLogger("opengl_registry")
     pkg_logger.setLevel(level)
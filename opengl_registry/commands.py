@@ -1,16 +1,21 @@
-from typing import List
+from typing import List, Optional
+
+from opengl_registry.group import Group
 
 
 class CommandParam:
     """Command parameter"""
 
+    __slots__ = ("_name", "_value", "_ptype", "_group", "_group_name", "_length", "_alias")
+
     def __init__(
-        self, name=None, value=None, ptype=None, group=None, length=None, alias=None
+        self, name=None, value=None, ptype=None, group_name=None, length=None, alias=None, group=None
     ):
         self._name = name
         self._value = value
         self._ptype = ptype
         self._group = group
+        self._group_name = group_name
         self._length = length
         self._alias = alias
 
@@ -22,7 +27,7 @@ class CommandParam:
     @property
     def value(self) -> str:
         """str: full declaration string"""
-        return self._name
+        return self._value
 
     @property
     def ptype(self) -> str:
@@ -30,15 +35,22 @@ class CommandParam:
         return self._ptype
 
     @property
-    def group(self) -> str:
-        """str: group name"""
+    def group(self) -> Optional[Group]:
+        """Group: The group of the accepted enums. Set when the registry is linked."""
         return self._group
 
+    @group.setter
+    def group(self, value: Group):
+        self._group = value
+
+    @property
+    def group_name(self) -> Optional[str]:
+        """str: group name"""
+        return self._group_name
+
     @property
     def alias(self) -> str:
-        """str: command alias.
-        Usually a shorter name witout extension suffix.
-        """
+        """str: parameter alias. Not used by ``gl.xml``. See ``Command.alias``"""
         return self._alias
 
     @property
@@ -50,19 +62,23 @@ class CommandParam:
 class Command:
     """GL functions"""
 
-    def __init__(self, proto=None, name=None, params=None, glx=None):
+    __slots__ = ("_proto", "_name", "_params", "_glx", "_alias")
+
+    def __init__(self, proto=None, name=None, params=None, glx=None, alias=None):
         self._proto = proto
         self._name = name
         self._params = params or []
         self._glx = glx
+        self._alias = alias
 
     @property
     def proto(self) -> str:
-        return self._name
+        """str: full prototype declaration string"""
+        return self._proto
 
     @proto.setter
     def proto(self, value):
-        self._name = value
+        self._proto = value
 
     @property
     def name(self) -> str:
@@ -84,6 +100,17 @@ class Command:
     def glx(self, value):
         self._glx = value
 
+    @property
+    def alias(self) -> Optional[str]:
+        """str: The command this command is an alias of.
+        Usually the core name without extension suffix.
+        """
+        return self._alias
+
+    @alias.setter
+    def alias(self, value):
+        self._alias = value
+
     def __repr__(self):
         return str(self)
 
@@ -94,6 +121,8 @@ class Command:
 class Commands:
     """A group of commands"""
 
+    __slots__ = ("_namespace", "_entries")
+
     def __init__(self, namespace="GL", entires=None):
         self._namespace = namespace
         self._entries = entires or []
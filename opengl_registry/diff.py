@@ -0,0 +1,314 @@
+import json
+from typing import Callable, Dict, Hashable, Iterable, List, Optional
+
+from opengl_registry.commands import Command
+from opengl_registry.enums import Enum
+from opengl_registry.extensions import Extension
+from opengl_registry.features import Feature, FeatureDetails
+from opengl_registry.gltype import GlType
+
+
+class RegistryDiff:
+    """The differences between two registries.
+
+    Every section is a dict with these keys:
+
+    * ``added``: Names only present in the new registry
+    * ``removed``: Names only present in the old registry
+    * ``renamed``: ``[old, new]`` name pairs. An enum is renamed when a
+      removed and an added enum have the same value. A command is renamed
+      when a removed and an added command have the same signature.
+    * ``changed``: Maps the name of entries present in both registries to
+      their changed fields. A plain field maps to ``{"old": ..., "new": ...}``
+      and a requirement list to ``{"added": [...], "removed": [...]}``
+
+    Entries are joined by name in dicts, so comparing two
+    registries takes linear time in the size of the registries.
+
+    Example::
+
+        old = RegistryReader.from_file('gl-old.xml').read()
+        new = RegistryReader.from_file('gl.xml').read()
+        diff = old.diff(new)
+        print(diff.to_text())
+    """
+
+    #: The compared registry sections
+    SECTIONS = ("types", "enums", "commands", "features", "extensions")
+
+    def __init__(
+        self,
+        *,
+        types: dict = None,
+        enums: dict = None,
+        commands: dict = None,
+        features: dict = None,
+        extensions: dict = None
+    ):
+        """Initialize a diff.
+
+        Keyword Args:
+            types (dict): Changed types
+            enums (dict): Changed enums
+            commands (dict): Changed commands
+            features (dict): Changed features
+            extensions (dict): Changed extensions
+        """
+        self._types = types or self._section()
+        self._enums = enums or self._section()
+        self._commands = commands or self._section()
+        self._features = features or self._section()
+        self._extensions = extensions or self._section()
+
+    @classmethod
+    def compare(cls, old, new) -> "RegistryDiff":
+        """Compare two registries.
+
+        Args:
+            old (Registry): The old registry
+            new (Registry): The new registry
+        Returns:
+            RegistryDiff: The changes from ``old`` to ``new``
+        """
+        return cls(
+            types=_compare(_types(old), _types(new), _type_fields),
+            enums=_compare(_enums(old), _enums(new), _enum_fields, rename_key=_enum_rename_key),
+            commands=_compare(
+                _commands(old), _commands(new), _command_fields, rename_key=_command_rename_key,
+            ),
+            features=_compare(_by_name(old.features), _by_name(new.features), _feature_fields),
+            extensions=_compare(_by_name(old.extensions), _by_name(new.extensions), _extension_fields),
+        )
+
+    @property
+    def types(self) -> dict:
+        """dict: Changed types"""
+        return self._types
+
+    @property
+    def enums(self) -> dict:
+        """dict: Changed enums"""
+        return self._enums
+
+    @property
+    def commands(self) -> dict:
+        """dict: Changed commands"""
+        return self._commands
+
+    @property
+    def features(self) -> dict:
+        """dict: Changed features"""
+        return self._features
+
+    @property
+    def extensions(self) -> dict:
+        """dict: Changed extensions"""
+        return self._extensions
+
+    @property
+    def empty(self) -> bool:
+        """bool: The registries are equal"""
+        return not any(any(section.values()) for section in self.to_dict().values())
+
+    def to_dict(self) -> Dict[str, dict]:
+        """dict: All sections by name"""
+        return {name: getattr(self, name) for name in self.SECTIONS}
+
+    def to_json(self, indent: Optional[int] = 2) -> str:
+        """Serialize the diff to json.
+
+        Args:
+            indent (int): Indentation passed to ``json.dumps``
+        Returns:
+            str: The json document
+        """
+        return json.dumps(self.to_dict(), indent=indent)
+
+    def to_text(self) -> str:
+        """Describe the diff in a human readable format.
+
+        Every section lists added (``+``), removed (``-``),
+        renamed (``>``) and changed (``*``) entries.
+
+        Returns:
+            str: The description
+        """
+        lines = []
+        for name, section in self.to_dict().items():
+            if not any(section.values()):
+                continue
+
+            lines.append("{}: {} added, {} removed, {} renamed, {} changed".format(
+                name,
+                len(section["added"]),
+                len(section["removed"]),
+                len(section["renamed"]),
+                len(section["changed"]),
+            ))
+            lines.extend("  + {}".format(entry) for entry in section["added"])
+            lines.extend("  - {}".format(entry) for entry in section["removed"])
+            lines.extend("  > {} -> {}".format(old, new) for old, new in section["renamed"])
+            for entry, fields in section["changed"].items():
+                lines.append("  * {}".format(entry))
+                for field, change in fields.items():
+                    if "old" in change:
+                        lines.append("      {}: {!r} -> {!r}".format(field, change["old"], change["new"]))
+                    else:
+                        items = ["+" + item for item in change["added"]] + ["-" + item for item in change["removed"]]
+                        lines.append("      {}: {}".format(field, " ".join(items)))
+
+        return "\n".join(lines) if lines else "No changes"
+
+    @staticmethod
+    def _section() -> dict:
+        return {"added": [], "removed": [], "renamed": [], "changed": {}}
+
+    def __str__(self):
+        return "<RegistryDiff {}>".format(" ".join(
+            "{}={}".format(name, sum(len(values) for values in section.values()))
+            for name, section in self.to_dict().items()
+        ))
+
+    def __repr__(self):
+        return str(self)
+
+
+def _compare(
+    old: Dict[str, object],
+    new: Dict[str, object],
+    fields: Callable[[object], dict],
+    rename_key: Callable[[object], Hashable] = None,
+) -> dict:
+    """Join two name -> entry dicts and collect the differences"""
+    section = RegistryDiff._section()
+    added = [name for name in new if name not in old]
+    removed = [name for name in old if name not in new]
+
+    if rename_key is not None and added and removed:
+        added, removed, section["renamed"] = _renames(
+            added, removed, lambda name: rename_key(old[name]), lambda name: rename_key(new[name]),
+        )
+
+    section["added"] = added
+    section["removed"] = removed
+
+    for name, entry in new.items():
+        other = old.get(name)
+        if other is None:
+            continue
+
+        old_fields, new_fields = fields(other), fields(entry)
+        if old_fields == new_fields:
+            continue
+
+        changes = {}
+        for field, value in new_fields.items():
+            previous = old_fields.get(field)
+            if previous == value:
+                continue
+            if isinstance(value, frozenset):
+                changes[field] = {"added": sorted(value - previous), "removed": sorted(previous - value)}
+            else:
+                changes[field] = {"old": previous, "new": value}
+        section["changed"][name] = changes
+
+    return section
+
+
+def _renames(added: List[str], removed: List[str], old_key: Callable, new_key: Callable):
+    """Pair removed and added names with the same unique key.
+
+    Returns:
+        Tuple[list, list, list]: remaining added names, remaining removed names and the renames
+    """
+    removed_by_key = {}
+    for name in removed:
+        removed_by_key.setdefault(old_key(name), []).append(name)
+    added_by_key = {}
+    for name in added:
+        added_by_key.setdefault(new_key(name), []).append(name)
+
+    renames = {}
+    for key, names in added_by_key.items():
+        candidates = removed_by_key.get(key)
+        # Ambiguous matches are reported as removed and added
+        if len(names) == 1 and candidates is not None and len(candidates) == 1:
+            renames[candidates[0]] = names[0]
+
+    renamed = set(renames.values())
+    return (
+        [name for name in added if name not in renamed],
+        [name for name in removed if name not in renames],
+        [[old, new] for old, new in renames.items()],
+    )
+
+
+def _by_name(entries: Iterable) -> dict:
+    """Index entries by name. The first entry with a name wins."""
+    index = {}
+    for entry in entries:
+        index.setdefault(entry.name, entry)
+    return index
+
+
+def _types(registry) -> Dict[str, GlType]:
+    return _by_name(registry.types)
+
+
+def _enums(registry) -> Dict[str, Enum]:
+    return _by_name(enum for enums in registry.enums for enum in enums.entires)
+
+
+def _commands(registry) -> Dict[str, Command]:
+    return _by_name(registry.commands.entries)
+
+
+def _type_fields(gltype: GlType) -> dict:
+    return {"text": gltype.text, "requires": gltype.requires}
+
+
+def _enum_fields(enum: Enum) -> dict:
+    return {"value": enum.value}
+
+
+def _enum_rename_key(enum: Enum) -> Hashable:
+    return enum.value
+
+
+def _command_fields(command: Command) -> dict:
+    return {"proto": command.proto, "params": [param.value for param in command.params]}
+
+
+def _command_rename_key(command: Command) -> Hashable:
+    # The signature without the command name
+    proto = (command.proto or "").rsplit(command.name, 1)[0]
+    return proto, tuple(param.value for param in command.params)
+
+
+def _feature_fields(feature: Feature) -> dict:
+    fields = {"api": feature.api, "number": feature.number}
+    fields.update(_requirement_fields(feature.require, feature.remove))
+    return fields
+
+
+def _extension_fields(extension: Extension) -> dict:
+    fields = {"supported": extension.supported}
+    fields.update(_requirement_fields(extension.require, extension.remove))
+    return fields
+
+
+def _requirement_fields(require: List[FeatureDetails], remove: List[FeatureDetails]) -> dict:
+    """Sets of required and removed names per kind.
+
+    Names only required for a specific profile or api are qualified, for example ``glBegin [compatibility]``.
+    """
+    fields = {}
+    for mode, details_list in (("require", require), ("remove", remove)):
+        for kind in ("commands", "enums", "types"):
+            names = set()
+            for details in details_list:
+                qualifier = " ".join(filter(None, (details.api, details.profile)))
+                suffix = " [{}]".format(qualifier) if qualifier else ""
+                names.update(name + suffix for name in getattr(details, kind))
+            fields["{}_{}".format(mode, kind)] = frozenset(names)
+    return fields
@@ -0,0 +1,128 @@
+import hashlib
+import json
+import logging
+import os
+
+import requests
+
+from opengl_registry.cache import RegistryCache
+
+logger = logging.getLogger(__name__)
+
+
+class HttpCache:
+    """Local cache of downloaded registry files.
+
+    The body of every response is stored together with its ``ETag``
+    and ``Last-Modified`` headers. Later fetches of the same url send
+    ``If-None-Match`` / ``If-Modified-Since`` and reuse the stored
+    body when the server answers ``304 Not Modified``.
+
+    Example::
+
+        http_cache = HttpCache()
+        reader = RegistryReader.from_url(http_cache=http_cache)
+
+        # Also skip parsing if the registry didn't change
+        registry = RegistryCache().load_url(RegistryReader.DEFAULT_URL, http_cache=http_cache)
+    """
+
+    def __init__(self, directory: str = None):
+        """Initialize the cache.
+
+        Args:
+            directory (str): Cache directory. Defaults to ``http`` in ``RegistryCache.default_directory()``
+        """
+        self._directory = directory or os.path.join(RegistryCache.default_directory(), "http")
+
+    @property
+    def directory(self) -> str:
+        """str: The cache directory"""
+        return self._directory
+
+    def fetch(self, url: str, session: requests.Session = None, timeout: float = None) -> bytes:
+        """Fetch the body of an url using the cached copy if it's still valid.
+
+        Args:
+            url (str): The url to fetch
+            session (requests.Session): Send the requests with this session
+            timeout (float): Seconds to wait for the server to accept the connection or send data
+        Returns:
+            bytes: The response body
+        """
+        http = session or requests
+        body_path, meta_path = self._paths(url)
+
+        headers = {}
+        meta = self._read_meta(meta_path)
+        if meta is not None and os.path.exists(body_path):
+            if meta.get("etag"):
+                headers["If-None-Match"] = meta["etag"]
+            if meta.get("last_modified"):
+                headers["If-Modified-Since"] = meta["last_modified"]
+
+        response = http.get(url, headers=headers, timeout=timeout)
+
+        if response.status_code == requests.codes.not_modified:
+            logger.info("Using cached copy of '%s'", url)
+            try:
+                with open(body_path, "rb") as fd:
+                    return fd.read()
+            except OSError:
+                # The body went missing between the check and the read
+                return self._fetch_uncached(url, http, timeout)
+
+        if response.status_code != requests.codes.ok:
+            response.raise_for_status()
+
+        self._store(url, response)
+        return response.content
+
+    def clear(self):
+        """Remove all cached responses"""
+        if not os.path.isdir(self._directory):
+            return
+
+        for entry in os.scandir(self._directory):
+            if entry.name.endswith((".body", ".json")):
+                os.remove(entry.path)
+
+    def _fetch_uncached(self, url: str, http=requests, timeout: float = None) -> bytes:
+        response = http.get(url, timeout=timeout)
+        if response.status_code != requests.codes.ok:
+            response.raise_for_status()
+
+        self._store(url, response)
+        return response.content
+
+    def _store(self, url: str, response: requests.Response):
+        body_path, meta_path = self._paths(url)
+        os.makedirs(self._directory, exist_ok=True)
+
+        self._write(body_path, response.content)
+        meta = {
+            "url": url,
+            "etag": response.headers.get("ETag"),
+            "last_modified": response.headers.get("Last-Modified"),
+        }
+        self._write(meta_path, json.dumps(meta).encode())
+
+    def _paths(self, url: str):
+        name = hashlib.sha256(url.encode()).hexdigest()
+        base = os.path.join(self._directory, name)
+        return base + ".body", base + ".json"
+
+    @staticmethod
+    def _read_meta(path: str):
+        try:
+            with open(path, "rb") as fd:
+                return json.loads(fd.read().decode())
+        except (OSError, ValueError):
+            return None
+
+    @staticmethod
+    def _write(path: str, data: bytes):
+        tmp_path = "{}.{}.tmp".format(path, os.getpid())
+        with open(tmp_path, "wb") as fd:
+            fd.write(data)
+        os.replace(tmp_path, path)
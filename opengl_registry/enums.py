@@ -1,4 +1,4 @@
-from typing import List, Optional
+from typing import List, Optional, Tuple
 
 from opengl_registry.group import Group
 
@@ -6,6 +6,18 @@ from opengl_registry.group import Group
 class Enums:
     """Group of enums in a range reserved for a vendor"""
 
+    __slots__ = (
+        "_namespace",
+        "_start",
+        "_end",
+        "_vendor",
+        "_comment",
+        "_group",
+        "_group_name",
+        "_type",
+        "_entries",
+    )
+
     def __init__(
         self,
         *,
@@ -50,7 +62,7 @@ class Enums:
 
     @property
     def group(self) -> Optional[Group]:
-        """Group: The group this enum range belongs to"""
+        """Group: The group this enum range belongs to. Set when the registry is linked."""
         return self._group
 
     @property
@@ -75,6 +87,7 @@ class Enums:
 
     @property
     def group_name(self) -> str:
+        """str: Name of the group this enum range belongs to"""
         return self._group_name
 
     @group.setter
@@ -100,19 +113,26 @@ class Enums:
 class Enum:
     """Container for GL enum info"""
 
-    def __init__(self, *, name: str, value: str, alias: str, comment=None):
+    __slots__ = ("_name", "_value", "_comment", "_alias", "_api", "_range", "_groups")
+
+    def __init__(self, *, name: str, value: str, alias: str = None, comment=None, api: str = None):
         """Initialize an enum instance.
 
         Args:
             name (str): Name of the enum
             value (str): Enum value (hex number as string)
         Keyword Args:
+            alias (str): Name of the enum this enum is an alias of
             comment (str): Enum comment
+            api (str): The api this definition is for if the enum is defined per api
         """
         self._name = name
         self._value = value
         self._comment = comment
+        self._alias = alias
+        self._api = api
         self._range = None
+        self._groups = ()
 
     @property
     def name(self) -> str:
@@ -129,20 +149,40 @@ class Enum:
         """str: Enum value (hex number as string)"""
         return self._value
 
+    @property
+    def alias(self) -> Optional[str]:
+        """str: Name of the enum this enum is an alias of"""
+        return self._alias
+
+    @property
+    def api(self) -> Optional[str]:
+        """str: The api this definition is for. ``None`` for enums defined once for all apis"""
+        return self._api
+
     @property
     def value_int(self) -> int:
         """int: Enum value as as int"""
-        return int(self._value, base=16)
+        # Most values are hex, but a few are plain decimal numbers
+        return int(self._value, base=0)
 
     @property
     def range(self) -> Enums:
-        """Enums: The enum range this enum belongs to"""
+        """Enums: The enum range this enum belongs to. Set when the registry is linked."""
         return self._range
 
     @range.setter
     def range(self, value: Enums):
         self._range = value
 
+    @property
+    def groups(self) -> Tuple[Group, ...]:
+        """Tuple[Group]: The groups containing this enum. Set when the registry is linked."""
+        return self._groups
+
+    @groups.setter
+    def groups(self, value: Tuple[Group, ...]):
+        self._groups = value
+
     def __str__(self) -> str:
         return "<Enum {} [{}]>".format(self._name, self._value)
 
@@ -1,2 +1,65 @@
+import re
+from typing import List, Optional
+
+from opengl_registry.features import FeatureDetails
+
+
 class Extension:
-    pass
+    """An extension adding commands, enums and types to one or more apis"""
+
+    __slots__ = ("_name", "_supported", "_comment", "_require", "_remove")
+
+    def __init__(self, *, name: str, supported: str, comment: str = None):
+        """Initialize an extension.
+
+        Keyword Args:
+            name (str): Name of the extension. For example ``GL_ARB_debug_output``
+            supported (str): Regular expression matching the supported apis. For example ``gl|glcore``
+            comment (str): Extension comment
+        """
+        self._name = name
+        self._supported = supported
+        self._comment = comment
+        self._require: List[FeatureDetails] = []
+        self._remove: List[FeatureDetails] = []
+
+    @property
+    def name(self) -> str:
+        """str: Name of the extension. For example ``GL_ARB_debug_output``"""
+        return self._name
+
+    @property
+    def supported(self) -> str:
+        """str: Regular expression matching the supported apis. For example ``gl|glcore``"""
+        return self._supported
+
+    @property
+    def comment(self) -> Optional[str]:
+        """str: Extension comment"""
+        return self._comment
+
+    @property
+    def require(self) -> List[FeatureDetails]:
+        """List[FeatureDetails]: list of commands, enums and types required"""
+        return self._require
+
+    @property
+    def remove(self) -> List[FeatureDetails]:
+        """List[FeatureDetails]: list of commands, enums and types for removal"""
+        return self._remove
+
+    def supports(self, api: str) -> bool:
+        """Check if the extension is supported by an api.
+
+        Args:
+            api (str): The api. For example: gl, glcore, gles2
+        Returns:
+            bool: If the api matches ``supported``
+        """
+        return re.fullmatch(self._supported or "", api) is not None
+
+    def __str__(self):
+        return "<Extension {} supported={}>".format(self._name, self._supported)
+
+    def __repr__(self):
+        return str(self)
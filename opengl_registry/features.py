@@ -4,6 +4,8 @@ from typing import List, Optional
 class FeatureDetails:
     """May represent addition or removal"""
 
+    __slots__ = ("_mode", "_profile", "_api", "_comment", "_enums", "_commands", "_types")
+
     REQUIRE = "require"
     REMOVE = "remove"
 
@@ -15,6 +17,7 @@ class FeatureDetails:
         enums: List[str] = None,
         commands: List[str] = None,
         types: List[str] = None,
+        api: str = None,
     ):
         """Initialize feature details.
         This is simply a group of enum and command names
@@ -29,9 +32,11 @@ class FeatureDetails:
             enums: (List[str]) of enums names
             commands (List[str]): List of commands names
             types (List[str]): List of type names
+            api (str): The api this applies to. Only used by extensions
         """
         self._mode = mode
         self._profile = profile
+        self._api = api
         self._comment = comment
         self._enums = enums or []
         self._commands = commands or []
@@ -47,6 +52,11 @@ class FeatureDetails:
         """str: the profile needed. Usually core or compatibility"""
         return self._profile
 
+    @property
+    def api(self) -> Optional[str]:
+        """str: the api this applies to. ``None`` means all apis"""
+        return self._api
+
     @property
     def comment(self) -> Optional[str]:
         """str: a comment"""
@@ -81,6 +91,8 @@ class FeatureDetails:
 
 
 class Feature:
+    __slots__ = ("_api", "_name", "_number", "_require", "_remove")
+
     def __init__(self, *, api: str, name: str, number: str):
         self._api = api
         self._name = name
@@ -0,0 +1,130 @@
+from typing import Iterable, List, Optional, Set, Tuple
+
+from opengl_registry.extensions import Extension
+from opengl_registry.features import Feature
+from opengl_registry.registry import _version_key
+
+
+class RegistryFilter:
+    """Selects the part of a registry used by an api version.
+
+    Passed to ``RegistryReader.read`` to only build the features of
+    the api up to a version, the allowed extensions and the commands,
+    enums, types and groups they require. The resulting registry resolves
+    profiles of the api up to that version like the full registry.
+
+    Example::
+
+        gles = RegistryFilter("gles2", version="3.2", extensions=["GL_EXT_texture_filter_anisotropic"])
+        registry = RegistryReader.from_file("gl.xml").read(filter=gles)
+        profile = registry.get_profile("gles2", None, "3.2", extensions=gles.extensions)
+    """
+
+    def __init__(
+        self, api: str, profile: str = None, version: str = None, extensions: Iterable[str] = None
+    ):
+        """Initialize the filter.
+
+        Args:
+            api (str): The api. For example: gl, gles1, gles2
+            profile (str): core, compatibility or ``None`` for apis without profiles.
+                Requirements of other profiles are ignored.
+            version (str): The maximum version number. All versions of the api if ``None``
+            extensions (Iterable[str]): Names of the extensions to include
+        """
+        self._api = api
+        self._profile = profile
+        self._version = version
+        self._extensions = list(extensions or [])
+        self._version_key = _version_key(version) if version is not None else None
+        self._extension_names = set(self._extensions)
+
+    @property
+    def api(self) -> str:
+        """str: The api. For example: gl, gles1, gles2"""
+        return self._api
+
+    @property
+    def profile(self) -> Optional[str]:
+        """str: core, compatibility or None"""
+        return self._profile
+
+    @property
+    def version(self) -> Optional[str]:
+        """str: The maximum version number or ``None`` for all versions"""
+        return self._version
+
+    @property
+    def extensions(self) -> List[str]:
+        """List[str]: Names of the included extensions"""
+        return self._extensions
+
+    def includes_feature(self, api: str, number: str) -> bool:
+        """Check if a feature is selected.
+
+        Args:
+            api (str): The api of the feature
+            number (str): The version number of the feature
+        Returns:
+            bool: If the feature is selected
+        """
+        if api != self._api:
+            return False
+        return self._version_key is None or _version_key(number) <= self._version_key
+
+    def includes_extension(self, name: str) -> bool:
+        """Check if an extension is selected.
+
+        Args:
+            name (str): The extension name
+        Returns:
+            bool: If the extension is in the allow-list
+        """
+        return name in self._extension_names
+
+    def required_names(
+        self, features: List[Feature], extensions: List[Extension]
+    ) -> Tuple[Set[str], Set[str], Set[str]]:
+        """Collect the names required by the selected features and extensions.
+
+        Remove blocks are ignored. A name removed by a later version
+        is still needed to resolve the earlier versions, so the union
+        of every require block matching the api and profile is
+        returned. ``Registry.get_profile`` applies the removes.
+
+        Args:
+            features (List[Feature]): The selected features
+            extensions (List[Extension]): The selected extensions
+        Returns:
+            Tuple[set, set, set]: The required command, enum and type names
+        Raises:
+            ValueError: if no feature has the api, or an extension is unknown or not supported by the api
+        """
+        if not features:
+            raise ValueError("Unknown api or version: '{}' {}".format(self._api, self._version))
+
+        found = {extension.name: extension for extension in extensions}
+        for name in self._extensions:
+            extension = found.get(name)
+            if extension is None:
+                raise ValueError("Unknown extension: '{}'".format(name))
+            if not extension.supports(self._api):
+                raise ValueError("Extension '{}' is not supported by '{}'".format(name, self._api))
+
+        commands, enums, types = set(), set(), set()
+        for parent in features + [found[name] for name in self._extensions]:
+            for details in parent.require:
+                if details.profile in (None, self._profile) and details.api in (None, self._api):
+                    commands.update(details.commands)
+                    enums.update(details.enums)
+                    types.update(details.types)
+
+        return commands, enums, types
+
+    def __str__(self):
+        return "<RegistryFilter {} {} {} extensions={}>".format(
+            self._api, self._profile, self._version, len(self._extensions),
+        )
+
+    def __repr__(self):
+        return str(self)
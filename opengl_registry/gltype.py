@@ -4,6 +4,8 @@ from typing import Optional
 class GlType:
     """GL type definition"""
 
+    __slots__ = ("_name", "_text", "_comment", "_requires")
+
     def __init__(
         self, *, name: str, text: str = None, comment: str = None, requires: str = None
     ):
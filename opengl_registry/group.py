@@ -1,9 +1,14 @@
-from typing import Set
+from typing import TYPE_CHECKING, List, Set
+
+if TYPE_CHECKING:
+    from opengl_registry.enums import Enum  # noqa: F401
 
 
 class Group:
     """Grouped enums"""
 
+    __slots__ = ("_name", "_entries", "_enums")
+
     def __init__(self, name: str, entries: Set[str]):
         """Initialize a group.
 
@@ -13,6 +18,7 @@ class Group:
         """
         self._name = name
         self._entries = entries
+        self._enums = []
 
     @property
     def name(self) -> str:
@@ -24,6 +30,17 @@ class Group:
         """Set[str]: All enum entires in the group"""
         return self._entries
 
+    @property
+    def enums(self) -> List["Enum"]:
+        """List[Enum]: The definitions of the enums in the group in registry order.
+        Set when the registry is linked.
+        """
+        return self._enums
+
+    @enums.setter
+    def enums(self, value: List["Enum"]):
+        self._enums = value
+
     def __repr__(self) -> str:
         return str(self)
 
@@ -0,0 +1,87 @@
+from typing import List, Optional
+
+from opengl_registry.gltype import GlType
+from opengl_registry.enums import Enum
+from opengl_registry.commands import Command
+
+
+class Profile:
+    """The commands, enums and types making up a specific api version"""
+
+    def __init__(
+        self,
+        *,
+        api: str,
+        profile: str,
+        version: str,
+        extensions: List[str] = None,
+        commands: List[Command] = None,
+        enums: List[Enum] = None,
+        types: List[GlType] = None
+    ):
+        """Initialize a profile.
+
+        Keyword Args:
+            api (str): The api. For example: gl, gles1, gles2
+            profile (str): core, compatibility or None
+            version (str): The version number. For example 3.3
+            extensions (List[str]): Names of the extensions included in the profile
+            commands (List[Command]): The commands in the profile
+            enums (List[Enum]): The enums in the profile
+            types (List[GlType]): The types in the profile
+        """
+        self._api = api
+        self._profile = profile
+        self._version = version
+        self._extensions = extensions or []
+        self._commands = commands or []
+        self._enums = enums or []
+        self._types = types or []
+
+    @property
+    def api(self) -> str:
+        """str: The api. For example: gl, gles1, gles2"""
+        return self._api
+
+    @property
+    def profile(self) -> Optional[str]:
+        """str: core, compatibility or None"""
+        return self._profile
+
+    @property
+    def version(self) -> str:
+        """str: The version number. For example 3.3"""
+        return self._version
+
+    @property
+    def extensions(self) -> List[str]:
+        """List[str]: Names of the extensions included in the profile"""
+        return self._extensions
+
+    @property
+    def commands(self) -> List[Command]:
+        """List[Command]: The commands in the profile"""
+        return self._commands
+
+    @property
+    def enums(self) -> List[Enum]:
+        """List[Enum]: The enums in the profile"""
+        return self._enums
+
+    @property
+    def types(self) -> List[GlType]:
+        """List[GlType]: The types in the profile"""
+        return self._types
+
+    def __str__(self):
+        return "<Profile {} {} {} commands={} enums={} types={}>".format(
+            self._api,
+            self._profile,
+            self._version,
+            len(self._commands),
+            len(self._enums),
+            len(self._types),
+        )
+
+    def __repr__(self):
+        return str(self)
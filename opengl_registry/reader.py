@@ -1,21 +1,53 @@
+import asyncio
+import gc
 import logging
-from io import StringIO
-from typing import List
+import os
+import re
+import sys
+import threading
+import time
+from concurrent.futures import ProcessPoolExecutor
+from contextlib import contextmanager
+from io import BytesIO
+from typing import List, Union
 from xml.etree import ElementTree
 import requests
 
 # NOTE: Consider moving this to __init__ when finalized
-from opengl_registry.registry import Registry
+from opengl_registry.aio import AsyncDownloader
+from opengl_registry.backends import ElementTreeBackend, ParserBackend, _intern
+from opengl_registry.registry import Registry, _WORD
+from opengl_registry.registryset import RegistrySet
+from opengl_registry.filter import RegistryFilter
+from opengl_registry.stats import ReadStats
 from opengl_registry.gltype import GlType
 from opengl_registry.enums import Enums, Enum
 from opengl_registry.group import Group
 from opengl_registry.commands import Command, CommandParam, Commands
 from opengl_registry.features import Feature, FeatureDetails
-
-# from opengl_registry.extensions import Extension
+from opengl_registry.extensions import Extension
 
 logger = logging.getLogger(__name__)
 
+#: The sections of a registry in the order they appear in ``gl.xml``
+SECTIONS = ("types", "groups", "enums", "commands", "features", "extensions")
+
+#: Chunk size used when streaming a registry from an url
+CHUNK_SIZE = 64 * 1024
+
+#: Matches comments and the start tags of the top level registry blocks
+_SECTION_START = re.compile(
+    rb"<!--.*?-->"
+    rb"|<(types|groups|enums|commands|feature|extensions)"
+    rb"(?:\s+[^\s=/>]+\s*=\s*(?:\"[^\"]*\"|'[^']*'))*\s*(/?)>",
+    re.DOTALL,
+)
+
+#: Guards the number of reads that paused the garbage collector. See ``_paused_gc``
+_gc_lock = threading.Lock()
+_gc_pauses = 0
+_gc_was_enabled = False
+
 
 class RegistryReader:
     """Reads ``gl.xml`` file into a ``Registry`` structure
@@ -35,10 +67,37 @@ class RegistryReader:
         # Currently it resides on github in the KhronosGroup organization
         reader = RegistryReader.from_url()
         registry = reader.read()
+
+        # Stream the file instead of keeping the full element tree in memory
+        reader = RegistryReader.from_file('gl.xml', stream=True)
+        registry = reader.read()
+
+        # Build the objects straight from expat callbacks without element objects
+        reader = RegistryReader.from_file('gl.xml', backend=ExpatBackend())
+        registry = reader.read()
+
+        # Only build the sections that are accessed
+        reader = RegistryReader.from_file('gl.xml', stream=True)
+        registry = reader.read(lazy=True)
+        registry.commands
+
+        # Read several files in parallel
+        gl, egl = RegistryReader.read_many(['gl.xml', 'egl.xml'])
+
+        # Download several revisions concurrently from asyncio code
+        readers = await RegistryReader.fetch_all([
+            RegistryReader.revision_url(revision) for revision in revisions
+        ])
     """
 
     #: The default URL for the ``gl.xml``` file
     DEFAULT_URL = "https://raw.githubusercontent.com/KhronosGroup/OpenGL-Registry/master/xml/gl.xml"
+    #: URL template for a registry file at a specific revision of the registry repository
+    REVISION_URL = "https://raw.githubusercontent.com/KhronosGroup/OpenGL-Registry/{revision}/xml/{name}"
+    #: Pause the cyclic garbage collector while parsing and linking. Keeps the read time of very large
+    #: registries linear, but the collector is paused for the whole process until every
+    #: read in progress is done. Disabled by default
+    pause_gc = False
 
     #: The registry class. Can be replaced with a custom class
     registry_cls = Registry
@@ -50,52 +109,291 @@ class RegistryReader:
     enums_cls = Enums
     #: The Enum class. Can be replaced with a custom class
     enum_cls = Enum
-
-    def __init__(self, tree: ElementTree):
+    #: The Commands class. Can be replaced with a custom class
+    commands_cls = Commands
+    #: The Command class. Can be replaced with a custom class
+    command_cls = Command
+    #: The CommandParam class. Can be replaced with a custom class
+    command_param_cls = CommandParam
+    #: The Feature class. Can be replaced with a custom class
+    feature_cls = Feature
+    #: The FeatureDetails class. Can be replaced with a custom class
+    feature_details_cls = FeatureDetails
+    #: The Extension class. Can be replaced with a custom class
+    extension_cls = Extension
+
+    #: Maps ``(parent tag, tag)`` to the section and builder method for that element
+    _dispatch = {
+        ("types", "type"): ("types", "_build_type"),
+        ("groups", "group"): ("groups", "_build_group"),
+        ("registry", "enums"): ("enums", "_build_enums"),
+        ("commands", "command"): ("commands", "_build_command"),
+        ("registry", "feature"): ("features", "_build_feature"),
+        ("extensions", "extension"): ("extensions", "_build_extension"),
+    }
+
+    def __init__(
+        self, tree: ElementTree = None, *, source=None, stats: ReadStats = None, backend: ParserBackend = None
+    ):
         """Initialize the reader.
 
         Currently we use `xml.etree.ElementTree` for parsing the
-        registry information.
+        registry information. Either a parsed tree or a source
+        to stream the registry from must be supplied.
 
         Args:
             tree (ElementTree): The `ElementTree` instance
+        Keyword Args:
+            source: Path, binary file object or streamed ``requests.Response``
+                to stream the registry from. Elements are discarded as soon
+                as their objects are built so the full tree is never kept in
+                memory. A response can only be read once.
+            stats (ReadStats): Record timings and counters of every phase in this object
+            backend (ParserBackend): Parses the source. ``ElementTreeBackend`` if not supplied.
+                Not used when reading a parsed tree.
         """
+        if tree is None and source is None:
+            raise ValueError("A tree or a source must be supplied")
+
         self._tree = tree
+        self._source = source
+        self._consumed = False
+        self._stats = stats
+        self._backend = backend if backend is not None else ElementTreeBackend()
+        if stats is not None:
+            self._instrument_builders()
 
     @classmethod
-    def from_file(cls, path: str) -> "RegistryReader":
-        """Create a RegistryReader with a local gl.xml file"""
+    def from_file(
+        cls, path: str, stream: bool = False, stats: ReadStats = None, backend: ParserBackend = None
+    ) -> "RegistryReader":
+        """Create a RegistryReader with a local gl.xml file
+
+        Args:
+            path (str): Path to the gl.xml file
+            stream (bool): Stream the file when reading instead of parsing it up front
+            stats (ReadStats): Record timings and counters of every phase in this object
+            backend (ParserBackend): Parse the file with this backend when reading. Implies ``stream``.
+        """
         logger.info("Reading registry file: '%s'", path)
-        tree = ElementTree.parse(path)
-        return cls(tree)
+        if stream or backend is not None:
+            return cls(source=path, stats=stats, backend=backend)
+
+        start = time.perf_counter()
+        with _paused_gc(cls.pause_gc):
+            tree = ElementTree.parse(path)
+        if stats is not None:
+            stats.record("parse", time.perf_counter() - start)
+        return cls(tree, stats=stats)
 
     @classmethod
-    def from_url(cls, url: str = None) -> "RegistryReader":
-        """Create a RegistryReader with a url to the gl.xml file"""
+    def from_url(
+        cls,
+        url: str = None,
+        stream: bool = False,
+        http_cache=None,
+        stats: ReadStats = None,
+        backend: ParserBackend = None,
+    ) -> "RegistryReader":
+        """Create a RegistryReader with a url to the gl.xml file
+
+        Args:
+            url (str): The url to the gl.xml file. ``DEFAULT_URL`` is used if not supplied.
+            stream (bool): Parse the response while it downloads when reading.
+                The returned reader can then only be read once.
+            http_cache (HttpCache): Reuse the locally cached file if it didn't change on the server
+            stats (ReadStats): Record timings and counters of every phase in this object
+            backend (ParserBackend): Parse the downloaded file with this backend when reading. Implies ``stream``.
+        """
         url = url or cls.DEFAULT_URL
+        stream = stream or backend is not None
         logger.info("Reading registry file from url: '%s'", url)
 
-        response = requests.get(url)
-        if response.status_code != requests.codes.ok:
-            response.raise_for_error()
+        start = time.perf_counter()
+        if http_cache is not None:
+            data = http_cache.fetch(url)
+            if stream:
+                return cls(source=BytesIO(data), stats=stats, backend=backend)
+        else:
+            response = requests.get(url, stream=stream)
+            if response.status_code != requests.codes.ok:
+                response.raise_for_status()
+            if stream:
+                return cls(source=response, stats=stats, backend=backend)
+            data = response.content
+
+        parse_start = time.perf_counter()
+        with _paused_gc(cls.pause_gc):
+            tree = ElementTree.ElementTree(ElementTree.fromstring(data))
+        if stats is not None:
+            stats.record("download", parse_start - start)
+            stats.record("parse", time.perf_counter() - parse_start)
+        return cls(tree, stats=stats)
+
+    @property
+    def stats(self) -> ReadStats:
+        """ReadStats: The recorded timings and counters or ``None`` if instrumentation is disabled"""
+        return self._stats
+
+    @property
+    def backend(self) -> ParserBackend:
+        """ParserBackend: Parses the source when reading"""
+        return self._backend
+
+    @classmethod
+    def revision_url(cls, revision: str, name: str = "gl.xml") -> str:
+        """Get the url of a registry file at a pinned revision.
+
+        Args:
+            revision (str): Commit hash, tag or branch in the registry repository
+            name (str): The registry file. For example gl.xml, glx.xml, wgl.xml or egl.xml
+        Returns:
+            str: The url
+        """
+        return cls.REVISION_URL.format(revision=revision, name=name)
+
+    @classmethod
+    async def from_url_async(cls, url: str = None, downloader: AsyncDownloader = None) -> "RegistryReader":
+        """Create a RegistryReader with a url to the gl.xml file from asyncio code.
 
-        tree = ElementTree.parse(StringIO(response.text))
-        return cls(tree)
+        The file is downloaded and parsed without blocking the event loop.
 
-    def read(self) -> Registry:
+        Args:
+            url (str): The url to the gl.xml file. ``DEFAULT_URL`` is used if not supplied.
+            downloader (AsyncDownloader): Download with this downloader instead of a new one
+        """
+        readers = await cls.fetch_all([url or cls.DEFAULT_URL], downloader=downloader)
+        return readers[0]
+
+    @classmethod
+    async def fetch_all(cls, urls: List[str], downloader: AsyncDownloader = None) -> List["RegistryReader"]:
+        """Download and parse several registry files concurrently from asyncio code.
+
+        Every file is parsed in the default executor of the event loop
+        as soon as it's downloaded, while the other files are still
+        downloading.
+
+        Args:
+            urls (List[str]): The urls to the registry files
+            downloader (AsyncDownloader): Controls the connection limit, timeout and caching.
+                A downloader with default settings is used if not supplied.
+        Returns:
+            List[RegistryReader]: Readers in the order of the urls
+        """
+        owned = downloader is None
+        if owned:
+            downloader = AsyncDownloader()
+
+        loop = asyncio.get_event_loop()
+
+        async def fetch(url):
+            data = await downloader.fetch(url)
+            root = await loop.run_in_executor(None, ElementTree.fromstring, data)
+            return cls(ElementTree.ElementTree(root))
+
+        try:
+            return list(await asyncio.gather(*(fetch(url) for url in urls)))
+        finally:
+            if owned:
+                downloader.close()
+
+    @classmethod
+    def read_many(
+        cls, paths: List[str], workers: int = None, merge: bool = False
+    ) -> Union[List[Registry], RegistrySet]:
+        """Read several registry files in parallel worker processes.
+
+        Every file is read by this reader class in a worker process and
+        the registry is pickled back to the caller, so the reader class
+        must be importable by the workers.
+
+        Args:
+            paths (List[str]): Paths to registry files. For example gl.xml, glx.xml, wgl.xml and egl.xml
+            workers (int): Number of worker processes. Defaults to one per file limited by the cpu count.
+                The files are read in this process if this is 1.
+            merge (bool): Return a ``RegistrySet`` namespacing the registries by file name
+        Returns:
+            List[Registry]: The registries in the order of the paths or a ``RegistrySet`` if ``merge`` is set
+        """
+        paths = list(paths)
+        if workers is None:
+            workers = min(len(paths), os.cpu_count() or 1)
+
+        if workers <= 1 or len(paths) <= 1:
+            registries = [cls.from_file(path).read() for path in paths]
+        else:
+            with ProcessPoolExecutor(max_workers=workers) as executor:
+                registries = list(executor.map(_read_file, [cls] * len(paths), paths))
+
+        if merge:
+            return RegistrySet.from_paths(paths, registries)
+        return registries
+
+    def read(self, lazy: bool = False, filter: RegistryFilter = None) -> Registry:
         """Reads the registry structure.
 
+        The registry is walked once and every element we know
+        about is handed to the matching builder based on its tag
+        and the tag of its parent.
+
+        In lazy mode each section of the registry is built the first
+        time it is accessed. When the reader was created with
+        ``stream=True`` the byte offsets of the top level blocks are
+        located first and only the blocks of the accessed section
+        are parsed.
+
+        With a filter the selected features and extensions are built
+        first. Only the commands, enums and types they require, the
+        types those depend on and the groups used by the commands
+        are built after that.
+
+        The cross references between the objects are resolved with
+        ``Registry.link`` unless the registry is read lazily.
+
+        Args:
+            lazy (bool): Build each section on first access
+            filter (RegistryFilter): Only build the part of the registry selected by the filter
         Returns:
             Registry: The ``Registry`` instance
+        Raises:
+            ValueError: if a filter is combined with lazy mode or doesn't match the registry
         """
-        return self.registry_cls(
-            types=self.read_types(),
-            groups=self.read_groups(),
-            enums=self.read_enums(),
-            commands=self.read_commands(),
-            features=self.read_features(),
-            extensions=self.read_extensions(),
+        if filter is not None:
+            if lazy:
+                raise ValueError("A filtered registry can't be read lazily")
+            sections = self._read_filtered(filter)
+        elif lazy:
+            return self.registry_cls(loader=self._section_loader(), stats=self._stats)
+        else:
+            sections = self._read_sections()
+
+        registry = self.registry_cls(
+            types=sections["types"],
+            groups=sections["groups"],
+            enums=sections["enums"],
+            commands=sections["commands"],
+            features=sections["features"],
+            extensions=sections["extensions"],
+            stats=self._stats,
         )
+        with _paused_gc(self.pause_gc):
+            if self._stats is not None:
+                with self._stats.measure("link"):
+                    registry.link()
+            else:
+                registry.link()
+        return registry
+
+    async def read_async(self, lazy: bool = False) -> Registry:
+        """Reads the registry structure in the default executor of the event loop.
+
+        Args:
+            lazy (bool): Build each section on first access
+        Returns:
+            Registry: The ``Registry`` instance
+        """
+        loop = asyncio.get_event_loop()
+        return await loop.run_in_executor(None, self.read, lazy)
 
     def read_types(self) -> List[GlType]:
         """Read all GL type definitions
@@ -103,25 +401,7 @@ class RegistryReader:
         Returns:
             List[GlType]: list of types
         """
-        types = []
-
-        for type_elem in self._tree.getroot().iter("type"):
-            name = None
-            try:
-                name = next(type_elem.iter("name")).text
-            except StopIteration:
-                name = type_elem.get("name")
-
-            types.append(
-                self.type_cls(
-                    name=name,
-                    text="".join(type_elem.itertext()),
-                    comment=type_elem.get("comment"),
-                    requires=type_elem.get("requires"),
-                )
-            )
-
-        return types
+        return self._read_sections("types")["types"]
 
     def read_groups(self) -> List[Group]:
         """Reads all group nodes.
@@ -129,17 +409,7 @@ class RegistryReader:
         Returns:
             List[Group]: list of groups
         """
-        groups = []
-
-        for groups_elem in self._tree.getroot().iter("group"):
-            groups.append(
-                self.group_cls(
-                    groups_elem.attrib["name"],
-                    entries={e.attrib["name"] for e in groups_elem.iter("enum")},
-                )
-            )
-
-        return groups
+        return self._read_sections("groups")["groups"]
 
     def read_enums(self) -> List[Enums]:
         """Reads all enums groups.
@@ -147,29 +417,7 @@ class RegistryReader:
         Returns:
             List[Enums]: list of enums groups
         """
-        enums = []
-        for enums_elem in self._tree.getroot().iter("enums"):
-            enums_instance = self.enums_cls(
-                namespace=enums_elem.get("namespace"),
-                group_name=enums_elem.get("group"),
-                type=enums_elem.get("type"),
-                comment=enums_elem.get("comment"),
-                vendor=enums_elem.get("vendor"),
-                start=enums_elem.get("start"),
-                end=enums_elem.get("end"),
-                entries=[
-                    Enum(
-                        name=el.get("name"),
-                        value=el.get("value"),
-                        comment=el.get("comment"),
-                        alias=el.get("alias"),
-                    )
-                    for el in enums_elem.iter("enum")
-                ],
-            )
-            enums.append(enums_instance)
-
-        return enums
+        return self._read_sections("enums")["enums"]
 
     def read_commands(self) -> List[Command]:
         """Reads all commands.
@@ -177,49 +425,7 @@ class RegistryReader:
         Returns:
             List[Command]: list of commands
         """
-        entries = []
-        commands_elem = next(self._tree.getroot().iter("commands"))
-        commands = Commands(
-            namespace=commands_elem.get("namespace"),
-            entires=entries,
-        )
-        for comm_elem in commands_elem.iter("command"):
-            command = Command()
-            entries.append(command)
-
-            for child in comm_elem:
-                # A command should only have one proto tag
-                if child.tag == "proto":
-                    command.proto = "".join(child.itertext())
-                    command.name = next(child.iter("name")).text
-                elif child.tag == "param":
-                    name = next(child.iter("name")).text
-                    value = "".join(child.itertext())
-                    group = child.get("group")
-                    length = child.get("len")
-                    ptype = None
-                    try:
-                        ptype = next(child.iter("ptype")).text
-                    except StopIteration:
-                        pass
-                    command.params.append(
-                        CommandParam(
-                            name=name,
-                            value=value,
-                            ptype=ptype,
-                            group=group,
-                            length=length,
-                        )
-                    )
-                elif child.tag == "glx":
-                    command.glx = {
-                        "type": child.get("type"),
-                        "opcode": child.get("opcode"),
-                        "name": child.get("name"),
-                        "comment": child.get("comment"),
-                    }
-
-        return commands
+        return self._read_sections("commands")["commands"]
 
     def read_features(self) -> List[Feature]:
         """Reads all features.
@@ -227,40 +433,529 @@ class RegistryReader:
         Returns:
             List[Feature]: list of features
         """
-        features = []
-        for feature_elem in self._tree.iter("feature"):
-            feature = Feature(
-                api=feature_elem.get("api"),
-                name=feature_elem.get("name"),
-                number=feature_elem.get("number"),
-            )
-            features.append(Feature)
-            for details_elem in (
-                *feature_elem.iter("require"),
-                *feature_elem.iter("remove"),
-            ):
-                mode = details_elem.tag
-                details = FeatureDetails(
-                    mode,
-                    profile=details_elem.get("profile"),
-                    comment=details_elem.get("comment"),
-                    enums=[t.get("name") for t in details_elem.iter("enum")],
-                    commands=[t.get("name") for t in details_elem.iter("command")],
-                    types=[t.get("name") for t in details_elem.iter("type")],
-                )
-                if mode == FeatureDetails.REQUIRE:
-                    feature.require.append(details)
-                elif mode == FeatureDetails.REMOVE:
-                    feature.require.append(details)
-                else:
-                    logger.warning("Unsupported mode: '%s'", mode)
-
-        return features
+        return self._read_sections("features")["features"]
 
-    def read_extensions(self):
+    def read_extensions(self) -> List[Extension]:
         """Reads all extensions.
 
         Returns:
             List[Extension]: list of extensions
         """
-        return []
+        return self._read_sections("extensions")["extensions"]
+
+    def _read_sections(self, *names: str, chunks=None) -> dict:
+        """Walk the top level of the registry once building the requested sections.
+
+        Args:
+            names (str): The sections to build. All sections are built if none are passed.
+        Keyword Args:
+            chunks (Iterable[bytes]): Parse this document instead of the reader's tree or source
+        Returns:
+            dict: Section name and the objects built for it
+        """
+        names = set(names or SECTIONS)
+        sections = {name: [] for name in SECTIONS}
+        if self._stats is not None:
+            blocks = sys.getallocatedblocks()
+            start = time.perf_counter()
+
+        with _paused_gc(self.pause_gc):
+            if chunks is not None:
+                namespace = self._backend.parse(self, chunks, names, sections)
+            elif self._tree is not None:
+                namespace = self._walk_tree(self._tree.getroot(), names, sections)
+            else:
+                namespace = self._backend.parse(self, self._source_chunks(), names, sections)
+
+        sections["commands"] = self.commands_cls(namespace=namespace, entires=sections["commands"])
+        if self._stats is not None:
+            seconds = time.perf_counter() - start
+            self._stats.record("walk", seconds, objects=sys.getallocatedblocks() - blocks)
+        return sections
+
+    def _read_filtered(self, filter: RegistryFilter) -> dict:
+        """Build the sections selected by a filter.
+
+        Returns:
+            dict: Section name and the objects built for it
+        """
+        if self._stats is not None:
+            blocks = sys.getallocatedblocks()
+            start = time.perf_counter()
+
+        with _paused_gc(self.pause_gc):
+            if self._tree is not None:
+                root = self._tree.getroot()
+                sections = self._walk_filtered(filter, _tree_elements(root), _tree_elements(root))
+            else:
+                # The features and extensions are at the end of the registry but have to be read first
+                data = self._read_source()
+                index = self._index_sections(data)
+                sections = self._walk_filtered(
+                    filter,
+                    _stream_elements(_fragment_events(data, index, ("feature", "extensions"))),
+                    _stream_elements(_fragment_events(data, index, ("types", "groups", "enums", "commands"))),
+                )
+
+        if self._stats is not None:
+            seconds = time.perf_counter() - start
+            self._stats.record("walk", seconds, objects=sys.getallocatedblocks() - blocks)
+        return sections
+
+    def _walk_filtered(self, filter: RegistryFilter, requirements, definitions) -> dict:
+        """Build the features and extensions selected by a filter followed by everything they require.
+
+        Args:
+            filter (RegistryFilter): The filter
+            requirements: ``(parent tag, element)`` pairs of the features and extensions
+            definitions: ``(parent tag, element)`` pairs of the types, groups, enums and commands
+        Returns:
+            dict: Section name and the objects built for it
+        """
+        sections = {name: [] for name in SECTIONS}
+        for parent, elem in requirements:
+            if (parent, elem.tag) == ("registry", "feature"):
+                if filter.includes_feature(elem.get("api"), elem.get("number")):
+                    sections["features"].append(self._build_feature(elem))
+            elif (parent, elem.tag) == ("extensions", "extension"):
+                if filter.includes_extension(elem.get("name")):
+                    sections["extensions"].append(self._build_extension(elem))
+
+        command_names, enum_names, type_names = filter.required_names(
+            sections["features"], sections["extensions"],
+        )
+
+        # Types and groups come first but depend on the commands. They are few and kept until the end.
+        namespace = None
+        type_elems, group_elems = [], []
+        for parent, elem in definitions:
+            key = (parent, elem.tag)
+            if key == ("commands", "command"):
+                if elem.findtext("proto/name") in command_names:
+                    sections["commands"].append(self._build_command(elem))
+            elif key == ("registry", "enums"):
+                selected = [child for child in elem.iterfind("enum") if child.get("name") in enum_names]
+                if selected:
+                    # A copy with only the selected enums keeps the builder interface
+                    block = ElementTree.Element(elem.tag, elem.attrib)
+                    block.extend(selected)
+                    sections["enums"].append(self._build_enums(block))
+            elif key == ("registry", "commands"):
+                namespace = elem.get("namespace")
+            elif key == ("types", "type"):
+                type_elems.append(elem)
+            elif key == ("groups", "group"):
+                group_elems.append(elem)
+
+        # Types used by the commands and the types those depend on
+        for command in sections["commands"]:
+            type_names.update(param.ptype for param in command.params if param.ptype)
+            type_names.update(_WORD.findall(command.proto or ""))
+        named_types = [(elem.findtext("name") or elem.get("name"), elem) for elem in type_elems]
+        requires = {name: elem.get("requires") for name, elem in named_types if elem.get("requires")}
+        pending = list(type_names)
+        while pending:
+            name = requires.get(pending.pop())
+            if name is not None and name not in type_names:
+                type_names.add(name)
+                pending.append(name)
+        sections["types"] = [self._build_type(elem) for name, elem in named_types if name in type_names]
+
+        group_names = {param.group_name for command in sections["commands"] for param in command.params}
+        sections["groups"] = [self._build_group(elem) for elem in group_elems if elem.get("name") in group_names]
+
+        sections["commands"] = self.commands_cls(namespace=namespace, entires=sections["commands"])
+        return sections
+
+    def _instrument_builders(self):
+        """Replace the builders of this reader with versions recording their time and counters.
+
+        Allocated memory blocks are only counted per walk since
+        ``sys.getallocatedblocks`` is too slow to call for every element.
+        """
+        stats = self._stats
+        perf_counter = time.perf_counter
+
+        def instrument(section, builder):
+            def build(elem):
+                start = perf_counter()
+                obj = builder(elem)
+                seconds = perf_counter() - start
+                stats.record(section, seconds, elements=sum(1 for _ in elem.iter()), objects=1)
+                return obj
+            return build
+
+        for section, method in self._dispatch.values():
+            setattr(self, method, instrument(section, getattr(self, method)))
+
+    def _section_loader(self):
+        """Create a function building a single section by name"""
+        if self._tree is not None:
+            return lambda name: self._read_sections(name)[name]
+
+        data = self._read_source()
+        blocks = self._index_sections(data)
+        tags = {
+            section: tag if parent == "registry" else parent
+            for (parent, tag), (section, _) in self._dispatch.items()
+        }
+
+        def load(name):
+            return self._read_sections(name, chunks=_fragment_parts(data, blocks, (tags.get(name),)))[name]
+
+        return load
+
+    def _read_source(self) -> bytes:
+        """Read the raw bytes of the source"""
+        if hasattr(self._source, "iter_content"):
+            return b"".join(self._response_chunks())
+
+        if hasattr(self._source, "read"):
+            self._source.seek(0)
+            return self._source.read()
+
+        with open(self._source, "rb") as fd:
+            return fd.read()
+
+    def _source_chunks(self):
+        """Iterate the raw bytes of the source in chunks.
+
+        Responses are yielded chunk by chunk as they are
+        downloaded so parsing overlaps the transfer.
+        """
+        if hasattr(self._source, "iter_content"):
+            yield from self._response_chunks()
+            return
+
+        if hasattr(self._source, "read"):
+            self._source.seek(0)
+            yield from iter(lambda: self._source.read(CHUNK_SIZE), b"")
+            return
+
+        with open(self._source, "rb") as fd:
+            yield from iter(lambda: fd.read(CHUNK_SIZE), b"")
+
+    def _response_chunks(self):
+        """Iterate the body of a streamed response. This can only be done once"""
+        if self._consumed:
+            raise RuntimeError("A registry streamed from an url can only be read once")
+
+        self._consumed = True
+        return self._source.iter_content(CHUNK_SIZE)
+
+    @staticmethod
+    def _index_sections(data: bytes) -> dict:
+        """Locate the top level blocks of the registry without parsing it.
+
+        Args:
+            data (bytes): The raw registry xml
+        Returns:
+            dict: Tag name and a list of ``(start, end)`` byte offsets for every block with that tag
+        Raises:
+            ElementTree.ParseError: if a block isn't closed, for example in a truncated file
+        """
+        blocks = {}
+        pos = data.find(b"<registry")
+        while True:
+            match = _SECTION_START.search(data, pos)
+            if match is None:
+                break
+            if match.group(1) is None:
+                pos = match.end()
+                continue
+
+            tag = match.group(1)
+            end = match.end()
+            if not match.group(2):
+                close = data.find(b"</" + tag + b">", end)
+                if close == -1:
+                    raise ElementTree.ParseError("No closing tag for <{}> at offset {}".format(
+                        tag.decode(), match.start(),
+                    ))
+                end = close + len(tag) + 3
+
+            blocks.setdefault(tag.decode(), []).append((match.start(), end))
+            pos = end
+
+        return blocks
+
+    def _walk_tree(self, root, names: set, sections: dict) -> str:
+        """Build the requested sections from a parsed element tree.
+
+        Returns:
+            str: The commands namespace
+        """
+        containers = {parent: section for (parent, _), (section, _) in self._dispatch.items()}
+        namespace = None
+
+        for section_elem in root:
+            entry = self._dispatch.get((root.tag, section_elem.tag))
+            if entry is not None:
+                if entry[0] in names:
+                    sections[entry[0]].append(getattr(self, entry[1])(section_elem))
+                continue
+
+            if section_elem.tag == "commands":
+                namespace = section_elem.get("namespace")
+            if containers.get(section_elem.tag) not in names:
+                continue
+
+            for elem in section_elem:
+                entry = self._dispatch.get((section_elem.tag, elem.tag))
+                if entry is not None:
+                    sections[entry[0]].append(getattr(self, entry[1])(elem))
+
+        return namespace
+
+    def walk_events(self, events, names: set, sections: dict) -> str:
+        """Build the requested sections from ``start`` and ``end`` events of an incremental parser.
+
+        Every element is removed from its parent as soon as it has been
+        handed to a builder (or skipped), so only the element currently
+        being built is kept in memory. Used by parser backends producing
+        ``xml.etree.ElementTree`` elements.
+
+        Args:
+            events: ``(event, element)`` pairs like ``XMLPullParser.read_events()``
+            names (set): The sections to build. For example ``commands`` and ``enums``
+            sections (dict): Section name and the list to add its objects to
+        Returns:
+            str: The commands namespace
+        """
+        namespace = None
+        stack = []
+
+        for event, elem in events:
+            if event == "start":
+                if len(stack) == 1 and elem.tag == "commands":
+                    namespace = elem.get("namespace")
+                stack.append(elem)
+                continue
+
+            stack.pop()
+            if not stack:
+                break
+
+            parent = stack[-1]
+            entry = self._dispatch.get((parent.tag, elem.tag))
+            if entry is not None and len(stack) <= 2:
+                if entry[0] in names:
+                    sections[entry[0]].append(getattr(self, entry[1])(elem))
+                parent.remove(elem)
+            elif len(stack) == 1:
+                parent.remove(elem)
+
+        return namespace
+
+    def _build_type(self, type_elem) -> GlType:
+        name_elem = type_elem.find("name")
+        return self.type_cls(
+            name=_intern(name_elem.text if name_elem is not None else type_elem.get("name")),
+            text="".join(type_elem.itertext()),
+            comment=type_elem.get("comment"),
+            requires=_intern(type_elem.get("requires")),
+        )
+
+    def _build_group(self, group_elem) -> Group:
+        return self.group_cls(
+            sys.intern(group_elem.attrib["name"]),
+            entries={sys.intern(e.attrib["name"]) for e in group_elem.iterfind("enum")},
+        )
+
+    def _build_enums(self, enums_elem) -> Enums:
+        return self.enums_cls(
+            namespace=_intern(enums_elem.get("namespace")),
+            group_name=_intern(enums_elem.get("group")),
+            type=_intern(enums_elem.get("type")),
+            comment=enums_elem.get("comment"),
+            vendor=_intern(enums_elem.get("vendor")),
+            start=enums_elem.get("start"),
+            end=enums_elem.get("end"),
+            entries=[
+                self.enum_cls(
+                    name=sys.intern(el.get("name")),
+                    value=el.get("value"),
+                    comment=el.get("comment"),
+                    alias=_intern(el.get("alias")),
+                    api=_intern(el.get("api")),
+                )
+                for el in enums_elem.iterfind("enum")
+            ],
+        )
+
+    def _build_command(self, comm_elem) -> Command:
+        command = self.command_cls()
+
+        for child in comm_elem:
+            # A command should only have one proto tag
+            if child.tag == "proto":
+                command.proto = "".join(child.itertext())
+                command.name = sys.intern(child.find("name").text)
+            elif child.tag == "param":
+                ptype_elem = child.find("ptype")
+                command.params.append(
+                    self.command_param_cls(
+                        name=sys.intern(child.find("name").text),
+                        value="".join(child.itertext()),
+                        ptype=sys.intern(ptype_elem.text) if ptype_elem is not None else None,
+                        group_name=_intern(child.get("group")),
+                        length=_intern(child.get("len")),
+                    )
+                )
+            elif child.tag == "glx":
+                command.glx = {
+                    "type": child.get("type"),
+                    "opcode": child.get("opcode"),
+                    "name": child.get("name"),
+                    "comment": child.get("comment"),
+                }
+            elif child.tag == "alias":
+                command.alias = sys.intern(child.get("name"))
+
+        return command
+
+    def _build_feature(self, feature_elem) -> Feature:
+        feature = self.feature_cls(
+            api=_intern(feature_elem.get("api")),
+            name=feature_elem.get("name"),
+            number=feature_elem.get("number"),
+        )
+        self._build_details(feature_elem, feature)
+        return feature
+
+    def _build_extension(self, extension_elem) -> Extension:
+        extension = self.extension_cls(
+            name=extension_elem.get("name"),
+            supported=_intern(extension_elem.get("supported")),
+            comment=extension_elem.get("comment"),
+        )
+        self._build_details(extension_elem, extension)
+        return extension
+
+    def _build_details(self, parent_elem, parent):
+        """Add the require and remove blocks of a feature or extension to it"""
+        for details_elem in parent_elem:
+            mode = details_elem.tag
+            names = {"enum": [], "command": [], "type": []}
+            for elem in details_elem:
+                if elem.tag in names:
+                    names[elem.tag].append(sys.intern(elem.get("name")))
+
+            details = self.feature_details_cls(
+                mode,
+                profile=_intern(details_elem.get("profile")),
+                api=_intern(details_elem.get("api")),
+                comment=details_elem.get("comment"),
+                enums=names["enum"],
+                commands=names["command"],
+                types=names["type"],
+            )
+            if mode == FeatureDetails.REQUIRE:
+                parent.require.append(details)
+            elif mode == FeatureDetails.REMOVE:
+                parent.remove.append(details)
+            else:
+                logger.warning("Unsupported mode: '%s'", mode)
+
+
+def _fragment_parts(data: bytes, blocks: dict, tags: tuple):
+    """Yield the parts of a registry document made of the top level blocks with some tags.
+
+    Args:
+        data (bytes): The raw registry xml
+        blocks (dict): The block offsets located by ``RegistryReader._index_sections``
+        tags (tuple): The tags of the blocks to include
+    """
+    # Keep the xml declaration so the blocks are decoded with the right encoding
+    yield data[:data.find(b"?>") + 2] if data.startswith(b"<?xml") else b""
+    yield b"<registry>"
+    for start, end in sorted(offset for tag in tags for offset in blocks.get(tag, [])):
+        for pos in range(start, end, CHUNK_SIZE):
+            yield data[pos:min(pos + CHUNK_SIZE, end)]
+    yield b"</registry>"
+
+
+def _fragment_events(data: bytes, blocks: dict, tags: tuple):
+    """Incrementally parse the top level blocks with some tags yielding ``start`` and ``end`` events"""
+    parser = ElementTree.XMLPullParser(events=("start", "end"))
+    for part in _fragment_parts(data, blocks, tags):
+        parser.feed(part)
+        yield from parser.read_events()
+    parser.close()
+    yield from parser.read_events()
+
+
+_CONTAINERS = ("types", "groups", "commands", "extensions")
+
+
+def _tree_elements(root):
+    """Yield ``(parent tag, element)`` for the top level elements and the entries of the section containers"""
+    for elem in root:
+        yield root.tag, elem
+        if elem.tag in _CONTAINERS:
+            for child in elem:
+                yield elem.tag, child
+
+
+def _stream_elements(events):
+    """Yield ``(parent tag, element)`` like ``_tree_elements`` from parser events.
+
+    Section containers are yielded when they start so their attributes
+    can be read. Every other element is yielded when it's complete and
+    removed from its parent afterwards, so only the elements kept by
+    the caller stay in memory.
+    """
+    stack = []
+    for event, elem in events:
+        if event == "start":
+            if len(stack) == 1 and elem.tag in _CONTAINERS:
+                yield stack[0].tag, elem
+            stack.append(elem)
+            continue
+
+        stack.pop()
+        if not stack:
+            break
+        parent = stack[-1]
+        if len(stack) == 1:
+            if elem.tag not in _CONTAINERS:
+                yield parent.tag, elem
+            parent.remove(elem)
+        elif len(stack) == 2 and parent.tag in _CONTAINERS:
+            yield parent.tag, elem
+            parent.remove(elem)
+
+
+@contextmanager
+def _paused_gc(pause: bool = True):
+    """Pause the cyclic garbage collector if ``pause`` is set.
+
+    Parsing allocates many long lived objects. Every collection triggered
+    on the way traverses all of them, making parse time grow faster than
+    the size of the registry. Parsing creates hardly any reference cycles.
+
+    Concurrent reads share one pause. The collector is enabled again
+    when the last of them is done, if it was enabled before the first.
+    """
+    global _gc_pauses, _gc_was_enabled
+    if not pause:
+        yield
+        return
+
+    with _gc_lock:
+        if _gc_pauses == 0:
+            _gc_was_enabled = gc.isenabled()
+            gc.disable()
+        _gc_pauses += 1
+    try:
+        yield
+    finally:
+        with _gc_lock:
+            _gc_pauses -= 1
+            if _gc_pauses == 0 and _gc_was_enabled:
+                gc.enable()
+
+
+def _read_file(reader_cls, path: str) -> Registry:
+    """Read a registry file in a worker process of ``RegistryReader.read_many``"""
+    return reader_cls.from_file(path).read()
@@ -1,15 +1,23 @@
-from typing import List
+from collections import defaultdict
+from typing import Callable, Dict, Iterable, List, Optional, Tuple
 import logging
+import re
 
 from opengl_registry.gltype import GlType
 from opengl_registry.group import Group
-from opengl_registry.enums import Enums
+from opengl_registry.enums import Enum, Enums
 from opengl_registry.commands import Command
+from opengl_registry.diff import RegistryDiff
 from opengl_registry.features import Feature
 from opengl_registry.extensions import Extension
+from opengl_registry.profile import Profile
+from opengl_registry.stats import ReadStats
 
 logger = logging.getLogger(__name__)
 
+#: Words of a C declaration. Used to find the types it references
+_WORD = re.compile(r"\w+")
+
 
 class Registry:
     """A collection of all registry information"""
@@ -17,55 +25,618 @@ class Registry:
     def __init__(
         self,
         *,
-        types: List[GlType],
-        groups: List[Group],
-        enums: List[Enums],
-        commands: List[Command],
-        features: List[Feature],
-        extensions: List[Extension]
+        types: List[GlType] = None,
+        groups: List[Group] = None,
+        enums: List[Enums] = None,
+        commands: List[Command] = None,
+        features: List[Feature] = None,
+        extensions: List[Extension] = None,
+        loader: Callable[[str], list] = None,
+        stats: ReadStats = None
     ):
         """Initialize the registry.
 
         Keyword Args:
             types (List[Type]): List of types
             groups (List[Group]): List of groups
+            enums (List[Enums]): List of enum ranges
+            commands (Commands): The commands
+            features (List[Feature]): List of features
+            extensions (List[Extension]): List of extensions
+            loader (Callable[[str], list]): Builds a section by name. Sections
+                not passed in are loaded with it the first time they are accessed.
+            stats (ReadStats): Timings and counters recorded while reading the registry
         """
-        self._groups = {grp.name: grp for grp in groups} if groups else dict()
+        self._loader = loader
+        self._stats = stats
+        self._groups = self._group_dict(groups) if groups is not None else None
         self._types = types
         self._enums = enums
         self._commands = commands
         self._features = features
         self._extensions = extensions
 
+        # Lookup indexes. Built on first use
+        self._command_index = None
+        self._enum_index = None
+        self._enum_api_index = None
+        self._enum_value_index = None
+        self._type_index = None
+        self._feature_index = None
+        self._extension_index = None
+        self._extension_api_index = {}
+        self._extension_command_index = None
+        self._extension_enum_index = None
+        self._canonical_index = None
+        self._alias_index = None
+
+        # Type dependency graph. Built on first use
+        self._type_dependencies = None
+        self._type_definitions = None
+        self._type_positions = None
+        self._type_order = None
+
+        # Folded (commands, enums, types) names per (api, profile, version)
+        self._profile_cache = {}
+        self._linked = False
+
+    @property
+    def stats(self) -> Optional[ReadStats]:
+        """ReadStats: Timings and counters recorded while reading the registry or ``None``"""
+        return self._stats
+
     @property
     def groups(self) -> dict:
         """dict: Dictionary for all groups with group name as key"""
+        if self._groups is None:
+            self._groups = self._group_dict(self._load("groups"))
         return self._groups
 
     @property
     def enums(self) -> List[Enums]:
+        if self._enums is None:
+            self._enums = self._load("enums")
         return self._enums
 
     @property
     def commands(self) -> List[Command]:
+        if self._commands is None:
+            self._commands = self._load("commands")
         return self._commands
 
     @property
     def features(self):
+        if self._features is None:
+            self._features = self._load("features")
         return self._features
 
     @property
     def extensions(self) -> List[Extension]:
+        if self._extensions is None:
+            self._extensions = self._load("extensions")
         return self._extensions
 
     @property
     def types(self) -> List[GlType]:
         """List[Type]: List of all types"""
+        if self._types is None:
+            self._types = self._load("types")
         return self._types
 
-    # TODO: Finalize this method
+    @property
+    def linked(self) -> bool:
+        """bool: If the cross references between the objects are resolved. See ``link``"""
+        return self._linked
+
+    def link(self):
+        """Resolve the cross references between groups, enum ranges, enums and command parameters.
+
+        Sets ``Enums.group``, ``Enum.range``, ``Enum.groups``, ``Group.enums``
+        and ``CommandParam.group`` to the referenced objects. Every name
+        is looked up once in a hash map, so linking is linear in the size
+        of the registry. Enums defined once per api are all linked.
+        Names not defined in the registry are skipped.
+
+        Registries created by ``RegistryReader.read`` are linked unless
+        read lazily. Linking a lazy registry loads the groups, enums
+        and commands. Calling this again does nothing.
+        """
+        if self._linked:
+            return
+
+        groups = self.groups
+        members: Dict[str, List[Group]] = defaultdict(list)
+        for group in groups.values():
+            group.enums = []
+            for name in group.entires:
+                members[name].append(group)
+        # Shared by every definition of a name. Most enums aren't in any group and share the empty tuple.
+        member_of = {name: tuple(found) for name, found in members.items()}
+
+        for enums in self.enums:
+            enums.group = groups.get(enums.group_name)
+            for enum in enums.entires:
+                enum.range = enums
+                enum.groups = member_of.get(enum.name, ())
+                for group in enum.groups:
+                    group.enums.append(enum)
+
+        for command in self.commands.entries:
+            for param in command.params:
+                param.group = groups.get(param.group_name)
+
+        self._linked = True
+
+    def get_command(self, name: str) -> Optional[Command]:
+        """Get a command by name.
+
+        Args:
+            name (str): The command name. For example ``glDrawArrays``
+        Returns:
+            Command: The command or ``None`` if not found
+        """
+        if self._command_index is None:
+            self._command_index = {command.name: command for command in self.commands.entries}
+        return self._command_index.get(name)
+
+    def get_enum(self, name: str, api: str = None) -> Optional[Enum]:
+        """Get an enum by name.
+
+        A few enums are defined once per api with different values.
+        With an api the definition for that api is returned, or the
+        definition without an api if there is none. Otherwise the
+        first definition in the registry is returned.
+
+        Args:
+            name (str): The enum name. For example ``GL_TEXTURE_2D``
+            api (str): The api. For example ``gl`` or ``gles2``
+        Returns:
+            Enum: The enum or ``None`` if not found
+        """
+        if self._enum_index is None:
+            index = {}
+            api_names = set()
+            for enums in self.enums:
+                for enum in enums.entires:
+                    index.setdefault(enum.name, enum)
+                    if enum.api is not None:
+                        api_names.add(enum.name)
+            # Every definition of the names defined per api
+            api_index: Dict[str, List[Enum]] = defaultdict(list)
+            if api_names:
+                for enums in self.enums:
+                    for enum in enums.entires:
+                        if enum.name in api_names:
+                            api_index[enum.name].append(enum)
+            self._enum_index = index
+            self._enum_api_index = dict(api_index)
+
+        definitions = self._enum_api_index.get(name)
+        if api is None or definitions is None:
+            return self._enum_index.get(name)
+
+        for enum in definitions:
+            if enum.api == api:
+                return enum
+        for enum in definitions:
+            if enum.api is None:
+                return enum
+        return None
+
+    def get_enums_by_value(self, value: int) -> List[Enum]:
+        """Get all enums with a specific value.
+
+        Args:
+            value (int): The enum value. For example ``0x0DE1``
+        Returns:
+            List[Enum]: Enums with this value in registry order
+        """
+        if self._enum_value_index is None:
+            index: Dict[int, List[Enum]] = defaultdict(list)
+            for enums in self.enums:
+                for enum in enums.entires:
+                    index[enum.value_int].append(enum)
+            self._enum_value_index = dict(index)
+        return self._enum_value_index.get(value, [])
+
+    def get_type(self, name: str) -> Optional[GlType]:
+        """Get a type by name.
+
+        Args:
+            name (str): The type name. For example ``GLenum``
+        Returns:
+            GlType: The type or ``None`` if not found
+        """
+        if self._type_index is None:
+            self._type_index = {gltype.name: gltype for gltype in self.types}
+        return self._type_index.get(name)
+
+    def get_type_dependencies(self, name: str) -> List[str]:
+        """Get the names of the types a type depends on directly.
+
+        A type depends on the type in its ``requires`` attribute
+        and the types named in its definition.
+
+        Args:
+            name (str): The type name. For example ``GLDEBUGPROC``
+        Returns:
+            List[str]: The type names in the order they are referenced
+        """
+        if self._type_dependencies is None:
+            self._build_type_graph()
+        return list(self._type_dependencies.get(name, ()))
+
+    def get_type_order(self) -> List[GlType]:
+        """Get all types ordered so every type comes after the types it depends on.
+
+        The order is computed once. Independent types keep their registry order.
+
+        Returns:
+            List[GlType]: The types in dependency order
+        """
+        if self._type_order is None:
+            self._build_type_graph()
+        return self._type_order
+
+    def get_required_types(self, names: Iterable[str] = (), commands: Iterable[Command] = ()) -> List[GlType]:
+        """Get the types needed by some types and commands including everything they depend on.
+
+        Only the dependencies of the requested types are visited,
+        so the time depends on the size of the result and not
+        the size of the registry.
+
+        Args:
+            names (Iterable[str]): Type names. Names that aren't types are ignored.
+            commands (Iterable[Command]): Commands. The parameter types and return types are included.
+        Returns:
+            List[GlType]: The types in dependency order
+        """
+        if self._type_dependencies is None:
+            self._build_type_graph()
+
+        dependencies = self._type_dependencies
+        pending = list(names)
+        for command in commands:
+            pending.extend(param.ptype for param in command.params if param.ptype)
+            pending.extend(_WORD.findall(command.proto or ""))
+
+        found = set()
+        while pending:
+            name = pending.pop()
+            if name not in found and name in dependencies:
+                found.add(name)
+                pending.extend(dependencies[name])
+
+        definitions = self._type_definitions
+        return [gltype for name in sorted(found, key=self._type_positions.get) for gltype in definitions[name]]
+
+    def get_feature(self, api: str, number: str) -> Optional[Feature]:
+        """Get a feature by api and version number.
+
+        Args:
+            api (str): The api. For example ``gl`` or ``gles2``
+            number (str): The version number. For example ``3.3``
+        Returns:
+            Feature: The feature or ``None`` if not found
+        """
+        if self._feature_index is None:
+            self._feature_index = {(feature.api, feature.number): feature for feature in self.features}
+        return self._feature_index.get((api, number))
+
+    def get_extension(self, name: str) -> Optional[Extension]:
+        """Get an extension by name.
+
+        Args:
+            name (str): The extension name. For example ``GL_ARB_debug_output``
+        Returns:
+            Extension: The extension or ``None`` if not found
+        """
+        if self._extension_index is None:
+            self._extension_index = {extension.name: extension for extension in self.extensions}
+        return self._extension_index.get(name)
+
+    def canonical(self, name: str) -> str:
+        """Get the canonical name of a command or enum.
+
+        Commands and enums declaring an alias are equivalent to the alias.
+        The canonical name is the end of the alias chain, usually the
+        core name without an extension suffix.
+
+        Args:
+            name (str): The command or enum name. For example ``glDrawArraysEXT``
+        Returns:
+            str: The canonical name. Names without aliases are their own canonical name.
+        """
+        if self._canonical_index is None:
+            self._build_alias_index()
+        return self._canonical_index.get(name, name)
+
+    def aliases_of(self, name: str) -> List[str]:
+        """Get all names equivalent to a command or enum.
+
+        Args:
+            name (str): The command or enum name. For example ``glDrawArrays``
+        Returns:
+            List[str]: The canonical name followed by its aliases in registry order
+        """
+        if self._alias_index is None:
+            self._build_alias_index()
+        return self._alias_index.get(self.canonical(name), [name])
+
+    def get_api_extensions(self, api: str) -> List[Extension]:
+        """Get all extensions supported by an api.
+
+        Args:
+            api (str): The api. For example: gl, glcore, gles2
+        Returns:
+            List[Extension]: The supported extensions in registry order
+        """
+        extensions = self._extension_api_index.get(api)
+        if extensions is None:
+            extensions = [extension for extension in self.extensions if extension.supports(api)]
+            self._extension_api_index[api] = extensions
+        return extensions
+
+    def get_command_extensions(self, name: str) -> List[Extension]:
+        """Get all extensions requiring a command.
+
+        Args:
+            name (str): The command name. For example ``glDebugMessageCallbackARB``
+        Returns:
+            List[Extension]: The extensions in registry order
+        """
+        if self._extension_command_index is None:
+            self._extension_command_index = self._extension_name_index("commands")
+        return self._extension_command_index.get(name, [])
+
+    def get_enum_extensions(self, name: str) -> List[Extension]:
+        """Get all extensions requiring an enum.
+
+        Args:
+            name (str): The enum name. For example ``GL_DEBUG_OUTPUT_SYNCHRONOUS_ARB``
+        Returns:
+            List[Extension]: The extensions in registry order
+        """
+        if self._extension_enum_index is None:
+            self._extension_enum_index = self._extension_name_index("enums")
+        return self._extension_enum_index.get(name, [])
+
+    def _build_alias_index(self):
+        """Merge aliased commands and enums into equivalence classes with union-find.
+
+        The root of every class is kept at the alias target, so
+        the root is the canonical name. Paths are compressed on
+        lookup and the final classes are stored as flat maps.
+
+        Enums defined once per api are only merged when every
+        definition declares the same alias. Otherwise the name
+        means different enums depending on the api.
+        """
+        pairs = [(command.name, command.alias) for command in self.commands.entries if command.alias]
+        api_names = set()
+        for enums in self.enums:
+            for enum in enums.entires:
+                if enum.alias:
+                    pairs.append((enum.name, enum.alias))
+                if enum.api is not None:
+                    api_names.add(enum.name)
+
+        # Only the few names defined per api can have conflicting aliases
+        if api_names:
+            first_alias: Dict[str, Optional[str]] = {}
+            conflicting = set()
+            for enums in self.enums:
+                for enum in enums.entires:
+                    if enum.name in api_names:
+                        if first_alias.setdefault(enum.name, enum.alias) != enum.alias:
+                            conflicting.add(enum.name)
+            if conflicting:
+                pairs = [(name, alias) for name, alias in pairs if name not in conflicting]
+
+        parent: Dict[str, str] = {}
+
+        def find(name: str) -> str:
+            root = name
+            while root in parent:
+                root = parent[root]
+            while name != root:
+                parent[name], name = root, parent[name]
+            return root
+
+        names = {}
+        for name, alias in pairs:
+            names[name] = names[alias] = None
+            name, alias = find(name), find(alias)
+            if name != alias:
+                parent[name] = alias
+
+        canonical = {name: find(name) for name in names}
+        classes: Dict[str, List[str]] = {}
+        for name, root in canonical.items():
+            if name != root:
+                classes.setdefault(root, [root]).append(name)
+
+        self._canonical_index = canonical
+        self._alias_index = classes
+
+    def _build_type_graph(self):
+        """Build the type dependency graph and sort it topologically.
+
+        Types are visited depth first in registry order and emitted
+        after their dependencies. A dependency cycle is broken at the
+        type that is reached again.
+        """
+        definitions: Dict[str, List[GlType]] = defaultdict(list)
+        for gltype in self.types:
+            definitions[gltype.name].append(gltype)
+
+        dependencies = {}
+        for name, gltypes in definitions.items():
+            found = {}
+            for gltype in gltypes:
+                if gltype.requires:
+                    found[gltype.requires] = None
+                found.update(dict.fromkeys(_WORD.findall(gltype.text or "")))
+            dependencies[name] = tuple(dep for dep in found if dep != name and dep in definitions)
+
+        positions: Dict[str, int] = {}
+        order: List[GlType] = []
+        for root in definitions:
+            if root in positions:
+                continue
+            stack = [(root, iter(dependencies[root]))]
+            visiting = {root}
+            while stack:
+                name, remaining = stack[-1]
+                for dep in remaining:
+                    if dep not in positions and dep not in visiting:
+                        visiting.add(dep)
+                        stack.append((dep, iter(dependencies[dep])))
+                        break
+                else:
+                    stack.pop()
+                    visiting.discard(name)
+                    positions[name] = len(positions)
+                    order.extend(definitions[name])
+
+        self._type_definitions = dict(definitions)
+        self._type_dependencies = dependencies
+        self._type_positions = positions
+        self._type_order = order
+
+    def _extension_name_index(self, attr: str) -> Dict[str, List[Extension]]:
+        """Map the command or enum names required by extensions to the extensions"""
+        index: Dict[str, List[Extension]] = defaultdict(list)
+        for extension in self.extensions:
+            names = dict.fromkeys(name for details in extension.require for name in getattr(details, attr))
+            for name in names:
+                index[name].append(extension)
+        return dict(index)
+
     def get_profile(
-        api: str = "gl", profile: str = "core", version: str = "3.3", extensions=None
-    ):
-        """"""
-        raise NotImplementedError()
+        self, api: str = "gl", profile: str = "core", version: str = "3.3", extensions: List[str] = None
+    ) -> Profile:
+        """Resolve the commands, enums and types for an api version.
+
+        The ``require`` and ``remove`` blocks of every feature up to
+        ``version`` are folded in version order followed by the blocks
+        of the requested extensions. Blocks tagged with a different
+        profile or api are ignored. The folded names for every version
+        are memoized, so resolving 4.6 after 3.3 continues from 3.3.
+
+        Args:
+            api (str): The api. For example: gl, gles1, gles2
+            profile (str): core or compatibility
+            version (str): The version number. For example 3.3
+            extensions (List[str]): Names of extensions to include
+        Returns:
+            Profile: The resolved profile
+        Raises:
+            ValueError: if the api or an extension is unknown or an extension isn't supported by the api
+        """
+        commands, enums, types = self._fold_features(api, profile, version)
+
+        for name in extensions or []:
+            extension = self.get_extension(name)
+            if extension is None:
+                raise ValueError("Unknown extension: '{}'".format(name))
+            if not extension.supports(api):
+                raise ValueError("Extension '{}' is not supported by '{}'".format(name, api))
+            _fold(extension, api, profile, commands, enums, types)
+
+        return Profile(
+            api=api,
+            profile=profile,
+            version=version,
+            extensions=list(extensions or []),
+            commands=[c for c in map(self.get_command, commands) if c is not None],
+            enums=[e for e in (self.get_enum(name, api) for name in enums) if e is not None],
+            types=[t for t in map(self.get_type, types) if t is not None],
+        )
+
+    def diff(self, other: "Registry") -> RegistryDiff:
+        """Compare this registry to a newer revision.
+
+        Types, enums, commands, features and extensions are joined by
+        name and compared field by field in linear time.
+
+        Args:
+            other (Registry): The newer registry
+        Returns:
+            RegistryDiff: The changes from this registry to ``other``
+        """
+        return RegistryDiff.compare(self, other)
+
+    def _load(self, name: str):
+        """Build a section with the loader if we have one"""
+        if self._loader is None:
+            return None
+
+        logger.debug("Loading registry section '%s'", name)
+        return self._loader(name)
+
+    @staticmethod
+    def _group_dict(groups: List[Group]) -> dict:
+        return {grp.name: grp for grp in groups} if groups else dict()
+
+    def __getstate__(self):
+        # Build all sections so a pickled registry doesn't depend on the reader
+        for name in ("types", "groups", "enums", "commands", "features", "extensions"):
+            getattr(self, name)
+
+        state = self.__dict__.copy()
+        state["_loader"] = None
+        return state
+
+    def _fold_features(self, api: str, profile: str, version: str) -> Tuple[dict, dict, dict]:
+        """Fold the features of an api up to a version.
+
+        Returns:
+            Tuple[dict, dict, dict]: command, enum and type names as ordered dicts
+        """
+        max_version = _version_key(version)
+        features = sorted(
+            (f for f in self.features if f.api == api and _version_key(f.number) <= max_version),
+            key=lambda f: _version_key(f.number),
+        )
+        if not features and not any(f.api == api for f in self.features):
+            raise ValueError("Unknown api: '{}'".format(api))
+
+        # Continue from the latest version already folded
+        state = ({}, {}, {})
+        start = 0
+        for i, feature in enumerate(features):
+            cached = self._profile_cache.get((api, profile, feature.number))
+            if cached is not None:
+                state = cached
+                start = i + 1
+
+        commands, enums, types = (dict(names) for names in state)
+        for feature in features[start:]:
+            _fold(feature, api, profile, commands, enums, types)
+            self._profile_cache[(api, profile, feature.number)] = (dict(commands), dict(enums), dict(types))
+
+        return commands, enums, types
+
+
+def _fold(parent, api: str, profile: str, commands: dict, enums: dict, types: dict):
+    """Apply the require and remove blocks of a feature or extension matching the api and profile"""
+    for details in parent.require:
+        if details.profile in (None, profile) and details.api in (None, api):
+            commands.update(dict.fromkeys(details.commands))
+            enums.update(dict.fromkeys(details.enums))
+            types.update(dict.fromkeys(details.types))
+
+    for details in parent.remove:
+        if details.profile in (None, profile) and details.api in (None, api):
+            for name in details.commands:
+                commands.pop(name, None)
+            for name in details.enums:
+                enums.pop(name, None)
+            for name in details.types:
+                types.pop(name, None)
+
+
+def _version_key(version: str) -> Tuple[int, ...]:
+    """Version string as a comparable tuple. ``"4.6"`` -> ``(4, 6)``"""
+    return tuple(int(part) for part in version.split("."))
@@ -0,0 +1,150 @@
+import os
+from typing import Dict, Iterator, List, Optional
+
+from opengl_registry.commands import Command
+from opengl_registry.enums import Enum
+from opengl_registry.extensions import Extension
+from opengl_registry.gltype import GlType
+from opengl_registry.registry import Registry
+
+
+class RegistrySet:
+    """Several registries in one namespaced view.
+
+    Every registry is stored under a namespace, usually the name of the
+    file it was read from: ``gl``, ``glx``, ``wgl`` and ``egl``. Lookups
+    accept names qualified with a namespace like ``egl:eglGetDisplay``
+    or plain names searched in every registry in order.
+
+    Example::
+
+        registries = RegistryReader.read_many(['gl.xml', 'egl.xml'], merge=True)
+        registries.get_command('eglGetDisplay')
+        registries.get_enum('gl:GL_TEXTURE_2D')
+        registries['egl'].commands
+    """
+
+    #: Separates the namespace from the name in qualified names
+    SEPARATOR = ":"
+
+    def __init__(self, registries: Dict[str, Registry]):
+        """Initialize the set.
+
+        Args:
+            registries (Dict[str, Registry]): The registries by namespace
+        """
+        self._registries = dict(registries)
+
+    @classmethod
+    def from_paths(cls, paths: List[str], registries: List[Registry]) -> "RegistrySet":
+        """Namespace registries by the name of the file they were read from.
+
+        Args:
+            paths (List[str]): Path to every registry file
+            registries (List[Registry]): The registry read from every path
+        Returns:
+            RegistrySet: The registries by namespace
+        Raises:
+            ValueError: if two files have the same name
+        """
+        namespaces = {}
+        for path, registry in zip(paths, registries):
+            namespace = os.path.splitext(os.path.basename(path))[0]
+            if namespace in namespaces:
+                raise ValueError("Duplicate registry namespace '{}': {}".format(namespace, path))
+            namespaces[namespace] = registry
+        return cls(namespaces)
+
+    @property
+    def namespaces(self) -> List[str]:
+        """List[str]: The namespaces in lookup order"""
+        return list(self._registries)
+
+    @property
+    def registries(self) -> Dict[str, Registry]:
+        """Dict[str, Registry]: The registries by namespace"""
+        return self._registries
+
+    def get_command(self, name: str) -> Optional[Command]:
+        """Get a command by plain or qualified name.
+
+        Args:
+            name (str): The command name. For example ``glDrawArrays`` or ``gl:glDrawArrays``
+        Returns:
+            Command: The command or ``None`` if not found
+        """
+        return self._lookup("get_command", name)
+
+    def get_enum(self, name: str) -> Optional[Enum]:
+        """Get an enum by plain or qualified name.
+
+        Args:
+            name (str): The enum name. For example ``GL_TEXTURE_2D`` or ``gl:GL_TEXTURE_2D``
+        Returns:
+            Enum: The enum or ``None`` if not found
+        """
+        return self._lookup("get_enum", name)
+
+    def get_type(self, name: str) -> Optional[GlType]:
+        """Get a type by plain or qualified name.
+
+        Args:
+            name (str): The type name. For example ``GLenum`` or ``gl:GLenum``
+        Returns:
+            GlType: The type or ``None`` if not found
+        """
+        return self._lookup("get_type", name)
+
+    def get_extension(self, name: str) -> Optional[Extension]:
+        """Get an extension by plain or qualified name.
+
+        Args:
+            name (str): The extension name. For example ``GL_ARB_clip_control`` or ``gl:GL_ARB_clip_control``
+        Returns:
+            Extension: The extension or ``None`` if not found
+        """
+        return self._lookup("get_extension", name)
+
+    def namespace_of(self, name: str) -> Optional[str]:
+        """Get the namespace of the first registry defining a command, enum, type or extension.
+
+        Args:
+            name (str): The plain name
+        Returns:
+            str: The namespace or ``None`` if not found
+        """
+        for namespace, registry in self._registries.items():
+            for method in ("get_command", "get_enum", "get_type", "get_extension"):
+                if getattr(registry, method)(name) is not None:
+                    return namespace
+        return None
+
+    def _lookup(self, method: str, name: str):
+        namespace, separator, plain = name.rpartition(self.SEPARATOR)
+        if separator:
+            registry = self._registries.get(namespace)
+            return getattr(registry, method)(plain) if registry is not None else None
+
+        for registry in self._registries.values():
+            result = getattr(registry, method)(name)
+            if result is not None:
+                return result
+        return None
+
+    def __getitem__(self, namespace: str) -> Registry:
+        return self._registries[namespace]
+
+    def __contains__(self, namespace: str) -> bool:
+        return namespace in self._registries
+
+    def __iter__(self) -> Iterator[str]:
+        return iter(self._registries)
+
+    def __len__(self) -> int:
+        return len(self._registries)
+
+    def __str__(self):
+        return "<RegistrySet {}>".format(" ".join(self._registries))
+
+    def __repr__(self):
+        return str(self)
@@ -0,0 +1,176 @@
+import time
+from contextlib import contextmanager
+from typing import Dict
+
+
+class PhaseStats:
+    """Timings and counters of a single phase of reading a registry"""
+
+    __slots__ = ("_name", "_seconds", "_calls", "_elements", "_objects")
+
+    def __init__(self, name: str):
+        """Initialize the phase.
+
+        Args:
+            name (str): The phase name. For example ``parse`` or ``commands``
+        """
+        self._name = name
+        self._seconds = 0.0
+        self._calls = 0
+        self._elements = 0
+        self._objects = 0
+
+    @property
+    def name(self) -> str:
+        """str: The phase name"""
+        return self._name
+
+    @property
+    def seconds(self) -> float:
+        """float: Total wall time spent in the phase"""
+        return self._seconds
+
+    @property
+    def calls(self) -> int:
+        """int: Number of times the phase was recorded"""
+        return self._calls
+
+    @property
+    def elements(self) -> int:
+        """int: Number of xml elements handled including nested elements"""
+        return self._elements
+
+    @property
+    def objects(self) -> int:
+        """int: Number of objects built by a section or the net number of memory blocks allocated by a walk"""
+        return self._objects
+
+    def add(self, seconds: float, elements: int = 0, objects: int = 0):
+        """Add a measurement.
+
+        Args:
+            seconds (float): Wall time
+            elements (int): Number of xml elements
+            objects (int): Number of allocated memory blocks
+        """
+        self._seconds += seconds
+        self._calls += 1
+        self._elements += elements
+        self._objects += objects
+
+    def to_dict(self) -> dict:
+        """dict: The counters of the phase"""
+        return {
+            "seconds": self._seconds,
+            "calls": self._calls,
+            "elements": self._elements,
+            "objects": self._objects,
+        }
+
+    def __str__(self):
+        return "<PhaseStats {} {:.4f}s calls={} elements={} objects={}>".format(
+            self._name, self._seconds, self._calls, self._elements, self._objects,
+        )
+
+    def __repr__(self):
+        return str(self)
+
+
+class ReadStats:
+    """Timings and counters recorded while reading a registry.
+
+    Pass an instance to a ``RegistryReader`` to enable instrumentation.
+    The reader records these phases:
+
+    * ``download``: Fetching the registry from an url
+    * ``parse``: Parsing the xml into an element tree. Not recorded when
+      streaming since parsing then happens during ``walk``
+    * ``walk``: A complete pass over the registry including building the objects.
+      Recorded once per ``read()`` or ``read_*`` call and per lazily loaded section.
+      ``objects`` is the net number of memory blocks allocated by the walk.
+    * ``types``, ``groups``, ``enums``, ``commands``, ``features`` and ``extensions``:
+      Building the objects of a section. ``elements`` counts the xml elements
+      including nested elements and ``objects`` the objects built.
+      Not recorded by backends that don't use the element builders like ``ExpatBackend``.
+    * ``link``: Resolving the cross references between the objects with ``Registry.link``
+
+    Readers created without stats don't record anything and have no overhead.
+    Subclasses can override ``record`` to forward the measurements elsewhere.
+
+    Example::
+
+        reader = RegistryReader.from_file('gl.xml', stats=ReadStats())
+        registry = reader.read()
+        print(registry.stats.format())
+    """
+
+    def __init__(self):
+        self._phases = {}
+
+    @property
+    def phases(self) -> Dict[str, PhaseStats]:
+        """Dict[str, PhaseStats]: The recorded phases in the order they were first recorded"""
+        return self._phases
+
+    def get(self, name: str) -> PhaseStats:
+        """Get a phase by name.
+
+        Args:
+            name (str): The phase name
+        Returns:
+            PhaseStats: The phase. An empty phase if it wasn't recorded.
+        """
+        phase = self._phases.get(name)
+        return phase if phase is not None else PhaseStats(name)
+
+    def record(self, name: str, seconds: float, elements: int = 0, objects: int = 0):
+        """Record a measurement of a phase.
+
+        Args:
+            name (str): The phase name
+            seconds (float): Wall time
+            elements (int): Number of xml elements
+            objects (int): Number of allocated memory blocks
+        """
+        phase = self._phases.get(name)
+        if phase is None:
+            phase = self._phases[name] = PhaseStats(name)
+        phase.add(seconds, elements=elements, objects=objects)
+
+    @contextmanager
+    def measure(self, name: str):
+        """Record the wall time of a block as a phase.
+
+        Args:
+            name (str): The phase name
+        """
+        start = time.perf_counter()
+        try:
+            yield
+        finally:
+            self.record(name, time.perf_counter() - start)
+
+    def to_dict(self) -> Dict[str, dict]:
+        """dict: The counters of every phase by name"""
+        return {name: phase.to_dict() for name, phase in self._phases.items()}
+
+    def format(self) -> str:
+        """Describe the recorded phases as a table.
+
+        Returns:
+            str: The table
+        """
+        lines = ["{:<12}{:>10}{:>8}{:>10}{:>10}".format("phase", "seconds", "calls", "elements", "objects")]
+        for phase in self._phases.values():
+            lines.append("{:<12}{:>10.4f}{:>8}{:>10}{:>10}".format(
+                phase.name, phase.seconds, phase.calls, phase.elements, phase.objects,
+            ))
+        return "\n".join(lines)
+
+    def __str__(self):
+        return "<ReadStats {}>".format(" ".join(
+            "{}={:.4f}s".format(name, phase.seconds) for name, phase in self._phases.items()
+        ))
+
+    def __repr__(self):
+        return str(self)
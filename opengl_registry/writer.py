@@ -0,0 +1,638 @@
+import hashlib
+import inspect
+import json
+import logging
+import os
+import re
+import textwrap
+from typing import Callable, Dict, List, Optional, Tuple
+
+import opengl_registry
+from opengl_registry.commands import Command
+from opengl_registry.enums import Enum
+from opengl_registry.gltype import GlType
+from opengl_registry.profile import Profile
+from opengl_registry.registry import Registry
+
+logger = logging.getLogger(__name__)
+
+#: ctypes equivalents of the C types used in the registry
+C_TYPES = {
+    "void": "None",
+    "char": "c_char",
+    "unsigned char": "c_ubyte",
+    "short": "c_short",
+    "unsigned short": "c_ushort",
+    "int": "c_int",
+    "unsigned int": "c_uint",
+    "float": "c_float",
+    "double": "c_double",
+    "khronos_int8_t": "c_int8",
+    "khronos_uint8_t": "c_uint8",
+    "khronos_int16_t": "c_int16",
+    "khronos_uint16_t": "c_uint16",
+    "khronos_int32_t": "c_int32",
+    "khronos_uint32_t": "c_uint32",
+    "khronos_int64_t": "c_int64",
+    "khronos_uint64_t": "c_uint64",
+    "khronos_float_t": "c_float",
+    "khronos_intptr_t": "c_ssize_t",
+    "khronos_ssize_t": "c_ssize_t",
+}
+
+_DOC = '''"""
+{title}
+
+Generated by opengl-registry {version}. Do not edit.
+
+Call ``load(get_proc_address)`` with a function returning the
+address of a GL function by name before calling any command.
+{resolve_doc}
+"""
+'''
+
+_FUNCTYPE = '''
+_FUNCTYPE = getattr(ctypes, "WINFUNCTYPE", ctypes.CFUNCTYPE)
+'''
+
+_PACKAGE_INIT = '''from . import commands, enums, types
+from .commands import *  # noqa: F401,F403
+from .enums import *  # noqa: F401,F403
+from .types import *  # noqa: F401,F403
+
+# Let load() and resolved commands rebind the names in the package as well
+commands._namespaces.append(globals())
+
+__all__ = types.__all__ + enums.__all__ + commands.__all__
+'''
+
+_LAZY_LOADER = '''
+_get_proc_address = None
+_commands = {}
+_namespaces = [globals()]
+
+
+def load(get_proc_address):
+    """Set the function used to look up GL function addresses by name.
+
+    Resolved commands are reset so they are looked up again on their next call.
+    """
+    global _get_proc_address
+    _get_proc_address = get_proc_address
+    for name, command in _commands.items():
+        command._function = None
+        for namespace in _namespaces:
+            namespace[name] = command
+
+
+class _Command:
+    """Resolves a GL function pointer on its first call"""
+
+    __slots__ = ("__name__", "_restype", "_argtypes", "_function")
+
+    def __init__(self, name, restype, *argtypes):
+        self.__name__ = name
+        self._restype = restype
+        self._argtypes = argtypes
+        self._function = None
+        _commands[name] = self
+
+    def __call__(self, *args):
+        function = self._function
+        if function is None:
+            function = self._resolve()
+        return function(*args)
+
+    def _resolve(self):
+        if _get_proc_address is None:
+            raise RuntimeError("Call load() before calling GL commands")
+        address = _get_proc_address(self.__name__)
+        if not address:
+            raise RuntimeError("GL command '{}' is not available".format(self.__name__))
+        self._function = _FUNCTYPE(self._restype, *self._argtypes)(address)
+        self._function.__name__ = self.__name__
+        for namespace in _namespaces:
+            namespace[self.__name__] = self._function
+        return self._function
+
+    def __repr__(self):
+        return "<GL command {}>".format(self.__name__)
+
+'''
+
+_BATCH_LOADER = '''
+_namespaces = [globals()]
+
+
+def load(get_proc_address):
+    """Look up the addresses of all commands using a function returning
+    the address of a GL function by name.
+
+    Returns:
+        list: Names of the commands that are not available. These are set to ``None``.
+    """
+    functions = _functions
+    prototypes = _prototypes
+    signatures = _signatures
+    missing = []
+    for index, name in enumerate(_names):
+        address = get_proc_address(name)
+        if address:
+            functions[index] = prototypes[signatures[index]](address)
+        else:
+            functions[index] = None
+            missing.append(name)
+    for namespace in _namespaces:
+        namespace.update(zip(_names, functions))
+    return missing
+
+'''
+
+
+class CtypesWriter:
+    """Writes a python module with ctypes bindings for a resolved profile.
+
+    The generated module contains ctypes aliases for the GL types,
+    the enum constants, one callable for every command and ``__all__``.
+    Function pointers are not looked up at import time. By default every
+    command resolves its pointer on its first call and then replaces itself
+    in the module with the ctypes function. With ``lazy=False`` the module
+    instead contains a packed table of command names and prototypes and
+    ``load()`` resolves all of them in a single loop.
+
+    ``write_package()`` splits the bindings into a package with separate
+    modules for types, enums and commands. A manifest with a content hash
+    of every written ``Command``, ``Enum`` and ``GlType`` is stored next
+    to them and only the modules whose inputs changed are rewritten, so
+    the other files keep their bytes and modification times.
+
+    Example::
+
+        registry = RegistryReader.from_file('gl.xml').read()
+        profile = registry.get_profile('gl', 'core', '3.3')
+        CtypesWriter(registry, profile).write('gl33.py')
+
+        # Or as a package, rewriting only what changed
+        CtypesWriter(registry, profile).write_package('gl33')
+    """
+
+    #: Name of the manifest file written by ``write_package()``
+    MANIFEST = ".opengl-registry.json"
+
+    def __init__(self, registry: Registry, profile: Profile, *, lazy: bool = True):
+        """Initialize the writer.
+
+        Args:
+            registry (Registry): The registry the profile was resolved from
+            profile (Profile): The commands, enums and types to write
+        Keyword Args:
+            lazy (bool): Resolve each command on its first call instead of all commands in ``load()``
+        """
+        self._registry = registry
+        self._profile = profile
+        self._lazy = lazy
+
+    @property
+    def registry(self) -> Registry:
+        """Registry: The registry the profile was resolved from"""
+        return self._registry
+
+    @property
+    def profile(self) -> Profile:
+        """Profile: The commands, enums and types to write"""
+        return self._profile
+
+    @property
+    def lazy(self) -> bool:
+        """bool: Commands are resolved on their first call instead of in ``load()``"""
+        return self._lazy
+
+    def render(self) -> str:
+        """Render the module source.
+
+        Returns:
+            str: python source code
+        """
+        names = self._type_names()
+        names.extend(enum.name for enum in self._profile.enums)
+        names.extend(command.name for command in self._profile.commands)
+        names.append("load")
+
+        body = "".join([
+            "\n# Types\n",
+            self._render_types(),
+            "\n# Enums\n",
+            self._render_enums(),
+            "\n# Commands\n",
+            self._render_commands() if self._lazy else self._render_command_table(),
+            "\n",
+            self._render_all(names, bound_at_runtime=not self._lazy),
+        ])
+        return "".join([
+            self._render_doc(),
+            "import ctypes\n",
+            self._render_imports(body),
+            _FUNCTYPE,
+            _LAZY_LOADER if self._lazy else _BATCH_LOADER,
+            body,
+        ])
+
+    def write(self, path: str):
+        """Write the module.
+
+        Args:
+            path (str): Path to the python file
+        """
+        with open(path, "w", newline="\n") as fd:
+            fd.write(self.render())
+
+    def write_package(self, directory: str) -> List[str]:
+        """Write the bindings as a package, only rewriting the modules whose inputs changed.
+
+        The package contains ``types.py``, ``enums.py``, ``commands.py``
+        and an ``__init__.py`` importing all of them.
+
+        Args:
+            directory (str): The package directory. It's created if it doesn't exist.
+        Returns:
+            List[str]: Paths of the files that were written
+        """
+        os.makedirs(directory, exist_ok=True)
+        manifest_path = os.path.join(directory, self.MANIFEST)
+        manifest = self._read_manifest(manifest_path)
+
+        generator = self._generator_fingerprint()
+        if manifest.get("generator") != generator:
+            manifest = {}
+
+        entities = {
+            "types": {gltype.name: self._hash_type(gltype) for gltype in self._types()},
+            "enums": {enum.name: self._hash_enum(enum) for enum in self._profile.enums},
+            "commands": {command.name: self._hash_command(command) for command in self._profile.commands},
+        }
+        self._log_changes(manifest.get("entities", {}), entities)
+
+        written = []
+        files = {}
+        for name, kinds, render in self._package_files():
+            path = os.path.join(directory, name)
+            inputs = self._hash(generator, *(
+                "{}:{}={}".format(kind, *item) for kind in kinds for item in entities[kind].items()
+            ))
+            previous = manifest.get("files", {}).get(name, {})
+
+            # Skip rendering if the inputs are the same and the file wasn't touched
+            digest = self._file_digest(path)
+            if previous.get("inputs") == inputs and previous.get("output") == digest:
+                files[name] = previous
+                continue
+
+            data = render().encode()
+            files[name] = {"inputs": inputs, "output": hashlib.sha256(data).hexdigest()}
+            if files[name]["output"] != digest:
+                self._write(path, data)
+                written.append(path)
+
+        data = json.dumps({"generator": generator, "files": files, "entities": entities}, indent=1).encode()
+        if self._file_digest(manifest_path) != hashlib.sha256(data).hexdigest():
+            self._write(manifest_path, data)
+
+        return written
+
+    def _title(self) -> str:
+        """str: One line description of the module"""
+        parts = [self._profile.api, self._profile.version]
+        if self._profile.profile:
+            parts.append(self._profile.profile)
+        return "OpenGL bindings for {}".format(" ".join(parts))
+
+    def _render_doc(self) -> str:
+        """str: The docstring of the module or package"""
+        return _DOC.format(
+            title=self._title(),
+            version=opengl_registry.__version__,
+            resolve_doc=(
+                "Commands are resolved the first time they are called." if self._lazy else
+                "All commands are resolved by ``load()`` and are ``None`` until then."
+            ),
+        )
+
+    @staticmethod
+    def _render_imports(body: str) -> str:
+        """Render the ctypes import statement for the names used in the body.
+
+        Args:
+            body (str): The python source code using the imports
+        Returns:
+            str: python source code
+        """
+        names = ["POINTER", "c_char_p", "c_void_p"]
+        names.extend(sorted(set(re.findall(r"\bc_\w+", body)) - set(names)))
+        return "from ctypes import {}  # noqa: F401\n".format(", ".join(names))
+
+    def _package_files(self) -> List[Tuple[str, Tuple[str, ...], Callable[[], str]]]:
+        """The files in the package.
+
+        Returns:
+            List[Tuple[str, Tuple[str], Callable]]: file name, the kinds of entities
+            it's rendered from and its render function
+        """
+        return [
+            ("__init__.py", (), self._render_package_init),
+            ("types.py", ("types",), self._render_types_module),
+            ("enums.py", ("enums",), self._render_enums_module),
+            # The commands import the types they use
+            ("commands.py", ("types", "commands"), self._render_commands_module),
+        ]
+
+    def _render_package_init(self) -> str:
+        """str: The ``__init__.py`` of the package"""
+        return self._render_doc() + _PACKAGE_INIT
+
+    def _render_types_module(self) -> str:
+        """str: The ``types.py`` module of the package"""
+        body = self._render_types()
+        return "".join([
+            '"""{}: types"""\n'.format(self._title()),
+            self._render_imports(body),
+            "\n",
+            body,
+            "\n",
+            self._render_all(self._type_names()),
+        ])
+
+    def _render_enums_module(self) -> str:
+        """str: The ``enums.py`` module of the package"""
+        return "".join([
+            '"""{}: enums"""\n'.format(self._title()),
+            "\n",
+            self._render_enums(),
+            "\n",
+            self._render_all([enum.name for enum in self._profile.enums]),
+        ])
+
+    def _render_commands_module(self) -> str:
+        """str: The ``commands.py`` module of the package"""
+        body = self._render_commands() if self._lazy else self._render_command_table()
+        names = [command.name for command in self._profile.commands]
+        names.append("load")
+        return "".join([
+            '"""{}: commands"""\n'.format(self._title()),
+            "import ctypes\n",
+            self._render_imports(body),
+            "\n",
+            self._render_type_imports(body),
+            _FUNCTYPE,
+            _LAZY_LOADER if self._lazy else _BATCH_LOADER,
+            "\n",
+            body,
+            "\n",
+            self._render_all(names, bound_at_runtime=not self._lazy),
+        ])
+
+    def _render_type_imports(self, body: str) -> str:
+        """Render the import statement for the types module of the package.
+
+        Args:
+            body (str): The python source code using the types
+        Returns:
+            str: python source code
+        """
+        used = set(re.findall(r"\bGL\w+", body))
+        names = [name for name in self._type_names() if name in used]
+        if not names:
+            return ""
+        return "from .types import {}\n".format(", ".join(names))
+
+    def _render_types(self) -> str:
+        """Render ctypes aliases for the types used by the profile.
+
+        Returns:
+            str: python source code
+        """
+        lines = []
+        for gltype in self._types():
+            ctype = self._type_alias(gltype)
+            if ctype is not None:
+                lines.append("{} = {}\n".format(gltype.name, ctype))
+        return "".join(lines)
+
+    def _render_enums(self) -> str:
+        """Render the enum constants of the profile.
+
+        Returns:
+            str: python source code
+        """
+        return "".join("{} = {}\n".format(enum.name, enum.value) for enum in self._profile.enums)
+
+    def _render_commands(self) -> str:
+        """Render a lazily resolved callable for every command in the profile.
+
+        Returns:
+            str: python source code
+        """
+        lines = []
+        for command in self._profile.commands:
+            signature = [self._return_type(command)] + [self._param_type(param) for param in command.params]
+            lines.append('{} = _Command("{}", {})\n'.format(command.name, command.name, ", ".join(signature)))
+        return "".join(lines)
+
+    def _render_command_table(self) -> str:
+        """Render the packed name and prototype tables resolved by ``load()``.
+
+        Commands sharing a signature share the same prototype.
+
+        Returns:
+            str: python source code
+        """
+        prototypes = {}
+        signatures = []
+        for command in self._profile.commands:
+            signature = ", ".join([self._return_type(command)] + [self._param_type(param) for param in command.params])
+            signatures.append(prototypes.setdefault(signature, len(prototypes)))
+
+        return "".join([
+            '_names = """\n',
+            "".join("{}\n".format(command.name) for command in self._profile.commands),
+            '""".split()\n',
+            "_prototypes = (\n",
+            "".join("    _FUNCTYPE({}),\n".format(signature) for signature in prototypes),
+            ")\n",
+            "_signatures = (\n",
+            textwrap.fill(
+                ", ".join(str(index) for index in signatures) + ",",
+                width=100,
+                initial_indent="    ",
+                subsequent_indent="    ",
+            ),
+            "\n)\n",
+            "_functions = [None] * len(_names)\n",
+            "globals().update(zip(_names, _functions))\n",
+        ])
+
+    @staticmethod
+    def _render_all(names: List[str], bound_at_runtime: bool = False) -> str:
+        """Render an ``__all__`` statement.
+
+        Args:
+            names (List[str]): The public names
+            bound_at_runtime (bool): Some of the names are not assigned by a statement in the module
+        Returns:
+            str: python source code
+        """
+        noqa = "  # noqa: F822" if bound_at_runtime else ""
+        return "__all__ = [{}\n{}]\n".format(noqa, "".join('    "{}",\n'.format(name) for name in names))
+
+    def _type_names(self) -> List[str]:
+        """List[str]: Names of the types aliased in the module"""
+        return [gltype.name for gltype in self._types() if self._type_alias(gltype) is not None]
+
+    def _types(self) -> List[GlType]:
+        """The types required by the profile and used by its commands in dependency order.
+
+        Returns:
+            List[GlType]: list of types
+        """
+        return self._registry.get_required_types(
+            (gltype.name for gltype in self._profile.types), self._profile.commands,
+        )
+
+    def _type_alias(self, gltype: GlType) -> Optional[str]:
+        """The ctypes expression for a GL type.
+
+        Args:
+            gltype (GlType): The type
+        Returns:
+            str: ctypes expression or ``None`` if the type is not a typedef
+        """
+        text = gltype.text or ""
+        if not re.match(r"^[A-Za-z_]\w*$", gltype.name or ""):
+            return None
+        if "#ifdef" in text:
+            # GLhandleARB is a void pointer on Apple and an unsigned int everywhere else
+            return "c_uint"
+        if not text.startswith("typedef"):
+            return None
+        if "(" in text:
+            # Function pointers are passed around as plain pointers
+            return "c_void_p"
+
+        decl = text[len("typedef"):text.rindex(gltype.name)]
+        return self._ctype(decl)
+
+    def _ctype(self, decl: str) -> str:
+        """Convert a C type declaration to a ctypes expression.
+
+        Args:
+            decl (str): C declaration without a name. For example ``const GLchar *``
+        Returns:
+            str: ctypes expression. For example ``c_char_p``
+        """
+        pointers = decl.count("*") + decl.count("[")
+        base = re.sub(r"\bconst\b|\bstruct\b|\*|\[\d*\]", " ", decl)
+        base = " ".join(base.split())
+
+        if base.startswith("_") or base.startswith("__"):
+            # Opaque structs
+            return "c_void_p"
+
+        ctype = C_TYPES.get(base, base)
+        if pointers == 0:
+            return ctype
+        if ctype == "None":
+            ctype = "c_void_p"
+            pointers -= 1
+        elif pointers == 1 and ctype in ("GLchar", "GLcharARB", "c_char"):
+            return "c_char_p"
+
+        for _ in range(pointers):
+            ctype = "POINTER({})".format(ctype)
+        return ctype
+
+    def _return_type(self, command: Command) -> str:
+        """str: ctypes expression for the return type of a command"""
+        return self._ctype(self._return_decl(command))
+
+    def _param_type(self, param) -> str:
+        """str: ctypes expression for the type of a command parameter"""
+        return self._ctype(self._param_decl(param))
+
+    @staticmethod
+    def _return_decl(command: Command) -> str:
+        """str: C declaration of the return type of a command"""
+        proto = command.proto or "void"
+        return proto[:proto.rindex(command.name)] if command.name in proto else proto
+
+    @staticmethod
+    def _param_decl(param) -> str:
+        """str: C declaration of the type of a command parameter including array brackets"""
+        value = param.value or ""
+        index = value.rindex(param.name)
+        return value[:index] + value[index + len(param.name):]
+
+    def _generator_fingerprint(self) -> str:
+        """Hash of everything besides the entities affecting the output.
+
+        Changing the package version, the writer options, the
+        profile or the writer source invalidates the whole manifest.
+        """
+        parts = [opengl_registry.__version__, str(self._lazy), self._title()]
+        try:
+            with open(inspect.getsourcefile(type(self)), "rb") as fd:
+                parts.append(hashlib.sha256(fd.read()).hexdigest())
+        except (OSError, TypeError):
+            pass
+        return self._hash(*parts)
+
+    @classmethod
+    def _hash_command(cls, command: Command) -> str:
+        """str: Content hash of a command"""
+        return cls._hash(command.name, command.proto, *(param.value for param in command.params))[:16]
+
+    @classmethod
+    def _hash_enum(cls, enum: Enum) -> str:
+        """str: Content hash of an enum"""
+        return cls._hash(enum.name, enum.value)[:16]
+
+    @classmethod
+    def _hash_type(cls, gltype: GlType) -> str:
+        """str: Content hash of a type"""
+        return cls._hash(gltype.name, gltype.text)[:16]
+
+    @staticmethod
+    def _hash(*values: Optional[str]) -> str:
+        return hashlib.sha256("\0".join(value or "" for value in values).encode()).hexdigest()
+
+    @staticmethod
+    def _log_changes(old: Dict[str, Dict[str, str]], new: Dict[str, Dict[str, str]]):
+        """Log the number of added, changed and removed entities of every kind"""
+        for kind, entities in new.items():
+            previous = old.get(kind, {})
+            added = entities.keys() - previous.keys()
+            removed = previous.keys() - entities.keys()
+            changed = [name for name in entities.keys() & previous.keys() if entities[name] != previous[name]]
+            logger.info("%s: %s added, %s changed, %s removed", kind, len(added), len(changed), len(removed))
+
+    @staticmethod
+    def _read_manifest(path: str) -> dict:
+        try:
+            with open(path, "rb") as fd:
+                manifest = json.loads(fd.read().decode())
+        except (OSError, ValueError):
+            return {}
+        return manifest if isinstance(manifest, dict) else {}
+
+    @staticmethod
+    def _file_digest(path: str) -> Optional[str]:
+        try:
+            with open(path, "rb") as fd:
+                return hashlib.sha256(fd.read()).hexdigest()
+        except OSError:
+            return None
+
+    @staticmethod
+    def _write(path: str, data: bytes):
+        tmp_path = "{}.{}.tmp".format(path, os.getpid())
+        with open(tmp_path, "wb") as fd:
+            fd.write(data)
+        os.replace(tmp_path, path)
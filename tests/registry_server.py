@@ -0,0 +1,120 @@
+"""
+A local http server for the registry fixture.
+
+Used by the download tests and the download benchmarks so both
+exercise the same conditional request handling.
+
+Example::
+
+    with RegistryServer(delay=0.2) as server:
+        RegistryReader.from_url(server.url('gl.xml')).read()
+"""
+import os
+import socketserver
+import threading
+import time
+from http.server import BaseHTTPRequestHandler, HTTPServer
+
+REGISTRY_PATH = os.path.join(os.path.dirname(__file__), 'fixtures', 'gl.xml')
+
+
+class ThreadingHTTPServer(socketserver.ThreadingMixIn, HTTPServer):
+    """http.server.ThreadingHTTPServer is only available in python 3.7+"""
+    daemon_threads = True
+
+
+class RegistryHandler(BaseHTTPRequestHandler):
+    """Serves the registry of the ``RegistryServer`` it belongs to"""
+
+    def do_GET(self):
+        registry = self.server.registry
+        with registry.lock:
+            registry.active += 1
+            registry.max_active = max(registry.max_active, registry.active)
+        try:
+            time.sleep(registry.delays.get(self.path, registry.delay))
+            if registry.etag is not None and self.headers.get('If-None-Match') == registry.etag:
+                registry.record(304)
+                self.send_response(304)
+                self.end_headers()
+                return
+
+            registry.record(200)
+            self.send_response(200)
+            if registry.etag is not None:
+                self.send_header('ETag', registry.etag)
+            self.send_header('Content-Length', str(len(registry.data)))
+            self.end_headers()
+            registry.write(self.wfile)
+        finally:
+            with registry.lock:
+                registry.active -= 1
+
+    def log_message(self, *args):
+        pass
+
+
+class RegistryServer:
+    """Serves a registry file on every path in a background thread.
+
+    Answers with the ``ETag`` and with ``304 Not Modified`` when the
+    request has a matching ``If-None-Match`` header. Records the status
+    codes sent and the largest number of requests served at once.
+    """
+
+    def __init__(self, path: str = REGISTRY_PATH, etag: str = '"registry-1"', delay: float = 0.0,
+                 delays: dict = None, bandwidth: float = None, chunk_size: int = 16 * 1024):
+        """
+        Args:
+            path (str): The registry file to serve
+            etag (str): The ETag of the file. ``None`` to serve it without an ETag.
+            delay (float): Seconds to wait before answering, like the latency of a remote server
+            delays (dict): Other delays for some url paths. For example ``{'/hang.xml': 5}``
+            bandwidth (float): Limit the bandwidth to this many MB/s
+            chunk_size (int): The size of the chunks the file is sent in
+        """
+        with open(path, 'rb') as fd:
+            self.data = fd.read()
+        self.etag = etag
+        self.delay = delay
+        self.delays = delays or {}
+        self.bandwidth = bandwidth
+        self.chunk_size = chunk_size
+
+        self.lock = threading.Lock()
+        self.status_codes = []
+        self.active = 0
+        self.max_active = 0
+
+        self._server = ThreadingHTTPServer(('127.0.0.1', 0), RegistryHandler)
+        self._server.registry = self
+        threading.Thread(target=self._server.serve_forever, daemon=True).start()
+
+    def url(self, name: str = 'gl.xml') -> str:
+        """str: The url of a file on the server. Every file is the registry"""
+        return 'http://127.0.0.1:{}/{}'.format(self._server.server_port, name)
+
+    def record(self, status_code: int):
+        with self.lock:
+            self.status_codes.append(status_code)
+
+    def write(self, wfile):
+        """Write the registry to a response at the configured bandwidth"""
+        if self.bandwidth is None:
+            wfile.write(self.data)
+            return
+
+        delay = self.chunk_size / (self.bandwidth * 1024 * 1024)
+        for pos in range(0, len(self.data), self.chunk_size):
+            wfile.write(self.data[pos:pos + self.chunk_size])
+            time.sleep(delay)
+
+    def close(self):
+        self._server.shutdown()
+        self._server.server_close()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *args):
+        self.close()
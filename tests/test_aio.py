@@ -0,0 +1,90 @@
+import asyncio
+import tempfile
+from unittest import TestCase
+
+import requests
+
+from opengl_registry import RegistryReader
+from opengl_registry.aio import AsyncDownloader
+from opengl_registry.download import HttpCache
+from registry_server import REGISTRY_PATH, RegistryServer
+
+
+def run(coroutine):
+    """Run a coroutine in a new event loop like asyncio.run in python 3.7+"""
+    loop = asyncio.new_event_loop()
+    try:
+        return loop.run_until_complete(coroutine)
+    finally:
+        loop.close()
+
+
+class AsyncDownloadTestCase(TestCase):
+
+    @classmethod
+    def setUpClass(cls):
+        with open(REGISTRY_PATH, 'rb') as fd:
+            cls.data = fd.read()
+
+    def setUp(self):
+        # Slow enough that concurrent requests overlap
+        self.server = RegistryServer(delay=0.2, delays={'/hang.xml': 5})
+        self.addCleanup(self.server.close)
+        self.base_url = self.server.url('')
+
+    def urls(self, count):
+        return [self.base_url + 'gl{}.xml'.format(i) for i in range(count)]
+
+    def test_fetch_all(self):
+        async def fetch():
+            async with AsyncDownloader(max_connections=4) as downloader:
+                return await downloader.fetch_all(self.urls(4))
+
+        self.assertEqual(run(fetch()), [self.data] * 4)
+        # All four requests were served at the same time
+        self.assertEqual(self.server.max_active, 4)
+
+    def test_connection_limit(self):
+        async def fetch():
+            async with AsyncDownloader(max_connections=2) as downloader:
+                return await downloader.fetch_all(self.urls(5))
+
+        self.assertEqual(len(run(fetch())), 5)
+        self.assertEqual(self.server.max_active, 2)
+
+    def test_timeout(self):
+        async def fetch():
+            async with AsyncDownloader(timeout=0.5) as downloader:
+                return await downloader.fetch(self.base_url + 'hang.xml')
+
+        with self.assertRaises(requests.Timeout):
+            run(fetch())
+
+    def test_http_cache(self):
+        async def fetch(http_cache):
+            async with AsyncDownloader(http_cache=http_cache) as downloader:
+                return await downloader.fetch(self.base_url + 'gl.xml')
+
+        with tempfile.TemporaryDirectory() as directory:
+            http_cache = HttpCache(directory)
+            self.assertEqual(run(fetch(http_cache)), self.data)
+            self.assertEqual(run(fetch(http_cache)), self.data)
+        self.assertEqual(self.server.status_codes, [200, 304])
+
+    def test_readers(self):
+        async def read():
+            readers = await RegistryReader.fetch_all(self.urls(2))
+            reader = await RegistryReader.from_url_async(self.base_url + 'gl.xml')
+            readers.append(reader)
+            return [await reader.read_async() for reader in readers]
+
+        registries = run(read())
+        self.assertEqual(len(registries), 3)
+        for registry in registries:
+            self.assertEqual(registry.get_enum('GL_TEXTURE_2D').value, '0x0DE1')
+
+    def test_revision_url(self):
+        self.assertEqual(
+            RegistryReader.revision_url('abc123', 'egl.xml'),
+            'https://raw.githubusercontent.com/KhronosGroup/OpenGL-Registry/abc123/xml/egl.xml',
+        )
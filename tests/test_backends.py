@@ -0,0 +1,137 @@
+import os
+from io import BytesIO
+from unittest import TestCase
+
+from opengl_registry import RegistryReader
+from opengl_registry.backends import ElementTreeBackend, ExpatBackend, ParserBackend
+from opengl_registry.commands import Command, CommandParam
+from opengl_registry.enums import Enum
+from opengl_registry.stats import ReadStats
+
+
+def describe(registry):
+    """Every field read from the registry in document order"""
+    return {
+        'types': [(t.name, t.text, t.comment, t.requires) for t in registry.types],
+        'groups': sorted((g.name, sorted(g.entires)) for g in registry.groups.values()),
+        'enums': [
+            (e.namespace, e.group_name, e.type, e.comment, e.vendor, e.start, e.end,
+             [(x.name, x.value, x.comment, x.alias) for x in e.entires])
+            for e in registry.enums
+        ],
+        'namespace': registry.commands.namespace,
+        'commands': [
+            (c.name, c.proto, c.glx, c.alias, [(p.name, p.value, p.ptype, p.group_name, p.length) for p in c.params])
+            for c in registry.commands.entries
+        ],
+        'features': [
+            (f.api, f.name, f.number, [(d.mode, d.profile, d.api, d.comment, d.enums, d.commands, d.types)
+                                       for d in f.require + f.remove])
+            for f in registry.features
+        ],
+        'extensions': [
+            (e.name, e.supported, e.comment, [(d.mode, d.profile, d.api, d.comment, d.enums, d.commands, d.types)
+                                              for d in e.require + e.remove])
+            for e in registry.extensions
+        ],
+    }
+
+
+class BackendTestCase(TestCase):
+    registry_path = os.path.join(os.path.dirname(__file__), 'fixtures', 'gl.xml')
+
+    @classmethod
+    def setUpClass(cls):
+        cls.expected = describe(RegistryReader.from_file(cls.registry_path).read())
+
+    def test_default(self):
+        self.assertIsInstance(RegistryReader.from_file(self.registry_path).backend, ElementTreeBackend)
+        self.assertIsInstance(RegistryReader.from_file(self.registry_path, stream=True).backend, ElementTreeBackend)
+
+    def test_expat(self):
+        reader = RegistryReader.from_file(self.registry_path, backend=ExpatBackend())
+        self.assertIsInstance(reader.backend, ExpatBackend)
+        actual = describe(reader.read())
+        for section, expected in self.expected.items():
+            self.assertEqual(actual[section], expected, msg=section)
+
+    def test_expat_file_object(self):
+        with open(self.registry_path, 'rb') as fd:
+            reader = RegistryReader(source=BytesIO(fd.read()), backend=ExpatBackend())
+        self.assertEqual(describe(reader.read()), self.expected)
+        # File objects can be read again
+        self.assertEqual(len(reader.read_commands().entries), len(self.expected['commands']))
+
+    def test_expat_read_sections(self):
+        reader = RegistryReader.from_file(self.registry_path, backend=ExpatBackend())
+        self.assertEqual([t.name for t in reader.read_types()], [t[0] for t in self.expected['types']])
+        self.assertEqual(len(reader.read_groups()), len(self.expected['groups']))
+        self.assertEqual(len(reader.read_enums()), len(self.expected['enums']))
+        commands = reader.read_commands()
+        self.assertEqual(commands.namespace, 'GL')
+        self.assertEqual([c.name for c in commands.entries], [c[0] for c in self.expected['commands']])
+        self.assertEqual([f.name for f in reader.read_features()], [f[1] for f in self.expected['features']])
+        self.assertEqual(len(reader.read_extensions()), len(self.expected['extensions']))
+
+    def test_expat_lazy(self):
+        registry = RegistryReader.from_file(self.registry_path, backend=ExpatBackend()).read(lazy=True)
+        self.assertIsNone(registry._enums)
+        self.assertEqual(describe(registry), self.expected)
+
+    def test_expat_custom_classes(self):
+        class CustomEnum(Enum):
+            pass
+
+        class CustomCommand(Command):
+            def __init__(self, *args, **kwargs):
+                super().__init__(*args, **kwargs)
+                self.extra = 'extra'
+
+        class CustomParam(CommandParam):
+            pass
+
+        class CustomReader(RegistryReader):
+            enum_cls = CustomEnum
+            command_cls = CustomCommand
+            command_param_cls = CustomParam
+
+        registry = CustomReader.from_file(self.registry_path, backend=ExpatBackend()).read()
+        self.assertIsInstance(registry.enums[0].entires[0], CustomEnum)
+        self.assertIsInstance(registry.commands.entries[0], CustomCommand)
+        self.assertIsInstance(registry.commands.entries[0].params[0], CustomParam)
+        self.assertEqual(registry.commands.entries[0].extra, 'extra')
+
+    def test_expat_stats(self):
+        stats = ReadStats()
+        RegistryReader.from_file(self.registry_path, stats=stats, backend=ExpatBackend()).read()
+        self.assertEqual(list(stats.phases), ['walk', 'link'])
+
+    def test_expat_shared_strings(self):
+        registry = RegistryReader.from_file(self.registry_path).read()
+        other = RegistryReader.from_file(self.registry_path, backend=ExpatBackend()).read()
+        self.assertIs(other.get_command('glDrawArrays').name, registry.get_command('glDrawArrays').name)
+        self.assertIs(other.get_feature('gl', '1.1').api, registry.get_feature('gl', '1.1').api)
+
+    def test_custom_backend(self):
+        class CountingBackend(ElementTreeBackend):
+            def __init__(self):
+                self.chunks = 0
+
+            def parse(self, reader, chunks, names, sections):
+                def count():
+                    for chunk in chunks:
+                        self.chunks += 1
+                        yield chunk
+                return super().parse(reader, count(), names, sections)
+
+        backend = CountingBackend()
+        registry = RegistryReader.from_file(self.registry_path, backend=backend).read()
+        self.assertGreater(backend.chunks, 1)
+        self.assertEqual(describe(registry), self.expected)
+
+    def test_not_implemented(self):
+        class IncompleteBackend(ParserBackend):
+            pass
+
+        with self.assertRaises(TypeError):
+            IncompleteBackend()
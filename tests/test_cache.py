@@ -0,0 +1,77 @@
+import os
+import tempfile
+from unittest import TestCase, mock
+
+import opengl_registry
+from opengl_registry import RegistryReader
+from opengl_registry.cache import RegistryCache
+from opengl_registry.enums import Enum
+
+
+class CustomEnum(Enum):
+    pass
+
+
+class CustomReader(RegistryReader):
+    enum_cls = CustomEnum
+
+
+class CacheTestCase(TestCase):
+    registry_path = os.path.join(os.path.dirname(__file__), 'fixtures', 'gl.xml')
+
+    def setUp(self):
+        self.tmp = tempfile.TemporaryDirectory()
+        self.addCleanup(self.tmp.cleanup)
+
+    def test_warm_load(self):
+        cache = RegistryCache(self.tmp.name)
+        registry = cache.load(self.registry_path)
+        self.assertEqual(len(os.listdir(self.tmp.name)), 1)
+
+        with mock.patch.object(cache._reader_cls, 'read', side_effect=AssertionError('parsed')):
+            cached = cache.load(self.registry_path)
+
+        self.assertEqual(len(cached.commands.entries), len(registry.commands.entries))
+        self.assertEqual(len(cached.enums), len(registry.enums))
+        self.assertEqual(len(cached.groups), len(registry.groups))
+
+    def assert_reparsed(self, cache):
+        """Load the fixture and check it's a cache miss parsing the registry again"""
+        entries = len(os.listdir(self.tmp.name))
+        with mock.patch.object(RegistryReader, 'read', autospec=True, side_effect=RegistryReader.read) as read:
+            registry = cache.load(self.registry_path)
+        self.assertEqual(read.call_count, 1)
+        self.assertEqual(len(os.listdir(self.tmp.name)), entries + 1)
+        self.assertGreater(len(registry.commands.entries), 3000)
+
+    def test_version_invalidates(self):
+        RegistryCache(self.tmp.name).load(self.registry_path)
+        with mock.patch.object(opengl_registry, '__version__', '999.0.0'):
+            self.assert_reparsed(RegistryCache(self.tmp.name))
+
+    def test_fingerprint_invalidates(self):
+        RegistryCache(self.tmp.name).load(self.registry_path)
+
+        # The source of the reader modules changed
+        with mock.patch.object(RegistryCache, '_reader_fingerprint', return_value=b'changed'):
+            self.assert_reparsed(RegistryCache(self.tmp.name))
+
+        # Another class is instantiated by the reader
+        self.assert_reparsed(RegistryCache(self.tmp.name, reader_cls=CustomReader))
+
+    def test_eviction(self):
+        cache = RegistryCache(self.tmp.name, max_size=1)
+        cache.load(self.registry_path)
+        self.assertEqual(os.listdir(self.tmp.name), [])
+
+    def test_corrupt_entry(self):
+        cache = RegistryCache(self.tmp.name)
+        with open(self.registry_path, 'rb') as fd:
+            data = fd.read()
+
+        key = cache.key(data)
+        with open(os.path.join(self.tmp.name, key + cache.SUFFIX), 'wb') as fd:
+            fd.write(b'garbage')
+
+        self.assertIsNone(cache.get(key))
+        self.assertIsNotNone(cache.load_bytes(data))
@@ -0,0 +1,105 @@
+import contextlib
+import io
+import json
+import os
+import tempfile
+from io import BytesIO
+from unittest import TestCase
+
+from opengl_registry import RegistryReader
+from opengl_registry.cli import diff, parse_args
+
+
+class DiffTestCase(TestCase):
+    registry_path = os.path.join(os.path.dirname(__file__), 'fixtures', 'gl.xml')
+
+    @classmethod
+    def setUpClass(cls):
+        with open(cls.registry_path, 'rb') as fd:
+            cls.data = fd.read()
+
+        data = cls.data
+        data = data.replace(
+            b'<enum value="0x0DE0" name="GL_TEXTURE_1D"/>',
+            b'<enum value="0x9999" name="GL_NEW_ENUM"/>',
+        )
+        data = data.replace(b'value="0x0DE1" name="GL_TEXTURE_2D"', b'value="0x0DE2" name="GL_TEXTURE_2D"')
+        data = data.replace(b'"GL_TEXTURE_3D"', b'"GL_TEXTURE_3D_NEW"')
+        data = data.replace(b'<proto>void <name>glFlush</name>', b'<proto>GLboolean <name>glFlush</name>')
+        cls.new_data = data
+
+        cls.old = RegistryReader(source=BytesIO(cls.data)).read()
+        cls.new = RegistryReader(source=BytesIO(cls.new_data)).read()
+        cls.diff = cls.old.diff(cls.new)
+
+    def test_equal(self):
+        diff = self.old.diff(RegistryReader(source=BytesIO(self.data)).read())
+        self.assertTrue(diff.empty)
+        self.assertEqual(diff.to_text(), 'No changes')
+        self.assertFalse(self.diff.empty)
+
+    def test_enums(self):
+        enums = self.diff.enums
+        self.assertEqual(enums['added'], ['GL_NEW_ENUM'])
+        self.assertEqual(enums['removed'], ['GL_TEXTURE_1D'])
+        self.assertEqual(enums['renamed'], [['GL_TEXTURE_3D', 'GL_TEXTURE_3D_NEW']])
+        self.assertEqual(enums['changed'], {'GL_TEXTURE_2D': {'value': {'old': '0x0DE1', 'new': '0x0DE2'}}})
+
+    def test_commands(self):
+        commands = self.diff.commands
+        self.assertEqual(commands['added'], [])
+        self.assertEqual(commands['removed'], [])
+        self.assertEqual(
+            commands['changed'],
+            {'glFlush': {'proto': {'old': 'void glFlush', 'new': 'GLboolean glFlush'}}},
+        )
+        self.assertEqual(self.diff.types['changed'], {})
+
+    def test_features(self):
+        changed = self.diff.features['changed']
+        self.assertEqual(changed['GL_VERSION_1_2'], {
+            'require_enums': {'added': ['GL_TEXTURE_3D_NEW'], 'removed': ['GL_TEXTURE_3D']},
+        })
+        # Only the definition of GL_TEXTURE_1D was removed
+        self.assertNotIn('GL_VERSION_1_0', changed)
+        self.assertIn('GL_EXT_sparse_texture', self.diff.extensions['changed'])
+
+    def test_json(self):
+        data = json.loads(self.diff.to_json())
+        self.assertEqual(list(data), ['types', 'enums', 'commands', 'features', 'extensions'])
+        self.assertEqual(data['enums']['added'], ['GL_NEW_ENUM'])
+
+    def test_text(self):
+        text = self.diff.to_text()
+        self.assertIn('enums: 1 added, 1 removed, 1 renamed, 1 changed', text)
+        self.assertIn('  + GL_NEW_ENUM', text)
+        self.assertIn('  - GL_TEXTURE_1D', text)
+        self.assertIn('  > GL_TEXTURE_3D -> GL_TEXTURE_3D_NEW', text)
+        self.assertIn("      proto: 'void glFlush' -> 'GLboolean glFlush'", text)
+
+    def test_cli(self):
+        with tempfile.TemporaryDirectory() as directory:
+            path = os.path.join(directory, 'gl.xml')
+            with open(path, 'wb') as fd:
+                fd.write(self.new_data)
+
+            output = io.StringIO()
+            with contextlib.redirect_stdout(output):
+                diff(parse_args(['diff', self.registry_path, path, '--json']))
+
+        self.assertEqual(json.loads(output.getvalue()), json.loads(self.diff.to_json()))
+
+    def test_cli_cache(self):
+        values = parse_args(['--cache', 'diff', 'old.xml', 'new.xml'])
+        self.assertEqual((values.command, values.cache, values.cache_dir), ('diff', True, None))
+        values = parse_args(['diff', '--cache', 'old.xml', 'new.xml'])
+        self.assertEqual((values.command, values.cache, values.cache_dir), ('diff', True, None))
+        values = parse_args(['--cache-dir', 'cache', 'diff', 'old.xml', 'new.xml'])
+        self.assertEqual((values.command, values.cache_dir), ('diff', 'cache'))
+
+        with tempfile.TemporaryDirectory() as directory:
+            output = io.StringIO()
+            with contextlib.redirect_stdout(output):
+                diff(parse_args(['diff', '--cache-dir', directory, self.registry_path, self.registry_path]))
+            self.assertTrue(os.listdir(directory))
+        self.assertTrue(output.getvalue())
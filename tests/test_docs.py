@@ -60,3 +60,91 @@ class DocTestCase(unittest.TestCase):
             classname='RegistryReader',
             ignore=[],
         )
+
+    def test_opengl_registry_registry(self):
+        self.validate(
+            'registry.rst',
+            'opengl_registry.registry',
+            classname='Registry',
+            ignore=[],
+        )
+
+    def test_opengl_registry_profile(self):
+        self.validate(
+            'profile.rst',
+            'opengl_registry.profile',
+            classname='Profile',
+            ignore=[],
+        )
+
+    def test_opengl_registry_cache(self):
+        self.validate(
+            'cache.rst',
+            'opengl_registry.cache',
+            classname='RegistryCache',
+            ignore=[],
+        )
+
+    def test_opengl_registry_download(self):
+        self.validate(
+            'download.rst',
+            'opengl_registry.download',
+            classname='HttpCache',
+            ignore=[],
+        )
+
+    def test_opengl_registry_writer(self):
+        self.validate(
+            'writer.rst',
+            'opengl_registry.writer',
+            classname='CtypesWriter',
+            ignore=[],
+        )
+
+    def test_opengl_registry_diff(self):
+        self.validate(
+            'diff.rst',
+            'opengl_registry.diff',
+            classname='RegistryDiff',
+            ignore=[],
+        )
+
+    def test_opengl_registry_filter(self):
+        self.validate(
+            'filter.rst',
+            'opengl_registry.filter',
+            classname='RegistryFilter',
+            ignore=[],
+        )
+
+    def test_opengl_registry_stats(self):
+        self.validate(
+            'stats.rst',
+            'opengl_registry.stats',
+            classname='ReadStats',
+            ignore=[],
+        )
+
+    def test_opengl_registry_registryset(self):
+        self.validate(
+            'registryset.rst',
+            'opengl_registry.registryset',
+            classname='RegistrySet',
+            ignore=[],
+        )
+
+    def test_opengl_registry_aio(self):
+        self.validate(
+            'aio.rst',
+            'opengl_registry.aio',
+            classname='AsyncDownloader',
+            ignore=[],
+        )
+
+    def test_opengl_registry_backends(self):
+        self.validate(
+            'backends.rst',
+            'opengl_registry.backends',
+            classname='ExpatBackend',
+            ignore=['__init__'],
+        )
@@ -0,0 +1,73 @@
+import os
+import tempfile
+from unittest import TestCase
+
+from opengl_registry import RegistryReader
+from opengl_registry.backends import ExpatBackend
+from opengl_registry.cache import RegistryCache
+from opengl_registry.download import HttpCache
+from registry_server import REGISTRY_PATH, RegistryServer
+
+
+class HttpCacheTestCase(TestCase):
+
+    def setUp(self):
+        self.server = RegistryServer()
+        self.addCleanup(self.server.close)
+        self.url = self.server.url('gl.xml')
+
+        self.tmp = tempfile.TemporaryDirectory()
+        self.addCleanup(self.tmp.cleanup)
+
+    def test_conditional_fetch(self):
+        http_cache = HttpCache(self.tmp.name)
+        first = http_cache.fetch(self.url)
+        second = http_cache.fetch(self.url)
+        self.assertEqual(first, second)
+        self.assertEqual(self.server.status_codes, [200, 304])
+
+    def test_changed_on_server(self):
+        http_cache = HttpCache(self.tmp.name)
+        http_cache.fetch(self.url)
+        self.server.etag = '"registry-2"'
+        http_cache.fetch(self.url)
+        self.assertEqual(self.server.status_codes, [200, 200])
+
+    def test_from_url(self):
+        http_cache = HttpCache(self.tmp.name)
+        registry = RegistryReader.from_url(self.url, http_cache=http_cache).read()
+        streamed = RegistryReader.from_url(self.url, stream=True, http_cache=http_cache).read()
+        self.assertEqual(len(registry.commands.entries), len(streamed.commands.entries))
+        self.assertEqual(self.server.status_codes, [200, 304])
+
+    def test_stream_from_url(self):
+        reader = RegistryReader.from_url(self.url, stream=True)
+        registry = reader.read()
+        expected = RegistryReader.from_file(REGISTRY_PATH).read()
+        self.assertEqual(
+            [c.name for c in registry.commands.entries],
+            [c.name for c in expected.commands.entries],
+        )
+        self.assertEqual(len(registry.enums), len(expected.enums))
+        with self.assertRaises(RuntimeError):
+            reader.read()
+
+    def test_expat_from_url(self):
+        reader = RegistryReader.from_url(self.url, backend=ExpatBackend())
+        registry = reader.read()
+        expected = RegistryReader.from_file(REGISTRY_PATH).read()
+        self.assertEqual(
+            [c.name for c in registry.commands.entries],
+            [c.name for c in expected.commands.entries],
+        )
+        # The response is parsed while it downloads
+        with self.assertRaises(RuntimeError):
+            reader.read()
+
+    def test_registry_cache(self):
+        cache = RegistryCache(self.tmp.name)
+        http_cache = HttpCache(os.path.join(self.tmp.name, 'http'))
+        cache.load_url(self.url, http_cache=http_cache)
+        registry = cache.load_url(self.url, http_cache=http_cache)
+        self.assertGreater(len(registry.commands.entries), 3000)
+        self.assertEqual(self.server.status_codes, [200, 304])
@@ -0,0 +1,99 @@
+import os
+from io import BytesIO
+from unittest import TestCase
+
+from opengl_registry import RegistryReader
+from opengl_registry.filter import RegistryFilter
+
+
+class RegistryFilterTestCase(TestCase):
+    registry_path = os.path.join(os.path.dirname(__file__), 'fixtures', 'gl.xml')
+
+    @classmethod
+    def setUpClass(cls):
+        with open(cls.registry_path, 'rb') as fd:
+            cls.data = fd.read()
+        cls.registry = RegistryReader(source=BytesIO(cls.data)).read()
+
+    def read(self, filter, stream=False):
+        if stream:
+            return RegistryReader(source=BytesIO(self.data)).read(filter=filter)
+        return RegistryReader.from_file(self.registry_path).read(filter=filter)
+
+    def assertSameProfile(self, registry, api, profile, version, extensions=None):
+        expected = self.registry.get_profile(api, profile, version, extensions=extensions)
+        result = registry.get_profile(api, profile, version, extensions=extensions)
+        self.assertEqual([c.name for c in result.commands], [c.name for c in expected.commands])
+        self.assertEqual([e.name for e in result.enums], [e.name for e in expected.enums])
+        self.assertEqual([t.name for t in result.types], [t.name for t in expected.types])
+
+    def test_gles(self):
+        extensions = ['GL_EXT_texture_filter_anisotropic', 'GL_KHR_debug']
+        gles = RegistryFilter('gles2', version='3.2', extensions=extensions)
+        for stream in (False, True):
+            registry = self.read(gles, stream=stream)
+            self.assertEqual([f.api for f in registry.features], ['gles2'] * 4)
+            self.assertEqual([e.name for e in registry.extensions], extensions)
+            self.assertLess(len(registry.commands.entries), len(self.registry.commands.entries) / 5)
+            self.assertEqual(registry.commands.namespace, 'GL')
+            self.assertIsNotNone(registry.get_command('glDebugMessageCallbackKHR'))
+            self.assertIsNone(registry.get_command('glBegin'))
+            self.assertIsNone(registry.get_extension('GL_ARB_clip_control'))
+            self.assertSameProfile(registry, 'gles2', None, '3.2', extensions=extensions)
+            self.assertSameProfile(registry, 'gles2', None, '2.0')
+
+    def test_gl_core(self):
+        core = RegistryFilter('gl', 'core', '3.3')
+        for stream in (False, True):
+            registry = self.read(core, stream=stream)
+            self.assertEqual(len(registry.features), 12)
+            # Removed from the core profile in 3.2 but needed by the earlier versions
+            self.assertIsNotNone(registry.get_command('glBegin'))
+            self.assertNotIn('glBegin', [c.name for c in registry.get_profile('gl', 'core', '3.3').commands])
+            self.assertIsNone(registry.get_command('glDispatchCompute'))
+            self.assertSameProfile(registry, 'gl', 'core', '3.3')
+
+    def test_earlier_versions(self):
+        core = RegistryFilter('gl', 'core', '4.6')
+        for stream in (False, True):
+            registry = self.read(core, stream=stream)
+            for version in ('1.0', '2.1', '3.0', '3.1', '3.2', '4.6'):
+                self.assertSameProfile(registry, 'gl', 'core', version)
+
+    def test_types_and_groups(self):
+        registry = self.read(RegistryFilter('gl', 'compatibility', '1.1'))
+        names = [t.name for t in registry.types]
+        # Used by commands and required by the used types
+        self.assertIn('GLenum', names)
+        self.assertIn('khrplatform', names)
+        self.assertNotIn('GLsync', names)
+
+        groups = {p.group_name for c in registry.commands.entries for p in c.params if p.group_name}
+        self.assertEqual(set(registry.groups), groups & set(self.registry.groups))
+
+    def test_all_versions(self):
+        registry = self.read(RegistryFilter('gles1', 'common'))
+        self.assertEqual([f.number for f in registry.features], ['1.0'])
+        self.assertSameProfile(registry, 'gles1', 'common', '1.0')
+
+    def test_errors(self):
+        with self.assertRaises(ValueError):
+            self.read(RegistryFilter('vulkan'))
+        with self.assertRaises(ValueError):
+            self.read(RegistryFilter('gl', 'core', '0.1'))
+        with self.assertRaises(ValueError):
+            self.read(RegistryFilter('gles2', version='3.2', extensions=['GL_NOT_AN_EXTENSION']))
+        with self.assertRaises(ValueError):
+            self.read(RegistryFilter('gles2', version='3.2', extensions=['GL_ARB_clip_control']))
+        with self.assertRaises(ValueError):
+            RegistryReader.from_file(self.registry_path).read(lazy=True, filter=RegistryFilter('gl'))
+
+    def test_includes(self):
+        gl = RegistryFilter('gl', 'core', '3.3', extensions=['GL_ARB_clip_control'])
+        self.assertTrue(gl.includes_feature('gl', '3.3'))
+        self.assertTrue(gl.includes_feature('gl', '1.0'))
+        self.assertFalse(gl.includes_feature('gl', '4.0'))
+        self.assertFalse(gl.includes_feature('gles2', '2.0'))
+        self.assertTrue(gl.includes_extension('GL_ARB_clip_control'))
+        self.assertFalse(gl.includes_extension('GL_KHR_debug'))
+        self.assertEqual(gl.extensions, ['GL_ARB_clip_control'])
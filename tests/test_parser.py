@@ -1,6 +1,14 @@
+import gc
 import os
+from io import BytesIO
 from unittest import TestCase
+from xml.etree import ElementTree
 from opengl_registry import RegistryReader
+from opengl_registry.commands import Command
+from opengl_registry.enums import Enum
+from opengl_registry.features import Feature
+from opengl_registry.filter import RegistryFilter
+from opengl_registry.reader import _paused_gc
 
 
 class ParserTestCase(TestCase):
@@ -9,3 +17,130 @@ class ParserTestCase(TestCase):
     def test_create_from_file(self):
         reader = RegistryReader.from_file(self.registry_path)
         reader.read()
+
+    def test_read_sections(self):
+        reader = RegistryReader.from_file(self.registry_path)
+        registry = reader.read()
+        # Only the top level <types> block should produce types
+        self.assertEqual(len(registry.types), 43)
+        self.assertEqual(registry.commands.namespace, 'GL')
+        self.assertGreater(len(registry.commands.entries), 3000)
+        self.assertTrue(all(isinstance(f, Feature) for f in registry.features))
+        self.assertEqual([t.name for t in reader.read_types()], [t.name for t in registry.types])
+
+    def test_stream_from_file(self):
+        registry = RegistryReader.from_file(self.registry_path).read()
+        reader = RegistryReader.from_file(self.registry_path, stream=True)
+        streamed = reader.read()
+        self.assertEqual(
+            [c.name for c in streamed.commands.entries],
+            [c.name for c in registry.commands.entries],
+        )
+        self.assertEqual(
+            [e.name for enums in streamed.enums for e in enums.entires],
+            [e.name for enums in registry.enums for e in enums.entires],
+        )
+        self.assertEqual(len(streamed.features), len(registry.features))
+        self.assertEqual(len(reader.read_types()), len(registry.types))
+
+    def test_lazy(self):
+        registry = RegistryReader.from_file(self.registry_path).read()
+        for reader in (
+            RegistryReader.from_file(self.registry_path),
+            RegistryReader.from_file(self.registry_path, stream=True),
+        ):
+            lazy = reader.read(lazy=True)
+            self.assertIsNone(lazy._enums)
+            self.assertEqual(
+                [c.name for c in lazy.commands.entries],
+                [c.name for c in registry.commands.entries],
+            )
+            self.assertEqual(lazy.commands.namespace, 'GL')
+            self.assertIsNone(lazy._enums)
+            self.assertEqual(len(lazy.enums), len(registry.enums))
+            self.assertEqual(len(lazy.types), len(registry.types))
+            self.assertEqual(sorted(lazy.groups), sorted(registry.groups))
+            self.assertEqual([f.name for f in lazy.features], [f.name for f in registry.features])
+
+    def test_truncated(self):
+        with open(self.registry_path, 'rb') as fd:
+            data = fd.read()
+        # A partial download ending inside the commands block
+        truncated = data[:data.find(b'<commands') + 100000]
+        with self.assertRaises(ElementTree.ParseError):
+            RegistryReader(source=BytesIO(truncated)).read()
+        with self.assertRaises(ElementTree.ParseError):
+            RegistryReader(source=BytesIO(truncated)).read(lazy=True)
+        with self.assertRaises(ElementTree.ParseError):
+            RegistryReader(source=BytesIO(truncated)).read(filter=RegistryFilter('gl', 'core', '3.3'))
+
+    def test_custom_classes(self):
+        class CustomEnum(Enum):
+            pass
+
+        class CustomCommand(Command):
+            def __init__(self, *args, **kwargs):
+                super().__init__(*args, **kwargs)
+                self.extra = 'extra'
+
+        class CustomReader(RegistryReader):
+            enum_cls = CustomEnum
+            command_cls = CustomCommand
+
+        registry = CustomReader.from_file(self.registry_path).read()
+        self.assertIsInstance(registry.enums[0].entires[0], CustomEnum)
+        self.assertIsInstance(registry.commands.entries[0], CustomCommand)
+        self.assertEqual(registry.commands.entries[0].extra, 'extra')
+
+    def test_pause_gc(self):
+        states = []
+
+        class RecordingEnum(Enum):
+            def __init__(self, *args, **kwargs):
+                super().__init__(*args, **kwargs)
+                states.append(gc.isenabled())
+
+        class PausingReader(RegistryReader):
+            enum_cls = RecordingEnum
+            pause_gc = True
+
+        PausingReader.from_file(self.registry_path, stream=True).read()
+        self.assertEqual(set(states), {False})
+        self.assertTrue(gc.isenabled())
+
+        states.clear()
+        PausingReader.pause_gc = False
+        PausingReader.from_file(self.registry_path, stream=True).read()
+        self.assertEqual(set(states), {True})
+
+    def test_pause_gc_nested(self):
+        # Overlapping reads keep the collector paused until the last one is done
+        with _paused_gc():
+            with _paused_gc():
+                self.assertFalse(gc.isenabled())
+            self.assertFalse(gc.isenabled())
+        self.assertTrue(gc.isenabled())
+
+        gc.disable()
+        try:
+            with _paused_gc():
+                pass
+            self.assertFalse(gc.isenabled())
+        finally:
+            gc.enable()
+
+    def test_shared_strings(self):
+        registry = RegistryReader.from_file(self.registry_path).read()
+        other = RegistryReader.from_file(self.registry_path, stream=True).read()
+
+        ptypes = {id(p.ptype) for c in registry.commands.entries for p in c.params if p.ptype == 'GLenum'}
+        self.assertEqual(len(ptypes), 1)
+        groups = {id(p.group_name) for c in registry.commands.entries for p in c.params if p.group_name == 'TextureTarget'}
+        self.assertEqual(len(groups), 1)
+
+        # Required names are the names of the commands, also across registries
+        command = registry.get_command('glDrawArrays')
+        feature = registry.get_feature('gl', '1.1')
+        required = next(name for details in feature.require for name in details.commands if name == command.name)
+        self.assertIs(required, command.name)
+        self.assertIs(other.get_command('glDrawArrays').name, command.name)
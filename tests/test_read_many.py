@@ -0,0 +1,53 @@
+import os
+import shutil
+import tempfile
+from unittest import TestCase
+
+from opengl_registry import RegistryReader
+from opengl_registry.registryset import RegistrySet
+
+
+class ReadManyTestCase(TestCase):
+    registry_path = os.path.join(os.path.dirname(__file__), 'fixtures', 'gl.xml')
+
+    @classmethod
+    def setUpClass(cls):
+        cls.tmp = tempfile.TemporaryDirectory()
+        cls.paths = []
+        for name in ('gl', 'glx'):
+            path = os.path.join(cls.tmp.name, name + '.xml')
+            shutil.copyfile(cls.registry_path, path)
+            cls.paths.append(path)
+
+    @classmethod
+    def tearDownClass(cls):
+        cls.tmp.cleanup()
+
+    def test_workers(self):
+        registries = RegistryReader.read_many(self.paths, workers=2)
+        self.assertEqual(len(registries), 2)
+        for registry in registries:
+            self.assertEqual(registry.get_command('glDrawArrays').name, 'glDrawArrays')
+            self.assertEqual(registry.get_enum('GL_TEXTURE_2D').value, '0x0DE1')
+
+    def test_single_process(self):
+        registries = RegistryReader.read_many(self.paths[:1], workers=1)
+        self.assertEqual(len(registries), 1)
+        self.assertEqual(len(registries[0].features), len(RegistryReader.from_file(self.paths[0]).read().features))
+
+    def test_merge(self):
+        registries = RegistryReader.read_many(self.paths, workers=2, merge=True)
+        self.assertIsInstance(registries, RegistrySet)
+        self.assertEqual(registries.namespaces, ['gl', 'glx'])
+        self.assertIs(registries.get_command('glFlush'), registries['gl'].get_command('glFlush'))
+        self.assertIs(registries.get_command('glx:glFlush'), registries['glx'].get_command('glFlush'))
+        self.assertEqual(registries.get_enum('glx:GL_TEXTURE_2D').value, '0x0DE1')
+        self.assertEqual(registries.get_type('GLenum').name, 'GLenum')
+        self.assertIsNone(registries.get_command('egl:glFlush'))
+        self.assertIsNone(registries.get_command('glNotACommand'))
+        self.assertEqual(registries.namespace_of('GL_ARB_clip_control'), 'gl')
+        self.assertIsNone(registries.namespace_of('glNotACommand'))
+
+    def test_duplicate_namespace(self):
+        with self.assertRaises(ValueError):
+            RegistrySet.from_paths(['a/gl.xml', 'b/gl.xml'], [None, None])
@@ -0,0 +1,212 @@
+import os
+from unittest import TestCase
+from opengl_registry import RegistryReader
+from opengl_registry.commands import Command, Commands
+from opengl_registry.gltype import GlType
+from opengl_registry.registry import Registry
+
+
+class RegistryTestCase(TestCase):
+    registry_path = os.path.join(os.path.dirname(__file__), 'fixtures', 'gl.xml')
+
+    @classmethod
+    def setUpClass(cls):
+        cls.registry = RegistryReader.from_file(cls.registry_path).read()
+
+    def test_get_command(self):
+        command = self.registry.get_command('glDrawArrays')
+        self.assertEqual(command.name, 'glDrawArrays')
+        self.assertEqual([p.name for p in command.params], ['mode', 'first', 'count'])
+        self.assertIsNone(self.registry.get_command('glNotACommand'))
+
+    def test_get_enum(self):
+        self.assertEqual(self.registry.get_enum('GL_TEXTURE_2D').value, '0x0DE1')
+        self.assertIsNone(self.registry.get_enum('GL_NOT_AN_ENUM'))
+
+    def test_get_enums_by_value(self):
+        names = [e.name for e in self.registry.get_enums_by_value(0x0DE1)]
+        self.assertIn('GL_TEXTURE_2D', names)
+        names = [e.name for e in self.registry.get_enums_by_value(0x20000000)]
+        self.assertIn('GL_MULTISAMPLE_BIT', names)
+        self.assertIn('GL_MULTISAMPLE_BIT_ARB', names)
+        self.assertEqual(self.registry.get_enums_by_value(-12345), [])
+
+    def test_get_type(self):
+        self.assertEqual(self.registry.get_type('GLenum').name, 'GLenum')
+
+    def test_get_feature(self):
+        self.assertEqual(self.registry.get_feature('gl', '3.3').name, 'GL_VERSION_3_3')
+        self.assertEqual(self.registry.get_feature('gles2', '3.2').name, 'GL_ES_VERSION_3_2')
+        self.assertIsNone(self.registry.get_feature('gl', '9.9'))
+
+    def test_get_profile(self):
+        core = self.registry.get_profile('gl', 'core', '3.3')
+        compat = self.registry.get_profile('gl', 'compatibility', '3.3')
+        core_names = {c.name for c in core.commands}
+        self.assertIn('glDrawArrays', core_names)
+        self.assertIn('glVertexAttribDivisor', core_names)
+        self.assertNotIn('glBegin', core_names)
+        self.assertNotIn('glDispatchCompute', core_names)
+        self.assertIn('glBegin', {c.name for c in compat.commands})
+        self.assertIn('GL_TEXTURE_2D', {e.name for e in core.enums})
+
+    def test_get_profile_incremental(self):
+        registry = RegistryReader.from_file(self.registry_path).read()
+        fresh = registry.get_profile('gl', 'core', '4.6')
+        registry = RegistryReader.from_file(self.registry_path).read()
+        registry.get_profile('gl', 'core', '3.3')
+        latest = registry.get_profile('gl', 'core', '4.6')
+        self.assertEqual([c.name for c in latest.commands], [c.name for c in fresh.commands])
+        self.assertEqual([e.name for e in latest.enums], [e.name for e in fresh.enums])
+
+    def test_get_extension(self):
+        extension = self.registry.get_extension('GL_ARB_debug_output')
+        self.assertEqual(extension.supported, 'gl|glcore')
+        self.assertTrue(extension.supports('glcore'))
+        self.assertFalse(extension.supports('gles2'))
+        self.assertIn('glDebugMessageCallbackARB', extension.require[0].commands)
+        self.assertIsNone(self.registry.get_extension('GL_NOT_AN_EXTENSION'))
+
+    def test_get_api_extensions(self):
+        names = {e.name for e in self.registry.get_api_extensions('gles2')}
+        self.assertIn('GL_KHR_debug', names)
+        self.assertNotIn('GL_ARB_debug_output', names)
+
+    def test_get_command_extensions(self):
+        names = [e.name for e in self.registry.get_command_extensions('glDebugMessageCallbackKHR')]
+        self.assertEqual(names, ['GL_KHR_debug'])
+        self.assertEqual(self.registry.get_command_extensions('glDrawArrays'), [])
+        names = [e.name for e in self.registry.get_enum_extensions('GL_DEBUG_OUTPUT_SYNCHRONOUS_ARB')]
+        self.assertEqual(names, ['GL_ARB_debug_output'])
+
+    def test_get_profile_extensions(self):
+        profile = self.registry.get_profile('gl', 'core', '3.3', extensions=['GL_ARB_debug_output'])
+        self.assertIn('glDebugMessageCallbackARB', {c.name for c in profile.commands})
+        self.assertEqual(profile.extensions, ['GL_ARB_debug_output'])
+        plain = self.registry.get_profile('gl', 'core', '3.3')
+        self.assertNotIn('glDebugMessageCallbackARB', {c.name for c in plain.commands})
+
+        with self.assertRaises(ValueError):
+            self.registry.get_profile('gl', 'core', '3.3', extensions=['GL_NOT_AN_EXTENSION'])
+        with self.assertRaises(ValueError):
+            self.registry.get_profile('gles2', None, '3.0', extensions=['GL_ARB_debug_output'])
+
+    def test_get_enum_api(self):
+        gl = self.registry.get_enum('GL_ACTIVE_PROGRAM_EXT', 'gl')
+        gles2 = self.registry.get_enum('GL_ACTIVE_PROGRAM_EXT', 'gles2')
+        self.assertEqual((gl.api, gl.value), ('gl', '0x8B8D'))
+        self.assertEqual((gles2.api, gles2.value), ('gles2', '0x8259'))
+        self.assertEqual(self.registry.get_enum('GL_TEXTURE_2D', 'gles2').value, '0x0DE1')
+        self.assertIsNone(self.registry.get_enum('GL_ACTIVE_PROGRAM_EXT', 'gles1'))
+
+        profile = self.registry.get_profile(
+            'gl', 'compatibility', '4.6', extensions=['GL_EXT_separate_shader_objects'],
+        )
+        enum = next(e for e in profile.enums if e.name == 'GL_ACTIVE_PROGRAM_EXT')
+        self.assertEqual(enum.value, '0x8B8D')
+
+    def test_canonical_api_enum(self):
+        # The gl definition aliases GL_CURRENT_PROGRAM, the gles2 definition has another value
+        self.assertEqual(self.registry.canonical('GL_ACTIVE_PROGRAM_EXT'), 'GL_ACTIVE_PROGRAM_EXT')
+        self.assertNotIn('GL_ACTIVE_PROGRAM_EXT', self.registry.aliases_of('GL_CURRENT_PROGRAM'))
+
+    def test_get_profile_unknown_api(self):
+        with self.assertRaises(ValueError):
+            self.registry.get_profile('vulkan', 'core', '1.0')
+
+    def test_link(self):
+        self.assertTrue(self.registry.linked)
+        target = self.registry.get_command('glBindTexture').params[0]
+        self.assertEqual(target.group_name, 'TextureTarget')
+        self.assertIs(target.group, self.registry.groups['TextureTarget'])
+        # Groups referenced by parameters don't always exist
+        texture = self.registry.get_command('glBindTexture').params[1]
+        self.assertEqual(texture.group_name, 'Texture')
+        self.assertIsNone(texture.group)
+
+        enum = self.registry.get_enum('GL_TEXTURE_2D')
+        self.assertIn(enum, enum.range.entires)
+        self.assertIn(self.registry.groups['TextureTarget'], enum.groups)
+        self.assertIn(enum, self.registry.groups['TextureTarget'].enums)
+
+        attrib_mask = next(enums for enums in self.registry.enums if enums.group_name == 'AttribMask')
+        self.assertIs(attrib_mask.group, self.registry.groups['AttribMask'])
+
+        for group in self.registry.groups.values():
+            self.assertTrue(all(e.name in group.entires for e in group.enums))
+            self.assertTrue(all(group in e.groups for e in group.enums))
+
+    def test_link_lazy(self):
+        registry = RegistryReader.from_file(self.registry_path).read(lazy=True)
+        self.assertFalse(registry.linked)
+        registry.link()
+        self.assertTrue(registry.linked)
+        self.assertIsNotNone(registry.get_enum('GL_TEXTURE_2D').range)
+        self.assertIsNone(registry._features)
+
+    def test_aliases(self):
+        self.assertEqual(self.registry.get_command('glDrawArraysEXT').alias, 'glDrawArrays')
+        self.assertIsNone(self.registry.get_command('glDrawArrays').alias)
+        self.assertEqual(self.registry.get_enum('GL_SMOOTH_POINT_SIZE_RANGE').alias, 'GL_POINT_SIZE_RANGE')
+
+        self.assertEqual(self.registry.canonical('glDrawArraysEXT'), 'glDrawArrays')
+        self.assertEqual(self.registry.canonical('glDrawArrays'), 'glDrawArrays')
+        self.assertEqual(self.registry.aliases_of('glDrawArraysEXT'), ['glDrawArrays', 'glDrawArraysEXT'])
+        self.assertEqual(self.registry.canonical('GL_SMOOTH_POINT_SIZE_RANGE'), 'GL_POINT_SIZE_RANGE')
+        self.assertIn('GL_SMOOTH_POINT_SIZE_RANGE', self.registry.aliases_of('GL_POINT_SIZE_RANGE'))
+
+        # Every name in a class resolves to the same canonical name
+        aliases = self.registry.aliases_of('glBlendFunci')
+        self.assertEqual(aliases[0], 'glBlendFunci')
+        self.assertIn('glBlendFunciARB', aliases)
+        self.assertIn('glBlendFuncIndexedAMD', aliases)
+        self.assertEqual({self.registry.canonical(name) for name in aliases}, {'glBlendFunci'})
+
+        self.assertEqual(self.registry.canonical('glNotACommand'), 'glNotACommand')
+        self.assertEqual(self.registry.aliases_of('glNotACommand'), ['glNotACommand'])
+
+    def test_alias_chains(self):
+        commands = Commands(entires=[
+            Command(name='glFooEXT', alias='glFooARB'),
+            Command(name='glFooARB', alias='glFoo'),
+            Command(name='glFoo'),
+            Command(name='glFooNV', alias='glFooEXT'),
+        ])
+        registry = Registry(commands=commands, enums=[])
+        self.assertEqual(registry.canonical('glFooNV'), 'glFoo')
+        self.assertEqual(registry.aliases_of('glFooEXT'), ['glFoo', 'glFooEXT', 'glFooARB', 'glFooNV'])
+
+    def test_type_order(self):
+        order = self.registry.get_type_order()
+        self.assertEqual(sorted(t.name for t in order), sorted(t.name for t in self.registry.types))
+        positions = {gltype.name: i for i, gltype in enumerate(order)}
+        for gltype in order:
+            for name in self.registry.get_type_dependencies(gltype.name):
+                self.assertLess(positions[name], positions[gltype.name])
+        self.assertIs(self.registry.get_type_order(), order)
+
+        self.assertEqual(self.registry.get_type_dependencies('GLbyte'), ['khrplatform'])
+        self.assertIn('GLenum', self.registry.get_type_dependencies('GLDEBUGPROC'))
+        self.assertEqual(self.registry.get_type_dependencies('GLNotAType'), [])
+
+    def test_get_required_types(self):
+        commands = [self.registry.get_command('glDebugMessageCallback'), self.registry.get_command('glGetString')]
+        names = [t.name for t in self.registry.get_required_types(commands=commands)]
+        # The parameter and return types followed by their dependencies in dependency order
+        self.assertIn('GLDEBUGPROC', names)
+        self.assertIn('GLubyte', names)
+        self.assertLess(names.index('GLenum'), names.index('GLDEBUGPROC'))
+        self.assertLess(names.index('khrplatform'), names.index('GLubyte'))
+        self.assertNotIn('GLdouble', names)
+
+        names = [t.name for t in self.registry.get_required_types(['GLfloat', 'void', 'GLNotAType'])]
+        self.assertEqual(names, ['khrplatform', 'GLfloat'])
+
+    def test_type_cycle(self):
+        registry = Registry(types=[
+            GlType(name='A', text='typedef B A;'),
+            GlType(name='B', text='typedef A B;'),
+            GlType(name='C', text='typedef A C;'),
+        ])
+        self.assertEqual([t.name for t in registry.get_type_order()], ['B', 'A', 'C'])
+        self.assertEqual([t.name for t in registry.get_required_types(['C'])], ['B', 'A', 'C'])
@@ -0,0 +1,100 @@
+import contextlib
+import io
+import os
+import sys
+from io import BytesIO
+from unittest import TestCase, mock
+
+from opengl_registry import RegistryReader
+from opengl_registry.cli import execute_from_command_line
+from opengl_registry.stats import ReadStats
+
+
+class RecordingStats(ReadStats):
+
+    def __init__(self):
+        super().__init__()
+        self.records = []
+
+    def record(self, name, seconds, elements=0, objects=0):
+        super().record(name, seconds, elements=elements, objects=objects)
+        self.records.append(name)
+
+
+class ReadStatsTestCase(TestCase):
+    registry_path = os.path.join(os.path.dirname(__file__), 'fixtures', 'gl.xml')
+
+    def test_disabled(self):
+        reader = RegistryReader.from_file(self.registry_path)
+        registry = reader.read()
+        self.assertIsNone(reader.stats)
+        self.assertIsNone(registry.stats)
+        # Builders are only wrapped when recording
+        self.assertNotIn('_build_command', vars(reader))
+
+    def test_read(self):
+        stats = ReadStats()
+        registry = RegistryReader.from_file(self.registry_path, stats=stats).read()
+        self.assertIs(registry.stats, stats)
+        self.assertEqual(
+            list(stats.phases),
+            ['parse', 'types', 'groups', 'enums', 'commands', 'features', 'extensions', 'walk', 'link'],
+        )
+
+        commands = stats.get('commands')
+        self.assertEqual(commands.calls, len(registry.commands.entries))
+        self.assertEqual(commands.objects, len(registry.commands.entries))
+        # Every command has at least a command, proto and name element
+        self.assertGreater(commands.elements, 3 * commands.calls)
+        self.assertGreater(commands.seconds, 0)
+        self.assertEqual(stats.get('walk').calls, 1)
+        self.assertGreater(stats.get('walk').seconds, commands.seconds)
+        self.assertEqual(stats.get('download').calls, 0)
+
+        data = stats.to_dict()
+        self.assertEqual(data['features']['calls'], len(registry.features))
+        self.assertEqual(sorted(data['parse']), ['calls', 'elements', 'objects', 'seconds'])
+
+    def test_read_section(self):
+        stats = ReadStats()
+        reader = RegistryReader.from_file(self.registry_path, stats=stats)
+        types = reader.read_types()
+        self.assertEqual(stats.get('types').calls, len(types))
+        self.assertNotIn('commands', stats.phases)
+
+    def test_lazy_stream(self):
+        stats = RecordingStats()
+        with open(self.registry_path, 'rb') as fd:
+            registry = RegistryReader(source=BytesIO(fd.read()), stats=stats).read(lazy=True)
+        self.assertIs(registry.stats, stats)
+
+        registry.get_command('glFlush')
+        self.assertIn('commands', stats.phases)
+        self.assertNotIn('extensions', stats.phases)
+        self.assertNotIn('parse', stats.phases)
+        self.assertEqual(stats.records[-1], 'walk')
+
+    def test_measure(self):
+        stats = ReadStats()
+        with stats.measure('cache'):
+            pass
+        with stats.measure('cache'):
+            pass
+        self.assertEqual(stats.get('cache').calls, 2)
+
+        lines = stats.format().splitlines()
+        self.assertEqual(len(lines), 2)
+        self.assertTrue(lines[0].startswith('phase'))
+        self.assertTrue(lines[1].startswith('cache'))
+
+    def test_cli_profile(self):
+        output = io.StringIO()
+        argv = ['opengl-registry', '--file', self.registry_path, '--profile', '--log-level', 'ERROR']
+        with contextlib.redirect_stdout(output), mock.patch.object(sys, 'argv', argv):
+            execute_from_command_line()
+
+        lines = output.getvalue().splitlines()
+        self.assertTrue(lines[0].startswith('Registry:'))
+        self.assertTrue(lines[1].startswith('phase'))
+        self.assertIn('commands', output.getvalue())
+
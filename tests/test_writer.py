@@ -0,0 +1,188 @@
+import ctypes
+import importlib.util
+import os
+import sys
+import tempfile
+from io import BytesIO
+from unittest import TestCase
+
+from opengl_registry import RegistryReader
+from opengl_registry.writer import CtypesWriter
+
+
+class CtypesWriterTestCase(TestCase):
+    registry_path = os.path.join(os.path.dirname(__file__), 'fixtures', 'gl.xml')
+
+    @classmethod
+    def setUpClass(cls):
+        cls.registry = RegistryReader.from_file(cls.registry_path).read()
+        cls.profile = cls.registry.get_profile('gl', 'core', '3.3')
+
+    def load_module(self, lazy=True):
+        with tempfile.TemporaryDirectory() as directory:
+            path = os.path.join(directory, 'gl33.py')
+            CtypesWriter(self.registry, self.profile, lazy=lazy).write(path)
+            spec = importlib.util.spec_from_file_location('gl33', path)
+            module = importlib.util.module_from_spec(spec)
+            spec.loader.exec_module(module)
+        return module
+
+    def test_render(self):
+        source = CtypesWriter(self.registry, self.profile).render()
+        compile(source, 'gl33.py', 'exec')
+        self.assertIn('GLenum = c_uint\n', source)
+        self.assertIn('glDrawArrays = _Command("glDrawArrays", None, GLenum, GLint, GLsizei)\n', source)
+
+    def test_module(self):
+        module = self.load_module()
+        self.assertEqual(module.GL_TEXTURE_2D, 0x0DE1)
+        self.assertIs(module.GLenum, ctypes.c_uint)
+        self.assertIn('glDrawArrays', module.__all__)
+        self.assertIn('GL_TEXTURE_2D', module.__all__)
+
+    def test_lazy_resolve(self):
+        module = self.load_module()
+        calls = []
+
+        with self.assertRaises(RuntimeError):
+            module.glDrawArrays(0, 0, 3)
+
+        # Use a python callback as the GL function
+        prototype = ctypes.CFUNCTYPE(None, ctypes.c_uint, ctypes.c_int, ctypes.c_int)
+        callback = prototype(lambda mode, first, count: calls.append((mode, first, count)))
+        addresses = {'glDrawArrays': ctypes.cast(callback, ctypes.c_void_p).value}
+        lookups = []
+
+        def get_proc_address(name):
+            lookups.append(name)
+            return addresses.get(name)
+
+        module.load(get_proc_address)
+        stub = module.glDrawArrays
+        self.assertEqual(lookups, [])
+
+        stub(4, 0, 3)
+        module.glDrawArrays(4, 3, 6)
+        self.assertEqual(calls, [(4, 0, 3), (4, 3, 6)])
+        self.assertEqual(lookups, ['glDrawArrays'])
+        self.assertIsNot(module.glDrawArrays, stub)
+
+        with self.assertRaises(RuntimeError):
+            module.glClear(0)
+
+        # Loading again resets the resolved commands
+        module.load(get_proc_address)
+        self.assertIs(module.glDrawArrays, stub)
+
+    def test_batched_load(self):
+        module = self.load_module(lazy=False)
+        self.assertEqual(module.GL_TEXTURE_2D, 0x0DE1)
+        self.assertIsNone(module.glDrawArrays)
+        self.assertEqual(len(module._names), len(self.profile.commands))
+        self.assertLess(len(module._prototypes), len(module._names))
+
+        calls = []
+        prototype = ctypes.CFUNCTYPE(None, ctypes.c_uint, ctypes.c_int, ctypes.c_int)
+        callback = prototype(lambda mode, first, count: calls.append((mode, first, count)))
+        address = ctypes.cast(callback, ctypes.c_void_p).value
+
+        missing = module.load(lambda name: address if name != 'glClear' else None)
+        self.assertEqual(missing, ['glClear'])
+        self.assertIsNone(module.glClear)
+
+        module.glDrawArrays(4, 0, 3)
+        self.assertEqual(calls, [(4, 0, 3)])
+
+
+class PackageWriterTestCase(TestCase):
+    registry_path = os.path.join(os.path.dirname(__file__), 'fixtures', 'gl.xml')
+
+    @classmethod
+    def setUpClass(cls):
+        with open(cls.registry_path, 'rb') as fd:
+            cls.data = fd.read()
+
+    def setUp(self):
+        self.directory = tempfile.TemporaryDirectory()
+        self.path = os.path.join(self.directory.name, 'gl33')
+
+    def tearDown(self):
+        self.directory.cleanup()
+
+    def write(self, data=None, lazy=True):
+        registry = RegistryReader(source=BytesIO(data or self.data)).read()
+        profile = registry.get_profile('gl', 'core', '3.3')
+        return [os.path.basename(path) for path in CtypesWriter(registry, profile, lazy=lazy).write_package(self.path)]
+
+    def age_files(self):
+        """Move the modification time of all files to the past to detect rewrites"""
+        for name in os.listdir(self.path):
+            os.utime(os.path.join(self.path, name), (1000000000, 1000000000))
+
+    def mtimes(self):
+        return {name: os.stat(os.path.join(self.path, name)).st_mtime for name in os.listdir(self.path)}
+
+    def test_import(self):
+        self.write(lazy=False)
+        sys.path.insert(0, self.directory.name)
+        try:
+            import gl33
+        finally:
+            sys.path.remove(self.directory.name)
+            sys.modules.pop('gl33', None)
+            for name in ('commands', 'enums', 'types'):
+                sys.modules.pop('gl33.' + name, None)
+
+        self.assertEqual(gl33.GL_TEXTURE_2D, 0x0DE1)
+        self.assertIs(gl33.GLenum, ctypes.c_uint)
+        self.assertIsNone(gl33.glDrawArrays)
+
+        calls = []
+        prototype = ctypes.CFUNCTYPE(None, ctypes.c_uint, ctypes.c_int, ctypes.c_int)
+        callback = prototype(lambda mode, first, count: calls.append((mode, first, count)))
+        address = ctypes.cast(callback, ctypes.c_void_p).value
+        self.assertEqual(gl33.load(lambda name: address), [])
+
+        gl33.glDrawArrays(4, 0, 3)
+        self.assertEqual(calls, [(4, 0, 3)])
+        self.assertIs(gl33.glDrawArrays, gl33.commands.glDrawArrays)
+
+    def test_unchanged(self):
+        self.assertEqual(self.write(), ['__init__.py', 'types.py', 'enums.py', 'commands.py'])
+        self.age_files()
+        mtimes = self.mtimes()
+
+        self.assertEqual(self.write(), [])
+        self.assertEqual(self.mtimes(), mtimes)
+
+    def test_changed_enum(self):
+        self.write()
+        self.age_files()
+        mtimes = self.mtimes()
+
+        data = self.data.replace(b'value="0x0DE1" name="GL_TEXTURE_2D"', b'value="0x0DE2" name="GL_TEXTURE_2D"')
+        self.assertEqual(self.write(data), ['enums.py'])
+        changed = {name for name, mtime in self.mtimes().items() if mtime != mtimes[name]}
+        self.assertEqual(changed, {'enums.py', CtypesWriter.MANIFEST})
+
+        with open(os.path.join(self.path, 'enums.py')) as fd:
+            self.assertIn('GL_TEXTURE_2D = 0x0DE2\n', fd.read())
+
+    def test_changed_command(self):
+        self.write()
+        data = self.data.replace(b'<proto>void <name>glFlush</name>', b'<proto>GLboolean <name>glFlush</name>')
+        self.assertEqual(self.write(data), ['commands.py'])
+
+    def test_options_changed(self):
+        self.write()
+        self.assertEqual(self.write(lazy=False), ['__init__.py', 'commands.py'])
+
+    def test_edited_file(self):
+        self.write()
+        path = os.path.join(self.path, 'types.py')
+        with open(path, 'a') as fd:
+            fd.write('GLenum = None\n')
+
+        self.assertEqual(self.write(), ['types.py'])
+        with open(path) as fd:
+            self.assertNotIn('GLenum = None', fd.read())